@@ -17,9 +17,15 @@ Date: October 22, 2025
 """
 
 import json
+import sys
 import urllib.parse
+from pathlib import Path
 from typing import Any, Dict, List, Optional
-from uuid import uuid4
+
+# URL builder and reference IDs (UUIDv7) are shared with robinhood-onramp/scripts/connect_urls.py
+sys.path.insert(0, str(Path(__file__).resolve().parents[4] / "robinhood-onramp" / "scripts"))
+from asset_network_matrix import CompatibilityMatrix  # noqa: E402
+from connect_urls import build_url, generate_reference_id  # noqa: E402
 
 # ============================================================================
 # Configuration
@@ -50,47 +56,18 @@ SUPPORTED_ASSETS = [
     "CRV", "UNI", "ONDO", "SHIB", "PEPE", "BONK"
 ]
 
+# Robinhood rejects a link if any asset is on none of the listed networks
+# (e.g. ADA lives on CARDANO), so only send combinations the matrix accepts
+MATRIX = CompatibilityMatrix.from_config()
+LISTED_ASSETS = [
+    asset for asset in SUPPORTED_ASSETS
+    if any(MATRIX.is_valid(asset, network) for network in SUPPORTED_NETWORKS)
+]
+
 # Sample wallet address (Ethereum)
 SAMPLE_WALLET_ADDRESS = "0xa22d566f52b303049d27a7169ed17a925b3fdb5e"
 
 
-# ============================================================================
-# URL Builder Functions
-# ============================================================================
-
-def generate_reference_id() -> str:
-    """Generate a UUID v4 reference ID"""
-    return str(uuid4())
-
-
-def build_url(params: Dict[str, Any]) -> str:
-    """
-    Build Robinhood Connect URL with given parameters
-    
-    Args:
-        params: Dictionary of URL parameters
-        
-    Returns:
-        Complete URL string
-    """
-    base_url = "https://applink.robinhood.com/u/connect"
-    
-    # Convert all values to strings and handle lists
-    encoded_params = {}
-    for key, value in params.items():
-        if value is None:
-            continue
-        if isinstance(value, list):
-            encoded_params[key] = ",".join(str(v) for v in value)
-        elif isinstance(value, bool):
-            encoded_params[key] = "true" if value else "false"
-        else:
-            encoded_params[key] = str(value)
-    
-    query_string = urllib.parse.urlencode(encoded_params)
-    return f"{base_url}?{query_string}"
-
-
 # ============================================================================
 # Test Scenarios
 # ============================================================================
@@ -127,7 +104,7 @@ def scenario_2_with_asset_list() -> Dict[str, Any]:
             "applicationId": APP_ID,
             "offRamp": True,
             "supportedNetworks": SUPPORTED_NETWORKS,
-            "supportedAssets": SUPPORTED_ASSETS,
+            "supportedAssets": LISTED_ASSETS,
             "redirectUrl": REDIRECT_URL,
             "referenceId": generate_reference_id(),
         }
@@ -252,7 +229,7 @@ def scenario_8_full_combination() -> Dict[str, Any]:
             "flow": "transfer",
             "paymentMethod": "crypto_balance",
             "supportedNetworks": SUPPORTED_NETWORKS,
-            "supportedAssets": SUPPORTED_ASSETS,
+            "supportedAssets": LISTED_ASSETS,
             "redirectUrl": REDIRECT_URL,
             "referenceId": generate_reference_id(),
         }
@@ -352,6 +329,10 @@ def scenario_13_multi_asset_per_network() -> Dict[str, Any]:
         "POLYGON": ["MATIC", "USDC"],
         "AVALANCHE": ["AVAX", "USDC"],
     }
+    network_assets = {
+        network: [asset for asset in assets if MATRIX.is_valid(asset, network)]
+        for network, assets in network_assets.items()
+    }
     
     return {
         "name": "Network-Asset Mapping",
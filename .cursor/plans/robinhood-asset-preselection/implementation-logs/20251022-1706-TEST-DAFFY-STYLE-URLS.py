@@ -12,9 +12,14 @@ Date: October 22, 2025
 """
 
 import json
-import urllib.parse
+import sys
+from pathlib import Path
 from typing import Any, Dict
-from uuid import uuid4
+
+# URL builder and reference IDs (UUIDv7) are shared with robinhood-onramp/scripts/connect_urls.py
+sys.path.insert(0, str(Path(__file__).resolve().parents[4] / "robinhood-onramp" / "scripts"))
+from asset_network_matrix import CompatibilityMatrix  # noqa: E402
+from connect_urls import build_url, generate_reference_id  # noqa: E402
 
 # ============================================================================
 # Configuration
@@ -36,33 +41,16 @@ ASSET_NETWORK_COMBOS = [
     {"asset": "USDC", "network": "ETHEREUM", "wallet": "0xd71a079cb64480334ffb400f017a0dde94f553dd"},
 ]
 
+# Stop before printing links Robinhood would reject (e.g. BTC on ETHEREUM)
+MATRIX = CompatibilityMatrix.from_config()
+for combo in [{"asset": TEST_ASSET, "network": TEST_NETWORK}] + ASSET_NETWORK_COMBOS:
+    MATRIX.validate([combo["asset"]], [combo["network"]])
+
 
 # ============================================================================
 # Helper Functions
 # ============================================================================
 
-def generate_reference_id() -> str:
-    """Generate a UUID v4 reference ID"""
-    return str(uuid4())
-
-
-def build_url(params: Dict[str, Any]) -> str:
-    """Build Robinhood Connect URL with given parameters"""
-    base_url = "https://applink.robinhood.com/u/connect"
-    
-    # Convert all values to strings
-    encoded_params = {}
-    for key, value in params.items():
-        if value is None:
-            continue
-        if isinstance(value, bool):
-            encoded_params[key] = "true" if value else "false"
-        else:
-            encoded_params[key] = str(value)
-    
-    query_string = urllib.parse.urlencode(encoded_params)
-    return f"{base_url}?{query_string}"
-
 
 def print_scenario(num: int, name: str, description: str, params: Dict[str, Any]):
     """Print a formatted scenario"""
@@ -12,9 +12,13 @@ Date: October 22, 2025
 """
 
 import json
-import urllib.parse
+import sys
+from pathlib import Path
 from typing import Any, Dict
-from uuid import uuid4
+
+# URL builder and reference IDs (UUIDv7) are shared with robinhood-onramp/scripts/connect_urls.py
+sys.path.insert(0, str(Path(__file__).resolve().parents[4] / "robinhood-onramp" / "scripts"))
+from connect_urls import build_url, generate_reference_id  # noqa: E402
 
 # ============================================================================
 # Configuration
@@ -43,30 +47,6 @@ ALL_NETWORKS = [
 # Helper Functions
 # ============================================================================
 
-def generate_reference_id() -> str:
-    """Generate a UUID v4 reference ID"""
-    return str(uuid4())
-
-
-def build_url(params: Dict[str, Any]) -> str:
-    """Build Robinhood Connect URL with given parameters"""
-    base_url = "https://applink.robinhood.com/u/connect"
-    
-    # Convert all values to strings
-    encoded_params = {}
-    for key, value in params.items():
-        if value is None:
-            continue
-        if isinstance(value, bool):
-            encoded_params[key] = "true" if value else "false"
-        elif isinstance(value, list):
-            encoded_params[key] = ",".join(str(v) for v in value)
-        else:
-            encoded_params[key] = str(value)
-    
-    query_string = urllib.parse.urlencode(encoded_params)
-    return f"{base_url}?{query_string}"
-
 
 def print_scenario(num: int, name: str, description: str, params: Dict[str, Any]):
     """Print a formatted scenario"""
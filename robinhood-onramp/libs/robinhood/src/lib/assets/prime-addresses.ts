@@ -7,6 +7,11 @@
  *
  * Used to populate deposit addresses for Robinhood assets
  *
+ * The last known-good address set is persisted to .cache/prime-addresses.json
+ * and served immediately on later starts while a background refresh runs.
+ * A circuit breaker stops retrying Prime after repeated failures and probes
+ * periodically for recovery.
+ *
  * NOTE: This runs SERVER-SIDE ONLY (requires Prime API credentials)
  */
 
@@ -35,6 +40,14 @@ export interface PrimeDepositAddress extends RobinhoodDepositAddress {
  */
 let PRIME_ADDRESS_CACHE: Record<string, PrimeDepositAddress> | null = null
 
+/**
+ * Where the cached addresses came from
+ * - live: fetched from Prime in this process
+ * - persisted: last known-good set from disk (a refresh runs in the background)
+ * - otc: backend OTC list (no known-good Prime set available)
+ */
+export type PrimeAddressSource = 'live' | 'persisted' | 'otc'
+
 /**
  * Stats from last Prime API fetch
  */
@@ -43,12 +56,144 @@ let PRIME_FETCH_STATS: {
   addressesMatched: number
   walletTypeDistribution: Record<string, number>
   fetchedAt?: Date
+  source?: PrimeAddressSource
 } | null = null
 
+/**
+ * Last known-good address set, persisted across restarts
+ * (override the location with PRIME_ADDRESS_CACHE_PATH)
+ */
+const PERSISTED_CACHE_FILE = ['.cache', 'prime-addresses.json']
+
+/**
+ * Serve cached addresses for this long before refreshing in the background
+ */
+const PRIME_CACHE_MAX_AGE_MS = Number(process.env.PRIME_ADDRESS_CACHE_MAX_AGE_MS) || 15 * 60 * 1000
+
+/**
+ * Kill the Python crawl if it runs longer than this
+ */
+const PRIME_SCRIPT_TIMEOUT_MS = Number(process.env.PRIME_ADDRESS_SCRIPT_TIMEOUT_MS) || 2 * 60 * 1000
+
+/**
+ * Circuit breaker settings: open after this many consecutive failures,
+ * probe after the cooldown, double the cooldown on each failed probe
+ */
+const BREAKER_FAILURE_THRESHOLD = 3
+const BREAKER_COOLDOWN_MS = 60 * 1000
+const BREAKER_MAX_COOLDOWN_MS = 15 * 60 * 1000
+
+type CircuitState = 'closed' | 'open' | 'half-open'
+
+/**
+ * Circuit breaker around the Prime crawl
+ *
+ * closed: requests go through; consecutive failures are counted
+ * open: requests are skipped until the cooldown elapses
+ * half-open: a single probe request is allowed; success closes the
+ *            breaker, failure re-opens it with a longer cooldown
+ */
+class PrimeCircuitBreaker {
+  state: CircuitState = 'closed'
+  consecutiveFailures = 0
+  cooldownMs = BREAKER_COOLDOWN_MS
+  openedAt = 0
+  lastError?: string
+
+  allowRequest(now = Date.now()): boolean {
+    if (this.state === 'closed') {
+      return true
+    }
+    if (this.state === 'open' && now - this.openedAt >= this.cooldownMs) {
+      this.state = 'half-open'
+      return true
+    }
+    // Open and cooling down, or a probe is already in flight
+    return false
+  }
+
+  recordSuccess(): void {
+    if (this.state !== 'closed') {
+      console.log('[Prime Addresses] Circuit closed - Prime is reachable again')
+    }
+    this.state = 'closed'
+    this.consecutiveFailures = 0
+    this.cooldownMs = BREAKER_COOLDOWN_MS
+    this.lastError = undefined
+  }
+
+  recordFailure(error: unknown, now = Date.now()): void {
+    this.consecutiveFailures++
+    this.lastError = error instanceof Error ? error.message.split('\n')[0] : String(error)
+
+    if (this.state === 'half-open') {
+      this.cooldownMs = Math.min(this.cooldownMs * 2, BREAKER_MAX_COOLDOWN_MS)
+      this.open(now)
+    } else if (this.consecutiveFailures >= BREAKER_FAILURE_THRESHOLD) {
+      this.open(now)
+    }
+  }
+
+  msUntilProbe(now = Date.now()): number {
+    return Math.max(0, this.openedAt + this.cooldownMs - now)
+  }
+
+  snapshot() {
+    return {
+      state: this.state,
+      consecutiveFailures: this.consecutiveFailures,
+      nextProbeInMs: this.state === 'open' ? this.msUntilProbe() : null,
+      lastError: this.lastError ?? null,
+    }
+  }
+
+  private open(now: number): void {
+    this.state = 'open'
+    this.openedAt = now
+    console.warn(
+      `[Prime Addresses] Circuit open after ${this.consecutiveFailures} failure(s) - ` +
+        `next probe in ${Math.round(this.cooldownMs / 1000)}s`,
+    )
+  }
+}
+
+const PRIME_BREAKER = new PrimeCircuitBreaker()
+
+/**
+ * In-flight refresh (concurrent callers share it)
+ */
+let PRIME_REFRESH: Promise<Record<string, PrimeDepositAddress> | null> | null = null
+
+/**
+ * Scheduled recovery probe while the breaker is open
+ */
+let PRIME_PROBE_TIMER: ReturnType<typeof setTimeout> | null = null
+
+/**
+ * Total wallets returned by the last successful crawl
+ */
+let LAST_WALLET_COUNT = 0
+
+/**
+ * Symbols the last crawl left 'pending' (stopped by SIGTERM before reaching them)
+ * or 'invalid' (address rejected by scripts/address_validation.py)
+ */
+let LAST_PENDING_SYMBOLS: string[] = []
+
+/**
+ * After SIGTERM, how long the crawl gets to flush partial results before SIGKILL
+ */
+const PRIME_SCRIPT_GRACE_MS = 5 * 1000
+
 /**
  * Fetch all Prime wallet addresses (server-side only)
  * This should be called during app initialization
  *
+ * Stale-while-revalidate: if a last known-good address set exists (in memory
+ * or persisted on disk) it is returned immediately and refreshed in the
+ * background. Only a cold start with no known-good set waits for the crawl,
+ * and falls back to the OTC list if that fails.
+ *
  * Preference order:
  * 1. Trading account (preferred)
  * 2. Trading Balance (fallback)
@@ -60,54 +205,46 @@ export async function fetchPrimeWalletAddresses(): Promise<Record<string, PrimeD
     return {}
   }
 
-  console.log('[Prime Addresses] Fetching wallet addresses from Coinbase Prime...')
-  console.log('[Prime Addresses] Priority: Trading > Trading Balance')
+  if (!hasKnownGoodAddresses()) {
+    loadPersistedAddresses()
+  }
 
-  try {
-    // Use Python script to fetch addresses
-    const addresses = await fetchAddressesViaPythonScript()
-
-    console.log(`[Prime Addresses] Fetched ${Object.keys(addresses).length} addresses`)
-
-    // Log wallet type distribution
-    const byType = Object.values(addresses).reduce(
-      (acc, addr) => {
-        const type = addr.walletType || 'Unknown'
-        acc[type] = (acc[type] || 0) + 1
-        return acc
-      },
-      {} as Record<string, number>,
+  if (hasKnownGoodAddresses()) {
+    console.log(
+      `[Prime Addresses] Serving ${Object.keys(PRIME_ADDRESS_CACHE!).length} cached addresses ` +
+        `(${PRIME_FETCH_STATS?.source}), refreshing in background`,
     )
+    refreshPrimeAddressesInBackground()
+    return PRIME_ADDRESS_CACHE!
+  }
 
-    console.log('[Prime Addresses] Wallet types:', byType)
-
-    // Store stats for health check
-    PRIME_FETCH_STATS = {
-      totalWalletsFetched: 0, // Will be updated by Python script parsing
-      addressesMatched: Object.keys(addresses).length,
-      walletTypeDistribution: byType,
-      fetchedAt: new Date(),
-    }
-
-    // Cache for future lookups
-    PRIME_ADDRESS_CACHE = addresses
-
+  const addresses = await refreshPrimeAddresses()
+  if (addresses) {
     return addresses
-  } catch (error) {
-    console.error('[Prime Addresses] Failed to fetch addresses:', error)
-    console.warn('[Prime Addresses] Using OTC list fallback addresses')
+  }
 
-    // Return OTC addresses and populate cache
-    const otcAddresses = getOtcAddresses()
-    PRIME_ADDRESS_CACHE = otcAddresses
+  console.warn('[Prime Addresses] Using OTC list fallback addresses')
 
-    return otcAddresses
+  // Return OTC addresses and populate cache
+  const otcAddresses = getOtcAddresses()
+  PRIME_ADDRESS_CACHE = otcAddresses
+  PRIME_FETCH_STATS = {
+    totalWalletsFetched: 0,
+    addressesMatched: Object.keys(otcAddresses).length,
+    walletTypeDistribution: countByWalletType(otcAddresses),
+    fetchedAt: new Date(),
+    source: 'otc',
   }
+
+  return otcAddresses
 }
 
 /**
  * Get Prime address for a symbol (from cache)
  * Falls back to OTC list if not found in CBP
+ *
+ * Lookups on a cache older than PRIME_CACHE_MAX_AGE_MS (or one that holds
+ * OTC/persisted addresses) trigger a background refresh.
  */
 export function getPrimeAddress(symbol: string): RobinhoodDepositAddress | undefined {
   if (!PRIME_ADDRESS_CACHE) {
@@ -115,9 +252,203 @@ export function getPrimeAddress(symbol: string): RobinhoodDepositAddress | undef
     return getOtcAddress(symbol)
   }
 
+  if (isPrimeAddressCacheStale()) {
+    refreshPrimeAddressesInBackground()
+  }
+
   return PRIME_ADDRESS_CACHE[symbol]
 }
 
+/**
+ * Fetch from Prime through the circuit breaker (single-flight)
+ * Resolves to null when the breaker is open or the crawl fails; the
+ * current cache is left untouched in that case.
+ */
+function refreshPrimeAddresses(): Promise<Record<string, PrimeDepositAddress> | null> {
+  if (PRIME_REFRESH) {
+    return PRIME_REFRESH
+  }
+
+  if (!PRIME_BREAKER.allowRequest()) {
+    return Promise.resolve(null)
+  }
+
+  console.log('[Prime Addresses] Fetching wallet addresses from Coinbase Prime...')
+  console.log('[Prime Addresses] Priority: Trading > Trading Balance')
+
+  PRIME_REFRESH = (async () => {
+    try {
+      // Use Python script to fetch addresses
+      const addresses = await fetchAddressesViaPythonScript()
+
+      // An empty crawl must not replace a known-good set
+      if (Object.keys(addresses).length === 0) {
+        throw new Error('Python script returned no addresses')
+      }
+
+      console.log(`[Prime Addresses] Fetched ${Object.keys(addresses).length} addresses`)
+
+      // Partial crawl: keep the previous known-good address for symbols it did not reach or rejected
+      if (LAST_PENDING_SYMBOLS.length > 0 && hasKnownGoodAddresses()) {
+        const carried = LAST_PENDING_SYMBOLS.filter((symbol) => !addresses[symbol] && PRIME_ADDRESS_CACHE![symbol])
+        for (const symbol of carried) {
+          addresses[symbol] = PRIME_ADDRESS_CACHE![symbol]
+        }
+        console.warn(
+          `[Prime Addresses] Partial crawl: ${LAST_PENDING_SYMBOLS.length} symbol(s) pending or invalid, ` +
+            `${carried.length} kept from the previous address set`,
+        )
+      }
+
+      // Log wallet type distribution
+      const byType = countByWalletType(addresses)
+      console.log('[Prime Addresses] Wallet types:', byType)
+
+      // Store stats for health check
+      PRIME_FETCH_STATS = {
+        totalWalletsFetched: LAST_WALLET_COUNT,
+        addressesMatched: Object.keys(addresses).length,
+        walletTypeDistribution: byType,
+        fetchedAt: new Date(),
+        source: 'live',
+      }
+
+      // Cache for future lookups (and future restarts)
+      PRIME_ADDRESS_CACHE = addresses
+      persistAddresses(addresses)
+      PRIME_BREAKER.recordSuccess()
+
+      return addresses
+    } catch (error) {
+      console.error('[Prime Addresses] Failed to fetch addresses:', error instanceof Error ? error.message : error)
+      PRIME_BREAKER.recordFailure(error)
+      scheduleRecoveryProbe()
+      return null
+    } finally {
+      PRIME_REFRESH = null
+    }
+  })()
+
+  return PRIME_REFRESH
+}
+
+/**
+ * Start a refresh without waiting for it (no-op if one is running or the breaker is open)
+ */
+function refreshPrimeAddressesInBackground(): void {
+  void refreshPrimeAddresses()
+}
+
+/**
+ * While the breaker is open, probe Prime once the cooldown elapses
+ * The timer is unref'd so it never keeps the process alive.
+ */
+function scheduleRecoveryProbe(): void {
+  if (PRIME_BREAKER.state !== 'open' || PRIME_PROBE_TIMER) {
+    return
+  }
+
+  PRIME_PROBE_TIMER = setTimeout(() => {
+    PRIME_PROBE_TIMER = null
+    console.log('[Prime Addresses] Probing Prime for recovery...')
+    refreshPrimeAddressesInBackground()
+  }, PRIME_BREAKER.msUntilProbe())
+  ;(PRIME_PROBE_TIMER as { unref?: () => void }).unref?.()
+}
+
+function hasKnownGoodAddresses(): boolean {
+  return (
+    PRIME_ADDRESS_CACHE !== null &&
+    Object.keys(PRIME_ADDRESS_CACHE).length > 0 &&
+    PRIME_FETCH_STATS?.source !== 'otc'
+  )
+}
+
+function isPrimeAddressCacheStale(now = Date.now()): boolean {
+  if (PRIME_FETCH_STATS?.source !== 'live' || !PRIME_FETCH_STATS.fetchedAt) {
+    return true
+  }
+  return now - PRIME_FETCH_STATS.fetchedAt.getTime() > PRIME_CACHE_MAX_AGE_MS
+}
+
+function countByWalletType(addresses: Record<string, RobinhoodDepositAddress>): Record<string, number> {
+  return Object.values(addresses).reduce(
+    (acc, addr) => {
+      const type = addr.walletType || 'Unknown'
+      acc[type] = (acc[type] || 0) + 1
+      return acc
+    },
+    {} as Record<string, number>,
+  )
+}
+
+function persistedCachePath(): string {
+  const path = require('path')
+  return process.env.PRIME_ADDRESS_CACHE_PATH || path.join(process.cwd(), ...PERSISTED_CACHE_FILE)
+}
+
+/**
+ * Load the last known-good address set from disk into the cache
+ */
+function loadPersistedAddresses(): boolean {
+  const fs = require('fs')
+  const cachePath = persistedCachePath()
+
+  try {
+    if (!fs.existsSync(cachePath)) {
+      return false
+    }
+    const persisted = JSON.parse(fs.readFileSync(cachePath, 'utf8'))
+    const addresses: Record<string, PrimeDepositAddress> = persisted.addresses || {}
+    if (Object.keys(addresses).length === 0) {
+      return false
+    }
+
+    PRIME_ADDRESS_CACHE = addresses
+    PRIME_FETCH_STATS = {
+      totalWalletsFetched: persisted.totalWalletsFetched || 0,
+      addressesMatched: Object.keys(addresses).length,
+      walletTypeDistribution: countByWalletType(addresses),
+      fetchedAt: persisted.fetchedAt ? new Date(persisted.fetchedAt) : undefined,
+      source: 'persisted',
+    }
+    console.log(`[Prime Addresses] Loaded ${Object.keys(addresses).length} addresses from ${cachePath}`)
+    return true
+  } catch (error) {
+    console.warn('[Prime Addresses] Ignoring unreadable address cache:', error instanceof Error ? error.message : error)
+    return false
+  }
+}
+
+/**
+ * Write the address set to disk (temp file + rename, so readers never see a partial file)
+ */
+function persistAddresses(addresses: Record<string, PrimeDepositAddress>): void {
+  const fs = require('fs')
+  const path = require('path')
+  const cachePath = persistedCachePath()
+
+  try {
+    fs.mkdirSync(path.dirname(cachePath), { recursive: true })
+    const tmpPath = `${cachePath}.${process.pid}.tmp`
+    fs.writeFileSync(
+      tmpPath,
+      JSON.stringify(
+        {
+          fetchedAt: new Date().toISOString(),
+          totalWalletsFetched: LAST_WALLET_COUNT,
+          addresses,
+        },
+        null,
+        2,
+      ),
+    )
+    fs.renameSync(tmpPath, cachePath)
+  } catch (error) {
+    console.warn('[Prime Addresses] Could not persist address cache:', error instanceof Error ? error.message : error)
+  }
+}
+
 /**
  * Fetch addresses using Python script (subprocess)
  * Alternative to native API client
@@ -141,7 +472,34 @@ async function fetchAddressesViaPythonScript(): Promise<Record<string, PrimeDepo
   try {
     // Run Python script with streaming output for real-time progress
     const output = await new Promise<string>((resolve, reject) => {
-      const pythonProcess = spawn('python3', [scriptPath, '--all-wallets', '--json-only'])
+      // --priority: highest-value assets resolve first, so a cut-short crawl still has them
+      // --hedge: slow deposit lookups are re-sent after the observed p95 (bounded extra load)
+      // --resume: a crawl cut short last time continues from its journal instead of page 1
+      // --max-age 0: always live (the crawl still refreshes the scripts' shared wallet snapshot)
+      const pythonProcess = spawn('python3', [
+        scriptPath,
+        '--all-wallets',
+        '--json-only',
+        '--priority',
+        '--hedge',
+        '--resume',
+        '--max-age',
+        '0',
+      ])
+
+      // A slow crawl gets SIGTERM: the script prints what it resolved (rest 'pending')
+      // and exits. A hung one is killed after the grace period.
+      let killTimer: ReturnType<typeof setTimeout> | undefined
+      const timeout = setTimeout(() => {
+        console.warn(
+          `[Prime Addresses] Python script exceeded ${PRIME_SCRIPT_TIMEOUT_MS / 1000}s - collecting partial results`,
+        )
+        pythonProcess.kill('SIGTERM')
+        killTimer = setTimeout(() => {
+          pythonProcess.kill('SIGKILL')
+          reject(new Error(`Python script timed out after ${PRIME_SCRIPT_TIMEOUT_MS / 1000}s`))
+        }, PRIME_SCRIPT_GRACE_MS)
+      }, PRIME_SCRIPT_TIMEOUT_MS)
 
       let stdout = ''
       let stderr = ''
@@ -177,6 +535,8 @@ async function fetchAddressesViaPythonScript(): Promise<Record<string, PrimeDepo
       })
 
       pythonProcess.on('close', (code: number | null) => {
+        clearTimeout(timeout)
+        clearTimeout(killTimer)
         if (code !== 0) {
           reject(new Error(`Python script exited with code ${code}: ${stderr}`))
         } else {
@@ -185,6 +545,8 @@ async function fetchAddressesViaPythonScript(): Promise<Record<string, PrimeDepo
       })
 
       pythonProcess.on('error', (error: Error) => {
+        clearTimeout(timeout)
+        clearTimeout(killTimer)
         reject(error)
       })
     })
@@ -219,8 +581,16 @@ async function fetchAddressesViaPythonScript(): Promise<Record<string, PrimeDepo
       }>
     > = {}
 
+    const pendingSymbols: string[] = []
+
     for (const result of results) {
-      if (result.status === 'found') {
+      if (result.status === 'pending') {
+        pendingSymbols.push(symbolMap[result.symbol] || result.symbol)
+      } else if (result.status === 'invalid') {
+        // Failed per-network validation: never served, handled like a symbol the crawl did not reach
+        console.error(`[Prime Addresses] ${result.symbol}: rejected address ${result.address} (${result.error})`)
+        pendingSymbols.push(symbolMap[result.symbol] || result.symbol)
+      } else if (result.status === 'found') {
         // Normalize symbol (POL → MATIC, etc.)
         const normalizedSymbol = symbolMap[result.symbol] || result.symbol
 
@@ -275,10 +645,9 @@ async function fetchAddressesViaPythonScript(): Promise<Record<string, PrimeDepo
       }
     }
 
-    // Update global stats with total wallets
-    if (PRIME_FETCH_STATS) {
-      PRIME_FETCH_STATS.totalWalletsFetched = totalWalletsFetched
-    }
+    // Recorded with the stats once the crawl is accepted
+    LAST_WALLET_COUNT = totalWalletsFetched
+    LAST_PENDING_SYMBOLS = pendingSymbols
 
     return addresses
   } catch (error: unknown) {
@@ -339,7 +708,16 @@ export function isPrimeAddressCacheReady(): boolean {
 
 /**
  * Get Prime fetch stats for health check
+ * Includes the address source, cache age and circuit breaker state.
  */
 export function getPrimeAddressStats() {
-  return PRIME_FETCH_STATS
+  if (!PRIME_FETCH_STATS) {
+    return null
+  }
+  return {
+    ...PRIME_FETCH_STATS,
+    cacheAgeMs: PRIME_FETCH_STATS.fetchedAt ? Date.now() - PRIME_FETCH_STATS.fetchedAt.getTime() : null,
+    refreshing: PRIME_REFRESH !== null,
+    circuit: PRIME_BREAKER.snapshot(),
+  }
 }
@@ -0,0 +1,335 @@
+/**
+ * Tests for the Prime address cache (prime-addresses.ts)
+ *
+ * Tests:
+ * - Circuit breaker: opens after repeated failures, half-open probe closes or re-opens it
+ * - Stale-while-revalidate: persisted and expired address sets are served while a refresh runs
+ * - Partial crawls: pending/invalid symbols keep the previous known-good address
+ * - Crawl timeout: SIGTERM collects partial results, SIGKILL after the grace period
+ *
+ * The Python crawl is replaced by a fake child process; the module is
+ * reloaded for every test so its caches and breaker start fresh.
+ */
+import { EventEmitter } from 'events'
+import * as fs from 'fs'
+import * as os from 'os'
+import * as path from 'path'
+
+jest.mock('child_process', () => ({ spawn: jest.fn() }))
+jest.mock('@/libs/robinhood/lib/assets/otc-loader', () => ({ getCachedOtcAddresses: jest.fn() }))
+
+type PrimeAddressesModule = typeof import('@/libs/robinhood/lib/assets/prime-addresses')
+
+const SCRIPT_TIMEOUT_MS = 2 * 60 * 1000
+const SCRIPT_GRACE_MS = 5 * 1000
+const BREAKER_COOLDOWN_MS = 60 * 1000
+const CACHE_MAX_AGE_MS = 15 * 60 * 1000
+
+const OTC_ADDRESSES = {
+  BTC: { address: 'otc-btc', walletType: 'OTC' },
+}
+
+interface CrawlRow {
+  symbol: string
+  status: 'found' | 'pending' | 'invalid' | 'missing'
+  address?: string
+  wallet_name?: string
+  wallet_id?: string
+  error?: string
+}
+
+function found(symbol: string, address: string): CrawlRow {
+  return { symbol, status: 'found', address, wallet_name: 'Trading', wallet_id: `wallet-${symbol}` }
+}
+
+/**
+ * Stand-in for the spawned generate_prime_wallets.py process
+ */
+class FakePythonProcess extends EventEmitter {
+  stdout = new EventEmitter()
+  stderr = new EventEmitter()
+  kill = jest.fn()
+
+  succeed(rows: CrawlRow[]): void {
+    this.stdout.emit('data', Buffer.from(JSON.stringify(rows, null, 2)))
+    this.emit('close', 0)
+  }
+
+  fail(): void {
+    this.stderr.emit('data', Buffer.from('Traceback (most recent call last):\nConnectionError'))
+    this.emit('close', 1)
+  }
+}
+
+describe('Prime addresses', () => {
+  let prime: PrimeAddressesModule
+  let spawn: jest.Mock
+  let cacheDir: string
+  let cachePath: string
+
+  /**
+   * Next crawl: resolves with rows, fails, or (with neither) is returned for the test to drive
+   */
+  function nextCrawl(outcome?: CrawlRow[] | 'fail'): FakePythonProcess {
+    const child = new FakePythonProcess()
+    spawn.mockImplementationOnce(() => {
+      // Listeners are attached right after spawn() returns
+      if (outcome === 'fail') {
+        Promise.resolve().then(() => child.fail())
+      } else if (outcome) {
+        Promise.resolve().then(() => child.succeed(outcome))
+      }
+      return child
+    })
+    return child
+  }
+
+  /**
+   * Let pending crawls and refresh promises settle
+   */
+  async function settle(): Promise<void> {
+    for (let i = 0; i < 5; i++) {
+      await new Promise((resolve) => setImmediate(resolve))
+    }
+  }
+
+  function writePersistedCache(addresses: Record<string, object>, fetchedAt: Date): void {
+    fs.mkdirSync(path.dirname(cachePath), { recursive: true })
+    fs.writeFileSync(
+      cachePath,
+      JSON.stringify({ fetchedAt: fetchedAt.toISOString(), totalWalletsFetched: 3, addresses }),
+    )
+  }
+
+  beforeEach(() => {
+    jest.useFakeTimers({ doNotFake: ['setImmediate', 'nextTick'] })
+    jest.spyOn(console, 'log').mockImplementation(() => {})
+    jest.spyOn(console, 'warn').mockImplementation(() => {})
+    jest.spyOn(console, 'error').mockImplementation(() => {})
+
+    cacheDir = fs.mkdtempSync(path.join(os.tmpdir(), 'prime-addresses-'))
+    cachePath = path.join(cacheDir, '.cache', 'prime-addresses.json')
+    process.env.PRIME_ADDRESS_CACHE_PATH = cachePath
+
+    jest.resetModules()
+    spawn = require('child_process').spawn
+    require('@/libs/robinhood/lib/assets/otc-loader').getCachedOtcAddresses.mockReturnValue(OTC_ADDRESSES)
+    prime = require('@/libs/robinhood/lib/assets/prime-addresses')
+  })
+
+  afterEach(() => {
+    jest.useRealTimers()
+    jest.restoreAllMocks()
+    delete process.env.PRIME_ADDRESS_CACHE_PATH
+    fs.rmSync(cacheDir, { recursive: true, force: true })
+  })
+
+  describe('cold start', () => {
+    it('should wait for the crawl and persist the result', async () => {
+      nextCrawl([found('BTC', 'bc1-live'), found('ETH', '0xlive')])
+
+      const addresses = await prime.fetchPrimeWalletAddresses()
+
+      expect(addresses.BTC.address).toBe('bc1-live')
+      expect(prime.getPrimeAddressStats()?.source).toBe('live')
+      const persisted = JSON.parse(fs.readFileSync(cachePath, 'utf8'))
+      expect(Object.keys(persisted.addresses)).toEqual(['BTC', 'ETH'])
+    })
+
+    it('should fall back to the OTC list when the crawl fails', async () => {
+      nextCrawl('fail')
+
+      const addresses = await prime.fetchPrimeWalletAddresses()
+
+      expect(addresses).toEqual(OTC_ADDRESSES)
+      expect(prime.getPrimeAddressStats()?.source).toBe('otc')
+      expect(fs.existsSync(cachePath)).toBe(false)
+    })
+  })
+
+  describe('circuit breaker', () => {
+    async function failThreeTimes(): Promise<void> {
+      for (let i = 0; i < 3; i++) {
+        nextCrawl('fail')
+        await prime.fetchPrimeWalletAddresses()
+      }
+    }
+
+    it('should open after three consecutive failures and stop spawning crawls', async () => {
+      await failThreeTimes()
+
+      expect(prime.getPrimeAddressStats()?.circuit).toMatchObject({
+        state: 'open',
+        consecutiveFailures: 3,
+        nextProbeInMs: BREAKER_COOLDOWN_MS,
+      })
+
+      const addresses = await prime.fetchPrimeWalletAddresses()
+
+      expect(addresses).toEqual(OTC_ADDRESSES)
+      expect(spawn).toHaveBeenCalledTimes(3)
+    })
+
+    it('should probe once after the cooldown and close on success', async () => {
+      await failThreeTimes()
+      nextCrawl([found('BTC', 'bc1-recovered')])
+
+      await jest.advanceTimersByTimeAsync(BREAKER_COOLDOWN_MS)
+      await settle()
+
+      expect(spawn).toHaveBeenCalledTimes(4)
+      expect(prime.getPrimeAddressStats()?.circuit).toMatchObject({ state: 'closed', consecutiveFailures: 0 })
+      expect(prime.getPrimeAddress('BTC')?.address).toBe('bc1-recovered')
+    })
+
+    it('should allow a single probe while half-open', async () => {
+      await failThreeTimes()
+      const probe = nextCrawl()
+
+      await jest.advanceTimersByTimeAsync(BREAKER_COOLDOWN_MS)
+      expect(prime.getPrimeAddressStats()?.circuit.state).toBe('half-open')
+
+      // Callers during the probe share it instead of spawning another crawl
+      await Promise.race([prime.fetchPrimeWalletAddresses(), settle()])
+      expect(spawn).toHaveBeenCalledTimes(4)
+
+      probe.succeed([found('BTC', 'bc1-recovered')])
+      await settle()
+      expect(prime.getPrimeAddressStats()?.circuit.state).toBe('closed')
+    })
+
+    it('should re-open with a doubled cooldown when the probe fails', async () => {
+      await failThreeTimes()
+      nextCrawl('fail')
+
+      await jest.advanceTimersByTimeAsync(BREAKER_COOLDOWN_MS)
+      await settle()
+
+      expect(prime.getPrimeAddressStats()?.circuit).toMatchObject({
+        state: 'open',
+        nextProbeInMs: 2 * BREAKER_COOLDOWN_MS,
+      })
+
+      // No probe before the longer cooldown elapses
+      await jest.advanceTimersByTimeAsync(BREAKER_COOLDOWN_MS)
+      expect(spawn).toHaveBeenCalledTimes(4)
+    })
+  })
+
+  describe('stale-while-revalidate', () => {
+    it('should serve a persisted set immediately and refresh in the background', async () => {
+      writePersistedCache({ BTC: { address: 'bc1-persisted', walletType: 'Trading' } }, new Date('2025-01-01'))
+      const crawl = nextCrawl()
+
+      const addresses = await prime.fetchPrimeWalletAddresses()
+
+      expect(addresses.BTC.address).toBe('bc1-persisted')
+      expect(prime.getPrimeAddressStats()).toMatchObject({ source: 'persisted', refreshing: true })
+      expect(spawn).toHaveBeenCalledTimes(1)
+
+      crawl.succeed([found('BTC', 'bc1-live')])
+      await settle()
+
+      expect(prime.getPrimeAddress('BTC')?.address).toBe('bc1-live')
+      expect(prime.getPrimeAddressStats()).toMatchObject({ source: 'live', refreshing: false })
+    })
+
+    it('should keep serving the persisted set when the refresh fails', async () => {
+      writePersistedCache({ BTC: { address: 'bc1-persisted', walletType: 'Trading' } }, new Date('2025-01-01'))
+      nextCrawl('fail')
+
+      await prime.fetchPrimeWalletAddresses()
+      await settle()
+
+      expect(prime.getPrimeAddress('BTC')?.address).toBe('bc1-persisted')
+      expect(prime.getPrimeAddressStats()?.source).toBe('persisted')
+    })
+
+    it('should refresh a live set once it is older than the max age', async () => {
+      nextCrawl([found('BTC', 'bc1-first')])
+      await prime.fetchPrimeWalletAddresses()
+
+      prime.getPrimeAddress('BTC')
+      expect(spawn).toHaveBeenCalledTimes(1)
+
+      jest.advanceTimersByTime(CACHE_MAX_AGE_MS + 1)
+      const crawl = nextCrawl()
+
+      // The expired address is still served while the refresh runs
+      expect(prime.getPrimeAddress('BTC')?.address).toBe('bc1-first')
+      expect(spawn).toHaveBeenCalledTimes(2)
+
+      crawl.succeed([found('BTC', 'bc1-second')])
+      await settle()
+      expect(prime.getPrimeAddress('BTC')?.address).toBe('bc1-second')
+    })
+  })
+
+  describe('partial crawls', () => {
+    it('should keep the previous address for pending and invalid symbols', async () => {
+      nextCrawl([found('BTC', 'bc1-first'), found('ETH', '0xfirst'), found('SOL', 'sol-first')])
+      await prime.fetchPrimeWalletAddresses()
+
+      jest.advanceTimersByTime(CACHE_MAX_AGE_MS + 1)
+      nextCrawl([
+        found('BTC', 'bc1-second'),
+        { symbol: 'ETH', status: 'pending' },
+        { symbol: 'SOL', status: 'invalid', address: 'not-base58', error: 'SOLANA: not base58' },
+        { symbol: 'XLM', status: 'pending' },
+      ])
+      prime.getPrimeAddress('BTC')
+      await settle()
+
+      expect(prime.getPrimeAddress('BTC')?.address).toBe('bc1-second')
+      expect(prime.getPrimeAddress('ETH')?.address).toBe('0xfirst')
+      expect(prime.getPrimeAddress('SOL')?.address).toBe('sol-first')
+      // Never had a known-good address: nothing to carry over
+      expect(prime.getPrimeAddress('XLM')).toBeUndefined()
+    })
+
+    it('should never serve an invalid address on a cold start', async () => {
+      nextCrawl([found('BTC', 'bc1-live'), { symbol: 'SOL', status: 'invalid', address: 'bad', error: 'bad' }])
+
+      const addresses = await prime.fetchPrimeWalletAddresses()
+
+      expect(addresses.BTC.address).toBe('bc1-live')
+      expect(addresses.SOL).toBeUndefined()
+    })
+  })
+
+  describe('crawl timeout', () => {
+    it('should SIGTERM an overrunning crawl and use its partial results', async () => {
+      const crawl = nextCrawl()
+      crawl.kill.mockImplementation((signal: string) => {
+        if (signal === 'SIGTERM') {
+          const rows: CrawlRow[] = [found('BTC', 'bc1-partial'), { symbol: 'ETH', status: 'pending' }]
+          Promise.resolve().then(() => crawl.succeed(rows))
+        }
+      })
+
+      const pending = prime.fetchPrimeWalletAddresses()
+      await jest.advanceTimersByTimeAsync(SCRIPT_TIMEOUT_MS)
+      const addresses = await pending
+
+      expect(crawl.kill).toHaveBeenCalledWith('SIGTERM')
+      expect(crawl.kill).not.toHaveBeenCalledWith('SIGKILL')
+      expect(addresses.BTC.address).toBe('bc1-partial')
+      expect(addresses.ETH).toBeUndefined()
+    })
+
+    it('should SIGKILL a crawl that ignores SIGTERM and count it as a failure', async () => {
+      const crawl = nextCrawl()
+
+      const pending = prime.fetchPrimeWalletAddresses()
+      await jest.advanceTimersByTimeAsync(SCRIPT_TIMEOUT_MS)
+      expect(crawl.kill).toHaveBeenCalledWith('SIGTERM')
+
+      await jest.advanceTimersByTimeAsync(SCRIPT_GRACE_MS)
+      const addresses = await pending
+
+      expect(crawl.kill).toHaveBeenCalledWith('SIGKILL')
+      expect(addresses).toEqual(OTC_ADDRESSES)
+      expect(prime.getPrimeAddressStats()?.circuit.consecutiveFailures).toBe(1)
+    })
+  })
+})
@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+"""
+Reverse Index of Prime Deposit Addresses
+
+Robinhood order details only say where the crypto went (`destinationAddress`,
+plus `blockchainTransactionId`). This maps a destination back to the Prime
+wallet that owns it: address → (symbol, network, wallet_id, portfolio, memo).
+
+Addresses are normalized per chain family so the same destination always hits
+the same key, whichever way it was written:
+
+  EVM / Sui (0x hex)           lowercased (EIP-55 checksum case is ignored)
+  bech32 (bc1, ltc1, addr1)    lowercased (bech32 is case-insensitive, never mixed)
+  Bitcoin Cash cashaddr        lowercased, "bitcoincash:" prefix dropped
+  base58 / base32 / other      exact (case is significant)
+  Stellar, XRP, Hedera         qualified by memo: (address, memo)
+
+Memo networks share one address across many destinations, so a memo-less
+lookup of such an address returns every wallet behind it.
+
+The index is built once from any address file the scripts produce and
+answers each lookup with one dict access; attribute() reconciles a whole batch
+of orders in one pass.
+
+Usage:
+  python3 address_index.py lookup 0x0788702C7D70914F34B82FB6AD0B405263A00486
+  python3 address_index.py lookup rXXXX... --memo 2237695492
+  python3 address_index.py attribute orders.json -o attributed.csv   # JSON array or JSONL of order details
+  python3 address_index.py stats --source robinhood_assets_addresses_20250101_120000.json
+  python3 address_index.py benchmark --orders 100000
+
+  from address_index import load_index
+  index = load_index()                       # robinhood-assets-config.json, cached per path
+  index.lookup(order["destinationAddress"])  # (AddressEntry(symbol='ETH', ...),)
+"""
+
+import argparse
+import csv
+import json
+import re
+import sys
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from generate_prime_wallets import ROBINHOOD_ASSETS
+
+DEFAULT_SOURCE = Path(__file__).parent / "robinhood-assets-config.json"
+
+MEMO_NETWORKS = {"STELLAR", "XRP", "HEDERA"}
+BECH32_PREFIXES = ("bc1", "tb1", "ltc1", "addr1", "stake1")
+CASHADDR_PREFIX = "bitcoincash:"
+_HEX_ADDRESS = re.compile(r"^0[xX][0-9a-fA-F]+$")
+
+# Keys an order may carry its memo / destination tag under
+ORDER_MEMO_KEYS = ("memo", "destinationTag", "destinationMemo")
+
+
+class AddressEntry(NamedTuple):
+    """One Prime wallet that receives at an address"""
+
+    symbol: str
+    network: Optional[str]
+    wallet_id: Optional[str]
+    wallet_name: Optional[str]
+    portfolio_id: Optional[str]
+    address: str
+    memo: Optional[str]
+
+
+def normalize_address(address: str) -> str:
+    """Canonical form of an address for its chain family (see module docstring)"""
+    address = address.strip()
+    if _HEX_ADDRESS.match(address):
+        return address.lower()
+    lowered = address.lower()
+    if lowered.startswith(CASHADDR_PREFIX):
+        return lowered[len(CASHADDR_PREFIX):]
+    if lowered.startswith(BECH32_PREFIXES) and (address == lowered or address == address.upper()):
+        return lowered
+    return address
+
+
+def normalize_memo(memo) -> Optional[str]:
+    """Memos compare as trimmed strings ('' and None are no memo)"""
+    if memo is None:
+        return None
+    memo = str(memo).strip()
+    return memo or None
+
+
+def row_network(row: Dict) -> Optional[str]:
+    """Network of an address row: its own network or chain (fallback rows), else the asset's"""
+    if row.get("network"):
+        return row["network"]
+    if row.get("chain"):
+        return row["chain"].upper().replace(" ", "_")
+    return ROBINHOOD_ASSETS.get(row["symbol"])
+
+
+def load_rows(path: Path) -> List[Dict]:
+    """
+    Address rows (found and fallback) from any of:
+      - robinhood-assets-config.json               [{symbol, wallet_id, address, memo, ...}]
+      - generate_prime_wallets.py JSON output       [{symbol, network, status, address, ...}]
+      - the app's .cache/prime-addresses.json       {"addresses": {symbol: {address, memo, walletId}}}
+    """
+    with open(path) as f:
+        data = json.load(f)
+    if isinstance(data, dict):
+        return [{"symbol": symbol, "address": entry.get("address"), "memo": entry.get("memo"),
+                 "wallet_id": entry.get("walletId"), "wallet_name": entry.get("walletType")}
+                for symbol, entry in data.get("addresses", {}).items()]
+    return [row for row in data if row.get("status", "found") in ("found", "fallback")]
+
+
+class AddressIndex:
+    """address (normalized) → entries, plus (address, memo) → entries for memo networks"""
+
+    def __init__(self):
+        self.by_address: Dict[str, Tuple[AddressEntry, ...]] = {}
+        self.by_memo: Dict[Tuple[str, str], Tuple[AddressEntry, ...]] = {}
+        self.entries = 0
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Dict], portfolio_id: Optional[str] = None) -> "AddressIndex":
+        index = cls()
+        for row in rows:
+            if not row.get("address"):
+                continue
+            symbol = row["symbol"]
+            entry = AddressEntry(
+                symbol=symbol,
+                network=row_network(row),
+                wallet_id=row.get("wallet_id"),
+                wallet_name=row.get("wallet_name"),
+                portfolio_id=row.get("portfolio_id") or portfolio_id,
+                address=row["address"],
+                memo=normalize_memo(row.get("memo")),
+            )
+            index.add(entry)
+        return index
+
+    def add(self, entry: AddressEntry) -> None:
+        key = normalize_address(entry.address)
+        self.by_address[key] = self.by_address.get(key, ()) + (entry,)
+        if entry.memo is not None:
+            memo_key = (key, entry.memo)
+            self.by_memo[memo_key] = self.by_memo.get(memo_key, ()) + (entry,)
+        self.entries += 1
+
+    def __len__(self) -> int:
+        return self.entries
+
+    def lookup(self, address: str, memo=None, symbol: Optional[str] = None) -> Tuple[AddressEntry, ...]:
+        """
+        Wallets receiving at address (empty tuple when unknown)
+
+        With a memo only the wallet behind that memo matches; without one, a
+        shared memo-network address returns every wallet behind it. symbol
+        narrows the result when the order says which asset it was.
+        """
+        key = normalize_address(address)
+        memo = normalize_memo(memo)
+        if memo is None:
+            entries = self.by_address.get(key, ())
+        else:
+            # A memo on a non-memo network is noise; on a memo network it must match
+            entries = self.by_memo.get((key, memo)) or tuple(
+                entry for entry in self.by_address.get(key, ()) if entry.network not in MEMO_NETWORKS)
+        if symbol is not None:
+            entries = tuple(entry for entry in entries if entry.symbol == symbol)
+        return entries
+
+    def lookup_many(self, queries: Iterable) -> List[Tuple[AddressEntry, ...]]:
+        """lookup() for each address or (address, memo) query, in order"""
+        lookup = self.lookup
+        return [lookup(*query) if isinstance(query, tuple) else lookup(query) for query in queries]
+
+    def attribute(self, orders: Iterable[Dict]) -> List[Dict]:
+        """
+        One row per order: its referenceId, destination and transaction hash
+        with the owning wallet ('matched'), every candidate when a memo-less
+        destination is shared ('ambiguous'), or nothing ('unmatched')
+
+        The order's assetCode picks among wallets sharing the destination
+        (e.g. ERC-20 tokens on one fallback ETH address); address-only
+        matching is the fallback when no wallet has that symbol.
+        """
+        rows = []
+        for order in orders:
+            address = order.get("destinationAddress") or ""
+            memo = next((order[k] for k in ORDER_MEMO_KEYS if order.get(k) not in (None, "")), None)
+            symbol = (order.get("assetCode") or "").upper() or None
+            entries = ()
+            if address:
+                entries = (symbol and self.lookup(address, memo, symbol)) or self.lookup(address, memo)
+            status = "matched" if len(entries) == 1 else ("ambiguous" if entries else "unmatched")
+            entry = entries[0] if len(entries) == 1 else None
+            rows.append({
+                "referenceId": order.get("referenceId"),
+                "destinationAddress": address,
+                "blockchainTransactionId": order.get("blockchainTransactionId"),
+                "status": status,
+                "symbol": entry.symbol if entry else ",".join(e.symbol for e in entries) or None,
+                "network": entry.network if entry else None,
+                "wallet_id": entry.wallet_id if entry else None,
+                "portfolio_id": entry.portfolio_id if entry else None,
+                "memo": entry.memo if entry else memo,
+            })
+        return rows
+
+
+def default_portfolio_id() -> Optional[str]:
+    """COINBASE_PRIME_PORTFOLIO_ID from the environment / .env.local, if set"""
+    from prime_config import get_credentials
+    return get_credentials().portfolio_id
+
+
+@lru_cache(maxsize=None)
+def load_index(source: Path = DEFAULT_SOURCE, portfolio_id: Optional[str] = None) -> AddressIndex:
+    """Index built from an address file (cached per path: loaded once per process)"""
+    return AddressIndex.from_rows(load_rows(source), portfolio_id or default_portfolio_id())
+
+
+def read_orders(path: Path) -> List[Dict]:
+    """Order details as a JSON array, a {"orders": [...]} object or JSON lines"""
+    with open(path) as f:
+        text = f.read()
+    try:
+        data = json.loads(text)
+    except ValueError:
+        return [json.loads(line) for line in text.splitlines() if line.strip()]
+    if isinstance(data, dict):
+        return data.get("orders", [data])
+    return data
+
+
+def benchmark(index: AddressIndex, orders: int) -> None:
+    """Attribute a synthetic batch of orders (mostly known destinations, some mixed-case, some unknown)"""
+    import random
+
+    known = [entry for entries in index.by_address.values() for entry in entries]
+    batch = []
+    for n in range(orders):
+        if n % 10 == 0 or not known:
+            batch.append({"referenceId": str(n), "destinationAddress": f"unknown-{n}"})
+            continue
+        entry = random.choice(known)
+        address = "0x" + entry.address[2:].upper() if entry.address.startswith("0x") and n % 3 == 0 else entry.address
+        batch.append({"referenceId": str(n), "destinationAddress": address, "memo": entry.memo,
+                      "assetCode": entry.symbol})
+
+    started = time.perf_counter()
+    rows = index.attribute(batch)
+    elapsed = time.perf_counter() - started
+    matched = sum(1 for row in rows if row["status"] == "matched")
+    print(f"Attributed {orders:,} orders in {elapsed * 1000:.1f} ms "
+          f"({orders / elapsed:,.0f} orders/s) - {matched:,} matched")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Map deposit addresses back to Prime wallets")
+    parser.add_argument("--source", type=Path, default=DEFAULT_SOURCE,
+                        help="Address file (assets config, generate_prime_wallets output or app cache)")
+    parser.add_argument("--portfolio", help="Portfolio ID to attach (default: COINBASE_PRIME_PORTFOLIO_ID)")
+    sub = parser.add_subparsers(dest="command", required=True)
+    lookup_parser = sub.add_parser("lookup", help="Show the wallet(s) behind addresses (exit 1 if any is unknown)")
+    lookup_parser.add_argument("addresses", nargs="+")
+    lookup_parser.add_argument("--memo", help="Memo / destination tag (Stellar, XRP, Hedera)")
+    attribute_parser = sub.add_parser("attribute", help="Attribute Robinhood order details to wallets")
+    attribute_parser.add_argument("orders", type=Path, help="Order details: JSON array or JSON lines")
+    attribute_parser.add_argument("-o", "--output", help="CSV output (default: stdout)")
+    sub.add_parser("stats", help="Show what the index covers")
+    bench_parser = sub.add_parser("benchmark", help="Measure batch attribution speed")
+    bench_parser.add_argument("--orders", type=int, default=100_000, help="Synthetic orders to attribute")
+    args = parser.parse_args()
+
+    index = load_index(args.source, args.portfolio)
+
+    if args.command == "lookup":
+        unknown = 0
+        for address in args.addresses:
+            entries = index.lookup(address, args.memo)
+            unknown += not entries
+            if not entries:
+                print(f"❌ {address}: not a known deposit address")
+            for entry in entries:
+                memo = f" memo {entry.memo}" if entry.memo else ""
+                print(f"✅ {address}: {entry.symbol} ({entry.network}) wallet {entry.wallet_id} "
+                      f"[{entry.wallet_name}]{memo} portfolio {entry.portfolio_id or '-'}")
+        sys.exit(1 if unknown else 0)
+
+    elif args.command == "attribute":
+        rows = index.attribute(read_orders(args.orders))
+        out = open(args.output, "w", newline="") if args.output else sys.stdout
+        writer = csv.DictWriter(out, fieldnames=list(rows[0]) if rows else ["referenceId"])
+        writer.writeheader()
+        writer.writerows(rows)
+        if args.output:
+            out.close()
+        counts = {status: sum(1 for row in rows if row["status"] == status)
+                  for status in ("matched", "ambiguous", "unmatched")}
+        print(f"✅ {len(rows)} order(s): {counts['matched']} matched, {counts['ambiguous']} ambiguous, "
+              f"{counts['unmatched']} unmatched", file=sys.stderr)
+
+    elif args.command == "stats":
+        networks: Dict[str, int] = {}
+        for entries in index.by_address.values():
+            for entry in entries:
+                networks[entry.network or "?"] = networks.get(entry.network or "?", 0) + 1
+        shared = sum(1 for entries in index.by_address.values() if len(entries) > 1)
+        print(f"Source: {args.source}")
+        print(f"Entries: {len(index)} | Distinct addresses: {len(index.by_address)} | "
+              f"Memo-qualified: {len(index.by_memo)} | Shared addresses: {shared}")
+        for network, count in sorted(networks.items(), key=lambda item: -item[1]):
+            print(f"  {network:20} {count}")
+
+    elif args.command == "benchmark":
+        benchmark(index, args.orders)
@@ -0,0 +1,454 @@
+#!/usr/bin/env python3
+"""
+Per-Chain Deposit Address Validation
+
+Checks every resolved deposit address against the rules of its network before
+it can reach PRIME_DEPOSIT_ADDRESSES or the app:
+
+  EVM networks           0x + 40 hex; EIP-55 checksum when mixed-case
+  Sui                    0x + 64 hex
+  Bitcoin / Litecoin     base58check (P2PKH/P2SH versions) or bech32/bech32m segwit
+  Dogecoin               base58check (D / A / 9)
+  Bitcoin Cash           CashAddr checksum (prefix optional) or legacy base58check
+  Solana                 base58, 32 bytes
+  Cardano                bech32 'addr' (Shelley)
+  Tezos                  base58check tz1/tz2/tz3/KT1
+  Stellar                StrKey G... with CRC16; memo required (id or ≤28-byte text)
+  XRP                    base58check, Ripple alphabet; destination tag required (uint32)
+  Hedera                 0.0.N (optional -checksum); memo required (≤100 bytes)
+
+A memo on any other network is an error (it would end up in
+PRIME_DEPOSIT_MEMOS).
+
+validate_batch() works over a whole result set at once: records are grouped
+by network and each group runs through one precompiled validator. EIP-55
+hashes of all mixed-case EVM addresses are computed together; batches of
+NUMPY_MIN_BATCH or more run Keccak-256 vectorized with NumPy when it is
+installed (optional, see README Setup), smaller ones in pure Python, where
+importing NumPy would cost more than it saves.
+
+Usage:
+  python3 address_validation.py                                  # robinhood-assets-config.json
+  python3 address_validation.py robinhood_assets_addresses_*.json
+  python3 address_validation.py --benchmark 10000
+
+  from address_validation import validate_batch
+  errors = validate_batch(rows)      # [None, "XRP: destination tag required", ...]
+"""
+
+import argparse
+import base64
+import hashlib
+import re
+import sys
+import time
+from typing import Callable, Dict, List, Optional, Sequence
+
+EVM_NETWORKS = {"ETHEREUM", "POLYGON", "ARBITRUM", "BASE", "OPTIMISM", "ZORA", "AVALANCHE", "ETHEREUM_CLASSIC"}
+MEMO_NETWORKS = {"STELLAR", "XRP", "HEDERA"}
+UNRESOLVED_STATUSES = ("missing", "pending")  # Result rows that never had an address to check
+
+_EVM = re.compile(r"^0x[0-9a-fA-F]{40}$")
+_SUI = re.compile(r"^0x[0-9a-fA-F]{64}$")
+_HEDERA = re.compile(r"^0\.0\.\d+(-[a-z]{5})?$")
+_DIGITS = re.compile(r"^\d+$")
+
+BITCOIN_ALPHABET = "123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"
+RIPPLE_ALPHABET = "rpshnaf39wBUDNEGHJKLM4PQRST7VWXYZ2bcdeCg65jkm8oFqi1tuvAxyz"
+BECH32_CHARSET = "qpzry9x8gf2tvdw0s3jn54khce6mua7l"
+_BECH32_VALUES = {c: i for i, c in enumerate(BECH32_CHARSET)}
+
+
+# --- Keccak-256 (EIP-55 uses the original Keccak padding, not NIST SHA3-256) ---
+
+_ROUND_CONSTANTS = [
+    0x0000000000000001, 0x0000000000008082, 0x800000000000808A, 0x8000000080008000,
+    0x000000000000808B, 0x0000000080000001, 0x8000000080008081, 0x8000000000008009,
+    0x000000000000008A, 0x0000000000000088, 0x0000000080008009, 0x000000008000000A,
+    0x000000008000808B, 0x800000000000008B, 0x8000000000008089, 0x8000000000008003,
+    0x8000000000008002, 0x8000000000000080, 0x000000000000800A, 0x800000008000000A,
+    0x8000000080008081, 0x8000000000008080, 0x0000000080000001, 0x8000000080008008,
+]
+# Rotation offsets and pi destination, per lane index x + 5y
+_ROTATIONS = [0, 1, 62, 28, 27, 36, 44, 6, 55, 20, 3, 10, 43, 25, 39, 41, 45, 15, 21, 8, 18, 2, 61, 56, 14]
+_PI = [0] * 25
+for _x in range(5):
+    for _y in range(5):
+        _PI[_x + 5 * _y] = _y + 5 * ((2 * _x + 3 * _y) % 5)
+_RATE = 136
+NUMPY_MIN_BATCH = 256  # ~0.5 ms per pure-Python hash vs ~90 ms to import NumPy
+_MASK = (1 << 64) - 1
+
+
+def _keccak_pad(message: bytes) -> bytes:
+    padded = bytearray(message + b"\x01" + b"\x00" * (-(len(message) + 1) % _RATE))
+    padded[-1] |= 0x80
+    return bytes(padded)
+
+
+def keccak256(message: bytes) -> bytes:
+    """Keccak-256 digest (pure Python)"""
+    state = [0] * 25
+    padded = _keccak_pad(message)
+    for offset in range(0, len(padded), _RATE):
+        for i in range(_RATE // 8):
+            state[i] ^= int.from_bytes(padded[offset + 8 * i:offset + 8 * i + 8], "little")
+        for rc in _ROUND_CONSTANTS:
+            c = [state[x] ^ state[x + 5] ^ state[x + 10] ^ state[x + 15] ^ state[x + 20] for x in range(5)]
+            d = [c[(x - 1) % 5] ^ (((c[(x + 1) % 5] << 1) | (c[(x + 1) % 5] >> 63)) & _MASK) for x in range(5)]
+            b = [0] * 25
+            for i in range(25):
+                lane, r = state[i] ^ d[i % 5], _ROTATIONS[i]
+                b[_PI[i]] = ((lane << r) | (lane >> (64 - r))) & _MASK if r else lane
+            state = [b[i] ^ (~b[(i % 5 + 1) % 5 + 5 * (i // 5)] & b[(i % 5 + 2) % 5 + 5 * (i // 5)])
+                     for i in range(25)]
+            state[0] ^= rc
+    return b"".join(state[i].to_bytes(8, "little") for i in range(4))
+
+
+def keccak256_batch(messages: Sequence[bytes]) -> List[bytes]:
+    """Keccak-256 of many single-block messages of one length, vectorized with NumPy when available"""
+    if len(messages) < NUMPY_MIN_BATCH:
+        return [keccak256(m) for m in messages]
+    try:
+        import numpy as np
+    except ImportError:
+        return [keccak256(m) for m in messages]
+    if len({len(m) for m in messages}) != 1 or len(messages[0]) >= _RATE:
+        return [keccak256(m) for m in messages]
+
+    blocks = np.frombuffer(b"".join(_keccak_pad(m) for m in messages), dtype="<u8").reshape(len(messages), -1)
+    state = [np.zeros(len(messages), dtype=np.uint64) for _ in range(25)]
+    for i in range(_RATE // 8):
+        state[i] = state[i] ^ blocks[:, i]
+    one, rotations = np.uint64(1), [np.uint64(r) for r in _ROTATIONS]
+    inverse = [np.uint64(64 - r) if r else None for r in _ROTATIONS]
+    for rc in _ROUND_CONSTANTS:
+        c = [state[x] ^ state[x + 5] ^ state[x + 10] ^ state[x + 15] ^ state[x + 20] for x in range(5)]
+        d = [c[(x - 1) % 5] ^ ((c[(x + 1) % 5] << one) | (c[(x + 1) % 5] >> np.uint64(63))) for x in range(5)]
+        b = [None] * 25
+        for i in range(25):
+            lane = state[i] ^ d[i % 5]
+            b[_PI[i]] = (lane << rotations[i]) | (lane >> inverse[i]) if inverse[i] is not None else lane
+        state = [b[i] ^ (~b[(i % 5 + 1) % 5 + 5 * (i // 5)] & b[(i % 5 + 2) % 5 + 5 * (i // 5)]) for i in range(25)]
+        state[0] = state[0] ^ np.uint64(rc)
+    digest = np.stack(state[:4], axis=1).astype("<u8")
+    return [row.tobytes() for row in digest]
+
+
+def eip55_mismatch(address: str, digest: bytes) -> bool:
+    """True when a mixed-case address does not match the EIP-55 checksum of its lowercase hex"""
+    body = address[2:]
+    for i, char in enumerate(body):
+        if char.isalpha():
+            nibble = digest[i // 2] >> 4 if i % 2 == 0 else digest[i // 2] & 0x0F
+            if char.isupper() != (nibble >= 8):
+                return True
+    return False
+
+
+# --- Encodings ---
+
+def b58decode(text: str, alphabet: str = BITCOIN_ALPHABET) -> Optional[bytes]:
+    """Base58 → bytes (None if a character is outside the alphabet)"""
+    number = 0
+    for char in text:
+        value = alphabet.find(char)
+        if value < 0:
+            return None
+        number = number * 58 + value
+    leading = len(text) - len(text.lstrip(alphabet[0]))
+    return b"\x00" * leading + number.to_bytes((number.bit_length() + 7) // 8, "big")
+
+
+def b58check_payload(text: str, alphabet: str = BITCOIN_ALPHABET) -> Optional[bytes]:
+    """Payload of a base58check string (None if undecodable or the checksum fails)"""
+    raw = b58decode(text, alphabet)
+    if raw is None or len(raw) < 5:
+        return None
+    payload, checksum = raw[:-4], raw[-4:]
+    if hashlib.sha256(hashlib.sha256(payload).digest()).digest()[:4] != checksum:
+        return None
+    return payload
+
+
+def _bech32_polymod(values: List[int]) -> int:
+    generator = [0x3B6A57B2, 0x26508E6D, 0x1EA119FA, 0x3D4233DD, 0x2A1462B3]
+    checksum = 1
+    for value in values:
+        top = checksum >> 25
+        checksum = (checksum & 0x1FFFFFF) << 5 ^ value
+        for i in range(5):
+            checksum ^= generator[i] if (top >> i) & 1 else 0
+    return checksum
+
+
+def bech32_decode(text: str) -> Optional[tuple]:
+    """(hrp, 5-bit data without checksum, 'bech32' | 'bech32m') or None"""
+    if text != text.lower() and text != text.upper():
+        return None
+    text = text.lower()
+    hrp, sep, data = text.rpartition("1")
+    if not sep or not hrp or len(data) < 6 or any(c not in _BECH32_VALUES for c in data):
+        return None
+    values = [_BECH32_VALUES[c] for c in data]
+    polymod = _bech32_polymod([ord(c) >> 5 for c in hrp] + [0] + [ord(c) & 31 for c in hrp] + values)
+    variant = {1: "bech32", 0x2BC830A3: "bech32m"}.get(polymod)
+    return (hrp, values[:-6], variant) if variant else None
+
+
+def _convert_bits(data: List[int], from_bits: int, to_bits: int) -> Optional[List[int]]:
+    acc, bits, result, maxv = 0, 0, [], (1 << to_bits) - 1
+    for value in data:
+        acc = (acc << from_bits) | value
+        bits += from_bits
+        while bits >= to_bits:
+            bits -= to_bits
+            result.append((acc >> bits) & maxv)
+    if bits >= from_bits or (acc << (to_bits - bits)) & maxv:
+        return None
+    return result
+
+
+def segwit_error(address: str, hrp: str) -> Optional[str]:
+    """None for a valid segwit address with this hrp"""
+    decoded = bech32_decode(address)
+    if not decoded or decoded[0] != hrp:
+        return "bad bech32 checksum or prefix"
+    _, data, variant = decoded
+    if not data:
+        return "empty witness program"
+    version, program = data[0], _convert_bits(data[1:], 5, 8)
+    if program is None or not 2 <= len(program) <= 40 or version > 16:
+        return "bad witness program"
+    if version == 0 and (variant != "bech32" or len(program) not in (20, 32)):
+        return "bad v0 witness program"
+    if version > 0 and variant != "bech32m":
+        return "witness v1+ must use bech32m"
+    return None
+
+
+def _cashaddr_polymod(values: List[int]) -> int:
+    generators = [0x98F2BC8E61, 0x79B76D99E2, 0xF33E5FB3C4, 0xAE2EABE2A8, 0x1E4F43E470]
+    checksum = 1
+    for value in values:
+        top = checksum >> 35
+        checksum = ((checksum & 0x07FFFFFFFF) << 5) ^ value
+        for i in range(5):
+            checksum ^= generators[i] if (top >> i) & 1 else 0
+    return checksum ^ 1
+
+
+# --- Per-network validators: address (+ memo) → error or None ---
+
+def _base58check_versions(versions: Dict[int, int], alphabet: str = BITCOIN_ALPHABET) -> Callable[[str], Optional[str]]:
+    """Validator for base58check addresses with one of these version bytes (version → payload length)"""
+    def check(address: str) -> Optional[str]:
+        payload = b58check_payload(address, alphabet)
+        if payload is None:
+            return "bad base58check encoding or checksum"
+        if versions.get(payload[0]) != len(payload) - 1:
+            return f"unexpected version byte 0x{payload[0]:02x}"
+        return None
+    return check
+
+
+_BTC_LEGACY = _base58check_versions({0x00: 20, 0x05: 20})
+_LTC_LEGACY = _base58check_versions({0x30: 20, 0x32: 20, 0x05: 20})
+_DOGE_LEGACY = _base58check_versions({0x1E: 20, 0x16: 20})
+_XRP = _base58check_versions({0x00: 20}, RIPPLE_ALPHABET)
+_TEZOS_PREFIXES = {b"\x06\xa1\x9f", b"\x06\xa1\xa1", b"\x06\xa1\xa4", b"\x02\x5a\x79"}
+
+
+def validate_bitcoin(address: str) -> Optional[str]:
+    return segwit_error(address, "bc") if address.lower().startswith("bc1") else _BTC_LEGACY(address)
+
+
+def validate_litecoin(address: str) -> Optional[str]:
+    return segwit_error(address, "ltc") if address.lower().startswith("ltc1") else _LTC_LEGACY(address)
+
+
+def validate_bitcoin_cash(address: str) -> Optional[str]:
+    if address[:1] in "13":
+        return _BTC_LEGACY(address)
+    if address != address.lower() and address != address.upper():
+        return "mixed-case CashAddr"
+    prefix, _, payload = address.lower().rpartition(":")
+    prefix = prefix or "bitcoincash"
+    if prefix != "bitcoincash" or len(payload) < 8 or any(c not in _BECH32_VALUES for c in payload):
+        return "bad CashAddr prefix or characters"
+    values = [ord(c) & 31 for c in prefix] + [0] + [_BECH32_VALUES[c] for c in payload]
+    return None if _cashaddr_polymod(values) == 0 else "bad CashAddr checksum"
+
+
+def validate_solana(address: str) -> Optional[str]:
+    raw = b58decode(address)
+    return None if raw is not None and len(raw) == 32 else "not a 32-byte base58 public key"
+
+
+def validate_cardano(address: str) -> Optional[str]:
+    decoded = bech32_decode(address)
+    if not decoded or decoded[0] != "addr" or decoded[2] != "bech32":
+        return "not a bech32 'addr' address"
+    return None
+
+
+def validate_tezos(address: str) -> Optional[str]:
+    payload = b58check_payload(address)
+    if payload is None:
+        return "bad base58check encoding or checksum"
+    if payload[:3] not in _TEZOS_PREFIXES or len(payload) != 23:
+        return "not a tz1/tz2/tz3/KT1 address"
+    return None
+
+
+def validate_sui(address: str) -> Optional[str]:
+    return None if _SUI.match(address) else "not 0x + 64 hex characters"
+
+
+def validate_stellar(address: str) -> Optional[str]:
+    if len(address) != 56 or not address.startswith("G"):
+        return "not a 56-character G... account"
+    try:
+        raw = base64.b32decode(address)
+    except ValueError:
+        return "bad base32"
+    crc = 0
+    for byte in raw[:-2]:
+        crc ^= byte << 8
+        for _ in range(8):
+            crc = ((crc << 1) ^ 0x1021) & 0xFFFF if crc & 0x8000 else (crc << 1) & 0xFFFF
+    return None if crc.to_bytes(2, "little") == raw[-2:] else "bad StrKey checksum"
+
+
+def validate_hedera(address: str) -> Optional[str]:
+    return None if _HEDERA.match(address) else "not a 0.0.N account ID"
+
+
+def _memo_error(network: str, memo: Optional[str]) -> Optional[str]:
+    if network not in MEMO_NETWORKS:
+        return "unexpected memo" if memo else None
+    if not memo:
+        return "memo / destination tag required"
+    if network == "XRP":
+        return None if _DIGITS.match(memo) and int(memo) < 2 ** 32 else "destination tag must be a uint32"
+    if network == "STELLAR":
+        if _DIGITS.match(memo):
+            return None if int(memo) < 2 ** 64 else "memo id must be a uint64"
+        return None if len(memo.encode()) <= 28 else "memo text over 28 bytes"
+    return None if len(memo.encode()) <= 100 else "memo over 100 bytes"
+
+
+VALIDATORS: Dict[str, Callable[[str], Optional[str]]] = {
+    "BITCOIN": validate_bitcoin,
+    "LITECOIN": validate_litecoin,
+    "DOGECOIN": lambda address: _DOGE_LEGACY(address),
+    "BITCOIN_CASH": validate_bitcoin_cash,
+    "SOLANA": validate_solana,
+    "CARDANO": validate_cardano,
+    "TEZOS": validate_tezos,
+    "SUI": validate_sui,
+    "STELLAR": validate_stellar,
+    "XRP": lambda address: _XRP(address),
+    "HEDERA": validate_hedera,
+}
+
+
+def validate_batch(records: Sequence[Dict]) -> List[Optional[str]]:
+    """
+    One error message (None = valid) per record, in order
+
+    Records need 'network', 'address' and optionally 'memo'. Missing and
+    pending rows are not checked; any other row without an address (e.g. a
+    'found' row from a response with no address) is an error.
+    """
+    errors: List[Optional[str]] = [None] * len(records)
+    checksummed = []  # (index, address) of mixed-case EVM addresses
+
+    by_network: Dict[str, List[int]] = {}
+    for i, record in enumerate(records):
+        if record.get("status") in UNRESOLVED_STATUSES:
+            continue
+        if not isinstance(record.get("address"), str) or not record["address"].strip():
+            errors[i] = f"{record.get('network') or '?'}: no deposit address"
+            continue
+        by_network.setdefault(record.get("network") or "", []).append(i)
+
+    for network, indexes in by_network.items():
+        validator = VALIDATORS.get(network)
+        for i in indexes:
+            address = records[i]["address"].strip()
+            memo = records[i].get("memo")
+            memo = str(memo).strip() if memo is not None else None
+            if network in EVM_NETWORKS:
+                if not _EVM.match(address):
+                    error = "not 0x + 40 hex characters"
+                else:
+                    error = None
+                    if address[2:] != address[2:].lower() and address[2:] != address[2:].upper():
+                        checksummed.append((i, address))
+            elif validator:
+                error = validator(address)
+            else:
+                error = "no validator for this network"
+            error = error or _memo_error(network, memo)
+            if error:
+                errors[i] = f"{network or '?'}: {error}"
+
+    digests = keccak256_batch([address[2:].lower().encode() for _, address in checksummed])
+    for (i, address), digest in zip(checksummed, digests):
+        if eip55_mismatch(address, digest):
+            errors[i] = f"{records[i]['network']}: EIP-55 checksum mismatch"
+    return errors
+
+
+def benchmark(count: int) -> None:
+    """Validate a synthetic batch mixing every network"""
+    import random
+
+    from address_index import DEFAULT_SOURCE, load_rows, row_network
+
+    rows = [dict(row, network=row_network(row)) for row in load_rows(DEFAULT_SOURCE) if row.get("address")]
+    # Fresh EIP-55 addresses so the Keccak work is real, not the same few hashes
+    records = []
+    for n in range(count):
+        row = dict(random.choice(rows))
+        if row["network"] in EVM_NETWORKS:
+            row["address"] = "0x" + hashlib.sha256(str(n).encode()).hexdigest()[:40]
+            digest = keccak256(row["address"][2:].encode())
+            row["address"] = "0x" + "".join(
+                c.upper() if c.isalpha() and (digest[i // 2] >> (4 if i % 2 == 0 else 0)) & 0x0F >= 8 else c
+                for i, c in enumerate(row["address"][2:]))
+        records.append(row)
+
+    started = time.perf_counter()
+    errors = validate_batch(records)
+    elapsed = time.perf_counter() - started
+    invalid = sum(1 for e in errors if e)
+    print(f"Validated {count:,} addresses in {elapsed * 1000:.1f} ms ({count / elapsed:,.0f}/s), {invalid} invalid")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Validate deposit addresses per network")
+    parser.add_argument("paths", nargs="*", help="Address files (default: robinhood-assets-config.json)")
+    parser.add_argument("--benchmark", type=int, metavar="N", help="Validate N synthetic addresses")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        benchmark(args.benchmark)
+        sys.exit(0)
+
+    from address_index import DEFAULT_SOURCE, load_rows, row_network
+
+    failed = 0
+    for path in args.paths or [DEFAULT_SOURCE]:
+        rows = [dict(row, network=row_network(row)) for row in load_rows(path)]
+        errors = validate_batch(rows)
+        print(f"{path}: {len(rows)} address(es)")
+        for row, error in zip(rows, errors):
+            if error:
+                failed += 1
+                print(f"  ❌ {row['symbol']:10} {row['address']}  {error}")
+        if not any(errors):
+            print("  ✅ all valid")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Asset/Network Compatibility Matrix
+
+Precomputed bitsets over assets and networks, built from the asset config, so
+Connect URL parameters can be validated before a link is emitted. Robinhood
+rejects links whose supportedAssets/supportedNetworks combination does not
+exist (e.g. BTC on ETHEREUM), and the URL-combination scripts mix
+SUPPORTED_ASSETS and SUPPORTED_NETWORKS freely.
+
+Each asset has an int bitmask of the networks it exists on, and each network
+a bitmask of its assets, so a single asset/network check is one shift and one
+AND. Lists are checked by OR-ing the masks once.
+
+Sources (in order):
+  1. ROBINHOOD_ASSETS (generate_prime_wallets.py) - Prime symbol → network,
+     with ETH_BASE → ETH and POL → MATIC renamed to Connect asset codes
+  2. MULTI_NETWORK_ASSETS - extra networks for multi-network assets
+  3. robinhood-assets-config.json - the 'chain' of assets not in (1)
+
+Usage:
+  python3 asset_network_matrix.py                          # print the matrix
+  python3 asset_network_matrix.py --pairs                  # list every valid asset,network pair
+  python3 asset_network_matrix.py --check ETH,USDC ETHEREUM,BASE
+
+  from asset_network_matrix import CompatibilityMatrix
+  matrix = CompatibilityMatrix.from_config()
+  matrix.is_valid("USDC", "SOLANA")        # True
+  matrix.validate(["BTC"], ["ETHEREUM"])   # ValueError
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+CONFIG_PATH = Path(__file__).parent / "robinhood-assets-config.json"
+
+# Prime symbols that Connect knows under a different asset code
+PRIME_TO_CONNECT_ASSET = {
+    "ETH_BASE": "ETH",  # ETH on Base has its own Prime wallet
+    "POL": "MATIC",     # Connect still uses MATIC (evm-assets.ts)
+}
+
+# Assets Robinhood supports on more than one network
+MULTI_NETWORK_ASSETS = {
+    "USDC": ["ARBITRUM", "BASE", "ETHEREUM", "OPTIMISM", "POLYGON", "SOLANA"],
+}
+
+
+class CompatibilityMatrix:
+    """
+    Bitset matrix of which assets exist on which networks
+
+    Bit i of asset_masks[asset] is set when the asset exists on networks[i];
+    bit j of network_masks[network] is set when assets[j] exists on it.
+    """
+
+    def __init__(self, pairs: Iterable[Tuple[str, str]]):
+        pairs = sorted(set(pairs))
+        self.assets: List[str] = sorted({asset for asset, _ in pairs})
+        self.networks: List[str] = sorted({network for _, network in pairs})
+        self.asset_bits: Dict[str, int] = {asset: 1 << i for i, asset in enumerate(self.assets)}
+        self.network_bits: Dict[str, int] = {network: 1 << i for i, network in enumerate(self.networks)}
+
+        self.asset_masks: Dict[str, int] = dict.fromkeys(self.assets, 0)
+        self.network_masks: Dict[str, int] = dict.fromkeys(self.networks, 0)
+        for asset, network in pairs:
+            self.asset_masks[asset] |= self.network_bits[network]
+            self.network_masks[network] |= self.asset_bits[asset]
+
+    @classmethod
+    def from_config(cls, config_path: Path = CONFIG_PATH) -> "CompatibilityMatrix":
+        """Build the matrix from ROBINHOOD_ASSETS and the asset config"""
+        from generate_prime_wallets import ROBINHOOD_ASSETS
+
+        pairs = [
+            (PRIME_TO_CONNECT_ASSET.get(symbol, symbol), network)
+            for symbol, network in ROBINHOOD_ASSETS.items()
+        ]
+        for asset, networks in MULTI_NETWORK_ASSETS.items():
+            pairs.extend((asset, network) for network in networks)
+
+        # Assets only in the config carry the chain their address lives on
+        known = {asset for asset, _ in pairs}
+        if config_path.exists():
+            with open(config_path) as f:
+                for entry in json.load(f):
+                    if entry["symbol"] not in known and entry.get("chain"):
+                        pairs.append((entry["symbol"], entry["chain"].upper().replace(" ", "_")))
+
+        return cls(pairs)
+
+    def is_valid(self, asset: str, network: str) -> bool:
+        """True when the asset exists on the network (unknown names are invalid)"""
+        return bool(self.asset_masks.get(asset, 0) & self.network_bits.get(network, 0))
+
+    def networks_mask(self, networks: Sequence[str]) -> int:
+        """OR of the bits for the given networks (unknown networks contribute nothing)"""
+        mask = 0
+        for network in networks:
+            mask |= self.network_bits.get(network, 0)
+        return mask
+
+    def assets_mask(self, assets: Sequence[str]) -> int:
+        """OR of the bits for the given assets (unknown assets contribute nothing)"""
+        mask = 0
+        for asset in assets:
+            mask |= self.asset_bits.get(asset, 0)
+        return mask
+
+    def problems(self, assets: Sequence[str], networks: Sequence[str]) -> List[str]:
+        """
+        Explain why an asset/network combination would be rejected
+
+        Every asset must exist on at least one of the networks, and every
+        network must carry at least one of the assets. Returns an empty list
+        when the combination is valid.
+        """
+        problems = []
+        networks_mask = self.networks_mask(networks)
+        assets_mask = self.assets_mask(assets)
+
+        for asset in assets:
+            if asset not in self.asset_masks:
+                problems.append(f"unknown asset {asset}")
+            elif not self.asset_masks[asset] & networks_mask:
+                problems.append(f"{asset} is not on {', '.join(networks)} "
+                                f"(available on {', '.join(self.networks_for(asset))})")
+        for network in networks:
+            if network not in self.network_masks:
+                problems.append(f"unknown network {network}")
+            elif not self.network_masks[network] & assets_mask:
+                problems.append(f"{network} carries none of {', '.join(assets)}")
+        return problems
+
+    def validate(self, assets: Sequence[str], networks: Sequence[str]) -> None:
+        """Raise ValueError if the combination would be rejected"""
+        problems = self.problems(assets, networks)
+        if problems:
+            raise ValueError(f"Invalid asset/network combination: {'; '.join(problems)}")
+
+    def networks_for(self, asset: str) -> List[str]:
+        """Networks an asset exists on"""
+        mask = self.asset_masks.get(asset, 0)
+        return [network for network in self.networks if mask & self.network_bits[network]]
+
+    def assets_for(self, network: str) -> List[str]:
+        """Assets that exist on a network"""
+        mask = self.network_masks.get(network, 0)
+        return [asset for asset in self.assets if mask & self.asset_bits[asset]]
+
+    def valid_combinations(self, assets: Optional[Sequence[str]] = None,
+                           networks: Optional[Sequence[str]] = None) -> Iterator[Tuple[str, str]]:
+        """Yield every valid (asset, network) pair, optionally limited to given names"""
+        networks_mask = self.networks_mask(networks) if networks is not None else -1
+        for asset in (assets if assets is not None else self.assets):
+            mask = self.asset_masks.get(asset, 0) & networks_mask
+            for network in self.networks:
+                if mask & self.network_bits[network]:
+                    yield asset, network
+
+
+def print_matrix(matrix: CompatibilityMatrix) -> None:
+    """Print the matrix as an asset × network grid"""
+    width = max(len(asset) for asset in matrix.assets)
+    print(" " * width + "  " + " ".join(f"{i:>2}" for i in range(len(matrix.networks))))
+    for asset in matrix.assets:
+        mask = matrix.asset_masks[asset]
+        cells = " ".join(" ●" if mask & matrix.network_bits[n] else " ·" for n in matrix.networks)
+        print(f"{asset:<{width}}  {cells}")
+    print()
+    for i, network in enumerate(matrix.networks):
+        print(f"  {i:>2} {network}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Show or check Robinhood asset/network compatibility")
+    parser.add_argument("--pairs", action="store_true", help="List every valid asset,network pair")
+    parser.add_argument("--check", nargs=2, metavar=("ASSETS", "NETWORKS"),
+                        help="Validate comma-separated supportedAssets and supportedNetworks")
+    parser.add_argument("--config", type=Path, default=CONFIG_PATH, help="Asset config JSON")
+    args = parser.parse_args()
+
+    matrix = CompatibilityMatrix.from_config(args.config)
+
+    if args.check:
+        assets, networks = (value.split(",") for value in args.check)
+        problems = matrix.problems(assets, networks)
+        if problems:
+            for problem in problems:
+                print(f"❌ {problem}")
+            sys.exit(1)
+        print(f"✅ Valid: {len(list(matrix.valid_combinations(assets, networks)))} asset/network pair(s)")
+        sys.exit(0)
+
+    if args.pairs:
+        for asset, network in matrix.valid_combinations():
+            print(f"{asset},{network}")
+        sys.exit(0)
+
+    print("=" * 100)
+    print(f"Asset/Network Compatibility ({len(matrix.assets)} assets × {len(matrix.networks)} networks)")
+    print("=" * 100)
+    print_matrix(matrix)
@@ -0,0 +1,384 @@
+#!/usr/bin/env python3
+"""
+CoinbasePrimeClient Concurrency Scaling Harness
+
+Drives the client at increasing concurrency (1 → 256 by default) against a
+local Prime stand-in with a server-side rate limit, and reports throughput,
+tail latency and 429 rate at each level. The summary names the concurrency
+that saturates the limit without tipping into throttling, and the per-worker
+pause that keeps it there, instead of guessing at time.sleep values.
+
+Both paths are measured:
+  sync   - ThreadPoolExecutor workers calling the client directly
+  async  - asyncio tasks bounded by a semaphore, calling the client through
+           run_in_executor (the client itself is synchronous)
+
+Usage:
+  python3 bench_client_concurrency.py                         # in-process stub, 50 req/s limit
+  python3 bench_client_concurrency.py --rate-limit 25 --duration 3 --levels 1,4,16,64
+  python3 bench_client_concurrency.py --base-url http://127.0.0.1:8099   # external stub
+  python3 bench_client_concurrency.py --output results.json --plot scaling.png
+
+  # Latency tail (2% of requests take 0.5s): p99 without vs with hedging
+  python3 bench_client_concurrency.py --rate-limit 0 --levels 4 --mode sync --slow-fraction 0.02 --slow-latency 0.5
+  python3 bench_client_concurrency.py --rate-limit 0 --levels 4 --mode sync --slow-fraction 0.02 --slow-latency 0.5 --hedge
+
+  # AIMD limiter: 64 workers, but in-flight requests track the stub's capacity
+  python3 bench_client_concurrency.py --levels 8,64 --mode sync --adaptive
+
+  # Three API keys, each with its own 25 req/s limit: ~3x the sustainable rate
+  python3 bench_client_concurrency.py --rate-limit 25 --levels 4,16 --mode sync --keys 3
+
+  # On-demand lookups (every 0.2s) during a saturating bulk load, without and
+  # with priority lanes reserving 20% of a 45 req/s client-side rate
+  python3 bench_client_concurrency.py --levels 16,64 --mode sync --probe 0.2
+  python3 bench_client_concurrency.py --levels 16,64 --mode sync --probe 0.2 --lanes 45 --reserve 0.2
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List
+
+import requests
+
+from prime_api_client import (BULK, INTERACTIVE, AimdLimiter, ApiKey, CoinbasePrimeClient, CredentialPool,
+                              PriorityLanes)
+from prime_stub_server import PrimeStubServer
+
+DEFAULT_LEVELS = [1, 2, 4, 8, 16, 32, 64, 128, 256]
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile (0 for an empty list)"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def timed_call(call: Callable[[], object]) -> tuple:
+    """Run one client call and classify it as ok, throttled or error"""
+    started = time.perf_counter()
+    try:
+        call()
+        outcome = "ok"
+    except requests.HTTPError as e:
+        outcome = "throttled" if e.response is not None and e.response.status_code == 429 else "error"
+    except Exception:
+        outcome = "error"
+    return outcome, time.perf_counter() - started
+
+
+def summarize(concurrency: int, samples: List[tuple], elapsed: float) -> Dict:
+    """Reduce raw (outcome, latency) samples to one result row"""
+    latencies = [latency * 1000 for _, latency in samples]
+    counts = {"ok": 0, "throttled": 0, "error": 0}
+    for outcome, _ in samples:
+        counts[outcome] += 1
+    total = len(samples) or 1
+
+    return {
+        "concurrency": concurrency,
+        "requests": len(samples),
+        "throughput": round(counts["ok"] / elapsed, 2),
+        "p50_ms": round(percentile(latencies, 50), 2),
+        "p95_ms": round(percentile(latencies, 95), 2),
+        "p99_ms": round(percentile(latencies, 99), 2),
+        "mean_ms": round(statistics.fmean(latencies), 2) if latencies else 0.0,
+        "rate_429": round(counts["throttled"] / total, 4),
+        "errors": counts["error"],
+    }
+
+
+def sample_window(limiter: AimdLimiter, stop: threading.Event, samples: List[float]) -> None:
+    """Record the AIMD window every 50 ms until stopped"""
+    while not stop.wait(0.05):
+        samples.append(limiter.window)
+
+
+def run_probe(client: CoinbasePrimeClient, call: Callable[[], object], interval: float,
+              stop: threading.Event, samples: List[tuple]) -> None:
+    """One interactive-lane lookup every interval seconds until stopped"""
+    with client.lane(INTERACTIVE):
+        while not stop.wait(interval):
+            samples.append(timed_call(call))
+
+
+def run_sync_level(call: Callable[[], object], concurrency: int, duration: float) -> Dict:
+    """Closed-loop workers on threads until the deadline"""
+    deadline = time.perf_counter() + duration
+
+    def worker() -> List[tuple]:
+        samples = []
+        while time.perf_counter() < deadline:
+            samples.append(timed_call(call))
+        return samples
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        futures = [pool.submit(worker) for _ in range(concurrency)]
+        samples = [s for f in futures for s in f.result()]
+
+    return summarize(concurrency, samples, time.perf_counter() - started)
+
+
+def run_async_level(call: Callable[[], object], concurrency: int, duration: float) -> Dict:
+    """Closed-loop asyncio tasks bounded by a semaphore"""
+
+    async def main() -> List[tuple]:
+        loop = asyncio.get_running_loop()
+        deadline = time.perf_counter() + duration
+        semaphore = asyncio.Semaphore(concurrency)
+        executor = ThreadPoolExecutor(max_workers=concurrency)
+
+        async def task() -> List[tuple]:
+            samples = []
+            while time.perf_counter() < deadline:
+                async with semaphore:
+                    samples.append(await loop.run_in_executor(executor, timed_call, call))
+            return samples
+
+        try:
+            results = await asyncio.gather(*(task() for _ in range(concurrency)))
+        finally:
+            executor.shutdown(wait=True)
+        return [s for r in results for s in r]
+
+    started = time.perf_counter()
+    samples = asyncio.run(main())
+    return summarize(concurrency, samples, time.perf_counter() - started)
+
+
+def recommend(rows: List[Dict], max_429_rate: float) -> Dict:
+    """Pick the highest-throughput level that stays under the 429 budget"""
+    healthy = [r for r in rows if r["rate_429"] <= max_429_rate and r["errors"] == 0]
+    if not healthy:
+        return {}
+
+    best = max(healthy, key=lambda r: (r["throughput"], -r["concurrency"]))
+    # Smallest level reaching ~95% of the best throughput saturates just as well
+    saturating = min(
+        (r for r in healthy if r["throughput"] >= 0.95 * best["throughput"]),
+        key=lambda r: r["concurrency"],
+    )
+    # Pause per worker so N workers together stay at the sustainable rate
+    pause = saturating["concurrency"] / saturating["throughput"] - saturating["mean_ms"] / 1000
+    return {
+        "concurrency": saturating["concurrency"],
+        "sustainable_rps": saturating["throughput"],
+        "per_worker_sleep_s": round(max(0.0, pause), 3),
+        "p99_ms": saturating["p99_ms"],
+    }
+
+
+def print_table(mode: str, rows: List[Dict]) -> None:
+    """Print results with ASCII bars for throughput and 429 rate"""
+    peak = max((r["throughput"] for r in rows), default=0) or 1
+
+    print(f"\n{mode.upper()} path")
+    print("-" * 100)
+    adaptive = any("window_mean" in r for r in rows)
+    probed = any("probe" in r for r in rows)
+    print(f"{'Conc':>5} {'Req':>6} {'ok/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'429%':>6}"
+          + (f" {'window':>7}" if adaptive else "")
+          + (f" {'lookup p50':>10} {'p99':>7} {'fail%':>6}" if probed else "") + "  Throughput")
+    for r in rows:
+        bar = "█" * int(40 * r["throughput"] / peak)
+        throttle = "░" * int(20 * r["rate_429"])
+        window = f" {r['window_mean']:>7.1f}" if adaptive else ""
+        probe = r.get("probe")
+        lookup = (f" {probe['p50_ms']:>10.1f} {probe['p99_ms']:>7.1f} {100 * probe['fail_rate']:>5.1f}%"
+                  if probe else "")
+        print(f"{r['concurrency']:>5} {r['requests']:>6} {r['throughput']:>8.1f} {r['p50_ms']:>8.1f} "
+              f"{r['p95_ms']:>8.1f} {r['p99_ms']:>8.1f} {100 * r['rate_429']:>5.1f}%{window}{lookup}  "
+              f"{bar}{throttle}")
+
+
+def save_plot(results: Dict[str, List[Dict]], path: str) -> None:
+    """Plot throughput, p99 latency and 429 rate per level (needs matplotlib)"""
+    try:
+        import matplotlib
+        matplotlib.use("Agg")
+        import matplotlib.pyplot as plt
+    except ImportError:
+        print("⚠️  matplotlib not installed - skipping plot (pip install matplotlib)")
+        return
+
+    fig, axes = plt.subplots(1, 3, figsize=(15, 4))
+    for mode, rows in results.items():
+        levels = [r["concurrency"] for r in rows]
+        axes[0].plot(levels, [r["throughput"] for r in rows], marker="o", label=mode)
+        axes[1].plot(levels, [r["p99_ms"] for r in rows], marker="o", label=mode)
+        axes[2].plot(levels, [100 * r["rate_429"] for r in rows], marker="o", label=mode)
+
+    for ax, title in zip(axes, ["Throughput (ok req/s)", "p99 latency (ms)", "429 rate (%)"]):
+        ax.set_xscale("log", base=2)
+        ax.set_xlabel("Concurrency")
+        ax.set_title(title)
+        ax.legend()
+
+    fig.tight_layout()
+    fig.savefig(path)
+    print(f"✅ Plot saved to: {path}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure CoinbasePrimeClient scaling against a rate-limited stub")
+    parser.add_argument("--levels", default=",".join(map(str, DEFAULT_LEVELS)),
+                        help="Comma-separated concurrency levels")
+    parser.add_argument("--duration", type=float, default=5.0, help="Seconds per level")
+    parser.add_argument("--mode", choices=["sync", "async", "both"], default="both")
+    parser.add_argument("--endpoint", choices=["deposit", "list"], default="deposit",
+                        help="deposit_instructions fan-out or wallet listing")
+    parser.add_argument("--rate-limit", type=float, default=50, help="Stub rate limit (req/s)")
+    parser.add_argument("--burst", type=float, default=None, help="Stub token bucket size")
+    parser.add_argument("--latency", type=float, default=0.03, help="Stub service time (seconds)")
+    parser.add_argument("--slow-fraction", type=float, default=0.0,
+                        help="Share of stub requests that take --slow-latency (latency tail)")
+    parser.add_argument("--slow-latency", type=float, default=1.0, help="Service time of slow stub requests")
+    parser.add_argument("--hedge", action="store_true", help="Enable client request hedging")
+    parser.add_argument("--adaptive", action="store_true",
+                        help="Gate requests with an AIMD limiter (workers become an upper bound)")
+    parser.add_argument("--probe", type=float, default=0, metavar="SECONDS",
+                        help="Also send one interactive-lane lookup every SECONDS and report its latency")
+    parser.add_argument("--lanes", type=float, default=0, metavar="REQ_PER_S",
+                        help="Client-side PriorityLanes at this rate (bulk load in the bulk lane)")
+    parser.add_argument("--reserve", type=float, default=0.2, help="Share of --lanes kept for interactive")
+    parser.add_argument("--keys", type=int, default=1,
+                        help="Sign with a pool of N API keys (the in-process stub limits each key)")
+    parser.add_argument("--key-strategy", choices=["least_loaded", "round_robin"], default="least_loaded")
+    parser.add_argument("--base-url", help="Use an already running stub instead of an in-process one")
+    parser.add_argument("--max-429-rate", type=float, default=0.01, help="Acceptable 429 fraction")
+    parser.add_argument("--output", metavar="PATH", help="Write results as JSON")
+    parser.add_argument("--plot", metavar="PATH", help="Write a PNG plot (requires matplotlib)")
+    args = parser.parse_args()
+
+    # Client logs every request at INFO - far too chatty at 256 workers - and
+    # every 429 at ERROR; throttling is what the bench measures, so the table
+    # reports it instead
+    logging.basicConfig(level=logging.WARNING)
+    logging.getLogger("prime_api_client").setLevel(logging.CRITICAL)
+
+    server = None
+    if args.base_url:
+        base_url = args.base_url
+        wallet_ids = ["btc-0000"]
+    else:
+        server = PrimeStubServer(rate_limit=args.rate_limit, burst=args.burst, latency=args.latency,
+                                 slow_fraction=args.slow_fraction, slow_latency=args.slow_latency,
+                                 per_key=args.keys > 1).start()
+        base_url = server.base_url
+        wallet_ids = [w["id"] for w in server.wallets]
+
+    # No coalescing: identical concurrent GETs must each reach the stub to measure its limit
+    levels = [int(level) for level in args.levels.split(",")]
+    limiter = AimdLimiter(max_window=max(levels)) if args.adaptive else None
+    credentials = CredentialPool([ApiKey(f"bench-{n}", "bench", "bench", label=f"key {n}") for n in range(1, args.keys + 1)],
+                                 strategy=args.key_strategy) if args.keys > 1 else None
+    client = CoinbasePrimeClient("bench", "bench", "bench", "bench-portfolio", base_url=base_url,
+                                 coalesce=False, hedge=args.hedge, hedge_concurrency=max(levels),
+                                 limiter=limiter, credentials=credentials,
+                                 lanes=PriorityLanes(args.lanes, args.reserve) if args.lanes else None,
+                                 default_lane=BULK)
+    counter = iter(range(sys.maxsize))
+
+    if args.endpoint == "deposit":
+        call = lambda: client.get_wallet_deposit_address(wallet_ids[next(counter) % len(wallet_ids)])
+    else:
+        call = lambda: client.list_wallets()
+
+    modes = ["sync", "async"] if args.mode == "both" else [args.mode]
+    runners = {"sync": run_sync_level, "async": run_async_level}
+
+    print("=" * 100)
+    print("CoinbasePrimeClient Concurrency Scaling")
+    print("=" * 100)
+    print(f"Target: {base_url} | Endpoint: {args.endpoint} | {args.duration}s per level")
+    if server:
+        print(f"Stub rate limit: {args.rate_limit} req/s{' per key' if args.keys > 1 else ''} "
+              f"| Service time: {args.latency * 1000:.0f} ms")
+    if credentials:
+        print(f"API keys: {args.keys} ({args.key_strategy})")
+
+    results: Dict[str, List[Dict]] = {}
+    for mode in modes:
+        rows = []
+        for level in levels:
+            if server:
+                server.reset_buckets()
+            else:
+                time.sleep(1.0)  # Let the external bucket refill between levels
+            if limiter:
+                stop, windows = threading.Event(), []
+                sampler = threading.Thread(target=sample_window, args=(limiter, stop, windows), daemon=True)
+                sampler.start()
+            if args.probe:
+                probe_stop, probes = threading.Event(), []
+                prober = threading.Thread(target=run_probe, args=(client, call, args.probe, probe_stop, probes),
+                                          daemon=True)
+                prober.start()
+            rows.append(runners[mode](call, level, args.duration))
+            if args.probe:
+                probe_stop.set()
+                prober.join()
+                probe_ms = [latency * 1000 for outcome, latency in probes if outcome == "ok"]
+                rows[-1]["probe"] = {
+                    "lookups": len(probes),
+                    "p50_ms": round(percentile(probe_ms, 50), 2),
+                    "p99_ms": round(percentile(probe_ms, 99), 2),
+                    "fail_rate": round(sum(1 for outcome, _ in probes if outcome != "ok") / (len(probes) or 1), 4),
+                }
+            if limiter:
+                stop.set()
+                sampler.join()
+                rows[-1]["window_mean"] = round(statistics.fmean(windows), 2) if windows else limiter.window
+                rows[-1]["window_final"] = round(limiter.window, 2)
+            print(f"  {mode:5} concurrency {level:>3}: {rows[-1]['throughput']:.1f} ok/s, "
+                  f"429 {100 * rows[-1]['rate_429']:.1f}%", file=sys.stderr)
+        results[mode] = rows
+        print_table(mode, rows)
+
+    print("\n" + "=" * 100)
+    print("RECOMMENDATION")
+    print("=" * 100)
+    recommendations = {}
+    for mode, rows in results.items():
+        rec = recommend(rows, args.max_429_rate)
+        recommendations[mode] = rec
+        if rec:
+            print(f"  {mode:5}: {rec['concurrency']} workers → {rec['sustainable_rps']:.1f} req/s "
+                  f"(p99 {rec['p99_ms']:.0f} ms), per-worker sleep ≥ {rec['per_worker_sleep_s']}s")
+        else:
+            print(f"  {mode:5}: every level exceeded the 429 budget - lower concurrency or raise the limit")
+
+    if args.hedge:
+        print(f"\nHedging: {client.hedges_sent} hedged of {client.requests_sent} requests "
+              f"({client.hedges_won} answered first)")
+
+    if client.lanes:
+        print(f"\nLanes: {client.lanes.snapshot()}")
+
+    if credentials:
+        print("\nAPI keys:")
+        for key in credentials.snapshot():
+            print(f"  {key['key']:10} {key['requests']:>7} requests  {key['throttled']:>6} throttled  "
+                  f"{key['state']}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"config": vars(args), "results": results, "recommendation": recommendations}, f, indent=2)
+        print(f"\n✅ Results saved to: {args.output}")
+
+    if args.plot:
+        save_plot(results, args.plot)
+
+    if server:
+        server.shutdown()
@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+Cold-Start Benchmark for the Python Entry Points
+
+generate_prime_wallets.py is spawned by Node for every address fetch, so its
+import and initialization time adds directly to app boot. This measures, per
+entry point:
+
+  startup        spawn → exit for startup-only commands (--help, check_creds)
+  first request  spawn → first request arriving at a local Prime stub
+                 (the process is killed once it gets there)
+  imports        -X importtime breakdown of the same run (up to exit or the
+                 first request): top-level modules by cumulative time, and
+                 the full set of modules imported beyond a bare interpreter
+
+Times are reported as overhead above a bare `python -c pass` so results are
+comparable across machines. Each entry point has a budget: the stored baseline
+plus --threshold (at least --slack-ms), or an explicit budget_ms in the
+baseline file. A module that
+is newly imported on an entry point's path is reported as a regression even
+when it is too cheap to move the timings, so imports cannot creep in unnoticed.
+
+Usage:
+  python3 bench_cold_start.py                       # check against baseline
+  python3 bench_cold_start.py --save-baseline       # record a new baseline
+  python3 bench_cold_start.py --only generate_json --imports 20
+  python3 bench_cold_start.py --history cold-start-history.jsonl
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from prime_stub_server import PrimeStubServer
+
+SCRIPTS_DIR = Path(__file__).parent
+BASELINE_PATH = SCRIPTS_DIR / "bench-cold-start-baseline.json"
+# The generate run is killed mid-crawl: keep its journal away from the real one
+JOURNAL_PATH = Path(tempfile.gettempdir()) / "bench-cold-start-journal.jsonl"
+
+# name → (argv after the interpreter, measurement)
+ENTRY_POINTS: Dict[str, Tuple[List[str], str]] = {
+    "generate_help": (["generate_prime_wallets.py", "--help"], "startup"),
+    "generate_json": (["generate_prime_wallets.py", "--all-wallets", "--json-only",
+                       "--journal", str(JOURNAL_PATH), "--discard-journal"], "first_request"),
+    "check_creds": (["check_creds.py"], "startup"),
+    "list_wallets_help": (["list_all_wallets.py", "--help"], "startup"),
+    "wallet_export": (["wallet_export.py", os.devnull, "--format", "csv"], "first_request"),
+    "batch_urls_help": (["batch_connect_urls.py", "--help"], "startup"),
+}
+
+# Dummy credentials so entry points get as far as their first request
+STUB_ENV = {
+    "COINBASE_PRIME_ACCESS_KEY": "bench-access-key",
+    "COINBASE_PRIME_SIGNING_KEY": "bench-signing-key",
+    "COINBASE_PRIME_PASSPHRASE": "bench",
+    "COINBASE_PRIME_PORTFOLIO_ID": "bench-portfolio",
+}
+
+
+class FirstRequestStub(PrimeStubServer):
+    """Stub that timestamps the first request it receives"""
+
+    def __init__(self):
+        super().__init__(latency=0)
+        self.first_request = threading.Event()
+        self.first_request_at = 0.0
+
+    def count(self, key: str) -> None:
+        if key == "requests" and not self.first_request.is_set():
+            self.first_request_at = time.perf_counter()
+            self.first_request.set()
+        super().count(key)
+
+    def handle_error(self, request, client_address):
+        pass  # The child is killed mid-response on purpose
+
+
+def child_env(extra: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+    env = dict(os.environ)
+    env.update(STUB_ENV)
+    env["PYTHONDONTWRITEBYTECODE"] = "1"
+    env.update(extra or {})
+    return env
+
+
+def run_startup(argv: List[str], env: Dict[str, str], flags: Sequence[str] = ()) -> Tuple[float, str]:
+    """Spawn → exit; returns (seconds, stderr)"""
+    started = time.perf_counter()
+    result = subprocess.run([sys.executable, *flags] + argv, cwd=SCRIPTS_DIR, env=env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, timeout=60)
+    return time.perf_counter() - started, result.stderr
+
+
+def run_first_request(argv: List[str], env: Dict[str, str], flags: Sequence[str] = (),
+                      timeout: float = 30.0) -> Tuple[float, str]:
+    """Spawn → first request at the stub; the child is killed there. Returns (seconds, stderr)"""
+    stub = FirstRequestStub().start()
+    env = dict(env, COINBASE_PRIME_BASE_URL=stub.base_url)
+    try:
+        started = time.perf_counter()
+        process = subprocess.Popen([sys.executable, *flags] + argv, cwd=SCRIPTS_DIR, env=env,
+                                   stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+        # Drain stderr concurrently so -X importtime output cannot fill the pipe
+        chunks = []
+        reader = threading.Thread(target=lambda: chunks.append(process.stderr.read()), daemon=True)
+        reader.start()
+        arrived = stub.first_request.wait(timeout)
+        process.kill()
+        process.wait()
+        reader.join()
+        if not arrived:
+            raise RuntimeError(f"{' '.join(argv)} made no request within {timeout:.0f}s")
+        return stub.first_request_at - started, "".join(chunks)
+    finally:
+        stub.shutdown()
+        stub.server_close()
+
+
+RUNNERS = {"startup": run_startup, "first_request": run_first_request}
+
+
+def best_of(run, argv: List[str], env: Dict[str, str], repeat: int) -> float:
+    return min(run(argv, env)[0] for _ in range(repeat))
+
+
+def parse_importtime(stderr: str) -> Tuple[Dict[str, float], Dict[str, float]]:
+    """-X importtime output → (all modules → cumulative ms, top-level modules → cumulative ms)"""
+    modules, top_level = {}, {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[1].strip().isdigit():
+            continue  # Last line of a killed child can be cut short
+        _, cumulative, name = fields
+        depth = (len(name) - len(name.lstrip())) // 2
+        name = name.strip()
+        ms = int(cumulative) / 1000
+        modules[name] = ms
+        if depth == 1:
+            top_level[name] = top_level.get(name, 0) + ms
+    return modules, top_level
+
+
+def load_baseline() -> Dict:
+    if not BASELINE_PATH.exists():
+        return {}
+    with open(BASELINE_PATH) as f:
+        return json.load(f)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure cold-start time of the Python entry points")
+    parser.add_argument("--only", help="Comma-separated entry points to run")
+    parser.add_argument("--repeat", type=int, default=7, help="Runs per entry point (best is kept)")
+    parser.add_argument("--threshold", type=float, default=0.3,
+                        help="Allowed slowdown of startup overhead vs baseline (0.3 = 30%%)")
+    parser.add_argument("--slack-ms", type=float, default=15.0,
+                        help="Minimum allowed slowdown in ms (spawn jitter dominates small overheads)")
+    parser.add_argument("--imports", type=int, default=8, help="Top-level imports to show per entry point")
+    parser.add_argument("--save-baseline", action="store_true", help="Write results as the new baseline")
+    parser.add_argument("--history", metavar="PATH", help="Append this run to a JSONL history file")
+    args = parser.parse_args()
+
+    names = args.only.split(",") if args.only else list(ENTRY_POINTS)
+    unknown = [n for n in names if n not in ENTRY_POINTS]
+    if unknown:
+        parser.error(f"Unknown entry point(s): {', '.join(unknown)}")
+
+    env = child_env()
+    bare = best_of(run_startup, ["-c", "pass"], env, args.repeat)
+    bare_modules, _ = parse_importtime(run_startup(["-c", "pass"], env, ["-X", "importtime"])[1])
+
+    baseline = load_baseline()
+    base_results = baseline.get("results", {})
+
+    print("=" * 100)
+    print("Cold-Start Benchmark")
+    print("=" * 100)
+    print(f"Bare interpreter: {bare * 1000:.1f} ms | Baseline: {baseline.get('recorded', 'none')} "
+          f"| Threshold: +{args.threshold:.0%}\n")
+
+    results = {}
+    regressions = []
+    for name in names:
+        argv, kind = ENTRY_POINTS[name]
+        run = RUNNERS[kind]
+        total = best_of(run, argv, env, args.repeat)
+        overhead = max(0.0, total - bare)
+
+        modules, top_level = parse_importtime(run(argv, env, ["-X", "importtime"])[1])
+        own_modules = sorted(set(modules) - set(bare_modules))
+        results[name] = {
+            "kind": kind,
+            "total_ms": round(total * 1000, 1),
+            "overhead_ms": round(overhead * 1000, 1),
+            "modules": own_modules,
+        }
+
+        base = base_results.get(name)
+        status = "new"
+        notes = []
+        if base:
+            budget = base.get("budget_ms") or max(base["overhead_ms"] * (1 + args.threshold),
+                                                  base["overhead_ms"] + args.slack_ms)
+            new_imports = sorted(set(own_modules) - set(base.get("modules", [])))
+            if overhead * 1000 > budget:
+                notes.append(f"over budget ({budget:.0f} ms)")
+            if new_imports:
+                notes.append(f"new imports: {', '.join(new_imports[:6])}"
+                             + (f" (+{len(new_imports) - 6})" if len(new_imports) > 6 else ""))
+            status = "❌ " + "; ".join(notes) if notes else "✅ ok"
+            if notes:
+                regressions.append(name)
+            results[name]["budget_ms"] = base.get("budget_ms")
+
+        label = "spawn→exit" if kind == "startup" else "spawn→request"
+        print(f"{name:<20} {label:<14} {total * 1000:>8.1f} ms  (+{overhead * 1000:6.1f} ms over bare, "
+              f"{len(own_modules):>3} modules)  {status}")
+        heaviest = sorted(top_level.items(), key=lambda item: -item[1])
+        for module, ms in [(m, t) for m, t in heaviest if m not in bare_modules][:args.imports]:
+            print(f"    {ms:8.1f} ms  {module}")
+    JOURNAL_PATH.unlink(missing_ok=True)
+
+    print("-" * 100)
+
+    record = {
+        "recorded": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "bare_ms": round(bare * 1000, 1),
+        "results": results,
+    }
+
+    if args.history:
+        with open(args.history, "a") as f:
+            f.write(json.dumps({**record, "results": {
+                name: {k: v for k, v in r.items() if k != "modules"} for name, r in results.items()
+            }}) + "\n")
+        print(f"📝 Appended to history: {args.history}")
+
+    if args.save_baseline:
+        merged = dict(base_results)
+        for name, result in results.items():
+            # Keep explicit budgets set by hand
+            if base_results.get(name, {}).get("budget_ms"):
+                result["budget_ms"] = base_results[name]["budget_ms"]
+            merged[name] = {k: v for k, v in result.items() if v is not None}
+        with open(BASELINE_PATH, "w") as f:
+            json.dump({**record, "results": merged}, f, indent=2)
+        print(f"✅ Baseline saved to: {BASELINE_PATH.name}")
+        sys.exit(0)
+
+    if regressions:
+        print(f"❌ {len(regressions)} entry point(s) regressed: {', '.join(regressions)}")
+        sys.exit(1)
+
+    print("✅ All entry points within budget")
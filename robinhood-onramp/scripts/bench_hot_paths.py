@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+"""
+Microbenchmarks for the Pure-CPU Hot Paths
+
+Times the CPU-bound pieces of the Prime tooling at realistic size (~200
+wallets, one portfolio crawl) and 100x that size, and compares them with a
+stored baseline. Exits non-zero when any benchmark regresses beyond the
+threshold, so it can gate changes once the network part is parallelized.
+
+Benchmarks:
+  signature          _get_headers (HMAC-SHA256 + base64) once per request
+  pagination_merge   fetch_all_wallets over in-memory listing pages
+  group_by_symbol    group_wallets_by_symbol
+  preferred_wallet   select_preferred_wallet for every symbol
+  build_url          connect_urls.build_url with full network/asset lists
+  render_json        json.dumps of the results (--json-only output)
+  render_typescript  render_typescript (PRIME_DEPOSIT_ADDRESSES file)
+
+Timings are normalized by a fixed calibration loop, timed alternately with
+each benchmark sample, so a baseline recorded on one machine stays roughly
+comparable on another and CPU frequency drift during a run cancels out.
+
+Each benchmark is gated on the median of --repeat normalized samples. Run-to-run
+noise on shared machines is ~30%, so the allowed slowdown per benchmark is the
+larger of --threshold and NOISE_FACTOR x its noise (relative interquartile
+range), taking the noisier of this run and the baseline, but never more than
+MAX_SLOWDOWN.
+
+Usage:
+  python3 bench_hot_paths.py                    # run and check against baseline
+  python3 bench_hot_paths.py --save-baseline    # record a new baseline
+  python3 bench_hot_paths.py --only build_url --scales 100 --threshold 0.1
+"""
+
+import argparse
+import json
+import logging
+import platform
+import random
+import statistics
+import sys
+import timeit
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+from connect_urls import build_url
+from generate_prime_wallets import (
+    ROBINHOOD_ASSETS,
+    fetch_all_wallets,
+    group_wallets_by_symbol,
+    render_typescript,
+    select_preferred_wallet,
+)
+from prime_api_client import CoinbasePrimeClient
+from prime_stub_server import MEMO_SYMBOLS, synthetic_wallets
+
+BASELINE_PATH = Path(__file__).parent / "bench-hot-paths-baseline.json"
+REALISTIC_WALLETS_PER_SYMBOL = 6
+PAGE_SIZE = 100
+NOISE_FACTOR = 3  # Allowed slowdown in multiples of the measured noise (when above --threshold)
+MAX_SLOWDOWN = 1.0  # A 2x slowdown fails however noisy the benchmark
+
+SUPPORTED_NETWORKS = sorted(set(ROBINHOOD_ASSETS.values()))
+SUPPORTED_ASSETS = sorted(ROBINHOOD_ASSETS)
+
+
+class InMemoryPagesClient(CoinbasePrimeClient):
+    """Client whose listing pages come from memory (no network, no signing)"""
+
+    def __init__(self, wallets: List[Dict]):
+        super().__init__("bench", "bench", "bench", "bench-portfolio")
+        self.pages = {}
+        for start in range(0, len(wallets), PAGE_SIZE):
+            end = start + PAGE_SIZE
+            has_next = end < len(wallets)
+            self.pages[str(start) if start else None] = {
+                "wallets": wallets[start:end],
+                "pagination": {"has_next": has_next, "next_cursor": str(end) if has_next else ""},
+            }
+
+    def list_wallets(self, cursor=None):
+        return self.pages[cursor]
+
+
+def make_wallets(scale: int) -> List[Dict]:
+    """Synthetic portfolio in a shuffled (listing-like) order"""
+    wallets = synthetic_wallets(REALISTIC_WALLETS_PER_SYMBOL * scale)
+    random.Random(42).shuffle(wallets)
+    return wallets
+
+
+def make_results(wallets: List[Dict]) -> List[Dict]:
+    """Resolution results shaped like get_robinhood_wallet_addresses output"""
+    return [
+        {
+            "symbol": w["symbol"],
+            "network": ROBINHOOD_ASSETS[w["symbol"]],
+            "status": "found",
+            "wallet_name": w["name"],
+            "wallet_id": w["id"],
+            "address": f"0x{idx:040x}",
+            "memo": str(idx) if w["symbol"] in MEMO_SYMBOLS else None,
+        }
+        for idx, w in enumerate(wallets)
+    ]
+
+
+def setup_signature(scale: int) -> Callable[[], object]:
+    client = CoinbasePrimeClient("bench-access-key", "bench-signing-key", "bench", "bench-portfolio")
+    paths = [f"/v1/portfolios/bench-portfolio/wallets/{w['id']}/deposit_instructions" for w in make_wallets(scale)]
+    return lambda: [client._get_headers("GET", path) for path in paths]
+
+
+def setup_pagination_merge(scale: int) -> Callable[[], object]:
+    client = InMemoryPagesClient(make_wallets(scale))
+    noop = lambda msg: None
+    return lambda: fetch_all_wallets(client, progress=noop, page_delay=0)
+
+
+def setup_group_by_symbol(scale: int) -> Callable[[], object]:
+    wallets = make_wallets(scale)
+    return lambda: group_wallets_by_symbol(wallets)
+
+
+def setup_preferred_wallet(scale: int) -> Callable[[], object]:
+    groups = list(group_wallets_by_symbol(make_wallets(scale)).values())
+    return lambda: [select_preferred_wallet(group) for group in groups]
+
+
+def setup_build_url(scale: int) -> Callable[[], object]:
+    wallets = make_wallets(scale)
+    params = [
+        {
+            "applicationId": "db2c834a-a740-4dfc-bbaf-06887558185f",
+            "offRamp": True,
+            "walletAddress": f"0x{idx:040x}",
+            "paymentMethod": "crypto_balance",
+            "supportedNetworks": SUPPORTED_NETWORKS,
+            "supportedAssets": SUPPORTED_ASSETS,
+            "redirectUrl": "https://example.org/callback",
+            "referenceId": f"00000000-0000-4000-8000-{idx:012d}",
+        }
+        for idx in range(len(wallets))
+    ]
+    return lambda: [build_url(p) for p in params]
+
+
+def setup_render_json(scale: int) -> Callable[[], object]:
+    results = make_results(make_wallets(scale))
+    return lambda: json.dumps(results, indent=2)
+
+
+def setup_render_typescript(scale: int) -> Callable[[], object]:
+    results = make_results(make_wallets(scale))
+    return lambda: render_typescript(results, "2025-01-01T00:00:00")
+
+
+BENCHMARKS: Dict[str, Callable[[int], Callable[[], object]]] = {
+    "signature": setup_signature,
+    "pagination_merge": setup_pagination_merge,
+    "group_by_symbol": setup_group_by_symbol,
+    "preferred_wallet": setup_preferred_wallet,
+    "build_url": setup_build_url,
+    "render_json": setup_render_json,
+    "render_typescript": setup_render_typescript,
+}
+
+
+def calibration_workload() -> int:
+    """Fixed pure-Python workload used to normalize results
+
+    Arithmetic only: a workload that allocates is slowed by whatever the
+    benchmark's setup left on the heap, which skews the normalization.
+    """
+    x = 0
+    for i in range(20000):
+        x = (x * 31 + i) & 0xFFFF
+    return x
+
+
+def measure(fn: Callable[[], object], repeat: int = 9) -> Tuple[float, float, float]:
+    """(seconds, normalized, noise) for one call: medians over repeat samples
+
+    Each sample loops the call for ~50 ms, then the calibration workload for
+    as long, so normalized = call time / calibration time at the same moment.
+    noise is the relative interquartile range of the normalized samples.
+    """
+    timer, calibration = timeit.Timer(fn), timeit.Timer(calibration_workload)
+    number = max(1, timer.autorange()[0] // 4)
+    cal_number = max(1, calibration.autorange()[0] // 4)
+    seconds, normalized = [], []
+    for _ in range(repeat):
+        sample = timer.timeit(number) / number
+        seconds.append(sample)
+        normalized.append(sample / (calibration.timeit(cal_number) / cal_number))
+    median = statistics.median(normalized)
+    quartiles = statistics.quantiles(normalized, n=4)
+    return statistics.median(seconds), median, (quartiles[2] - quartiles[0]) / median
+
+
+def calibrate() -> float:
+    """Time the calibration workload on its own (reported, not used for normalizing)"""
+    timer = timeit.Timer(calibration_workload)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=5, number=number)) / number
+
+
+def allowed_slowdown(threshold: float, noise: float, base: Dict) -> float:
+    """Regression bound for one benchmark: threshold, widened on noisy benchmarks"""
+    return max(threshold, min(MAX_SLOWDOWN, NOISE_FACTOR * max(noise, base.get("noise", 0.0))))
+
+
+def load_baseline() -> Dict:
+    if not BASELINE_PATH.exists():
+        return {}
+    with open(BASELINE_PATH) as f:
+        return json.load(f)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Microbenchmark CPU hot paths with regression gates")
+    parser.add_argument("--only", help="Comma-separated benchmark names to run")
+    parser.add_argument("--scales", default="1,100", help="Data sizes as multiples of a realistic portfolio")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="Allowed slowdown vs baseline (0.25 = 25%%); noisy benchmarks get "
+                             f"up to {NOISE_FACTOR}x their measured noise")
+    parser.add_argument("--repeat", type=int, default=9, help="Samples per benchmark (the median is gated)")
+    parser.add_argument("--retries", type=int, default=2,
+                        help="Re-measure an apparent regression this many times before failing "
+                             "(baselines always use every attempt)")
+    parser.add_argument("--save-baseline", action="store_true", help="Write results as the new baseline")
+    args = parser.parse_args()
+
+    # Silence per-call INFO logs (generate_prime_wallets configures INFO on import)
+    logging.getLogger().setLevel(logging.WARNING)
+
+    names = args.only.split(",") if args.only else list(BENCHMARKS)
+    unknown = [n for n in names if n not in BENCHMARKS]
+    if unknown:
+        parser.error(f"Unknown benchmark(s): {', '.join(unknown)}")
+    scales = [int(s) for s in args.scales.split(",")]
+
+    print("=" * 100)
+    print("Hot Path Microbenchmarks")
+    print("=" * 100)
+
+    calibration = calibrate()
+    baseline = load_baseline()
+    base_results = baseline.get("results", {})
+    print(f"Calibration: {calibration * 1000:.2f} ms | Baseline: "
+          f"{baseline.get('recorded', 'none')} | Threshold: +{args.threshold:.0%} "
+          f"(or {NOISE_FACTOR}x noise)\n")
+
+    print(f"{'Benchmark':<28} {'Items':>8} {'Time':>11} {'Per item':>11} {'vs base':>9} {'allowed':>8}  Status")
+    print("-" * 100)
+
+    results = {}
+    regressions = []
+    for name in names:
+        for scale in scales:
+            key = f"{name}@{scale}x"
+            fn = BENCHMARKS[name](scale)
+            items = len(synthetic_wallets(REALISTIC_WALLETS_PER_SYMBOL * scale))
+            base = base_results.get(key)
+
+            # Re-measure apparent regressions before failing - a noisy
+            # neighbour should not be able to fail the gate on its own
+            best, noises = None, []
+            for attempt in range(1 + args.retries):
+                seconds, normalized, noise = measure(fn, args.repeat)
+                noises.append(noise)
+                if best is None or normalized < best["normalized"]:
+                    best = {"seconds": seconds, "normalized": normalized, "items": items}
+                best["noise"] = statistics.median(noises)
+                # A baseline is only as good as its best sample - always use every attempt
+                if args.save_baseline:
+                    continue
+                bound = allowed_slowdown(args.threshold, best["noise"], base or {})
+                if not base or best["normalized"] <= base["normalized"] * (1 + bound):
+                    break
+            results[key] = best
+            seconds = best["seconds"]
+
+            status, change, allowed = "new", "", ""
+            if base:
+                ratio = best["normalized"] / base["normalized"]
+                bound = allowed_slowdown(args.threshold, best["noise"], base)
+                change, allowed = f"{ratio - 1:+.1%}", f"+{bound:.0%}"
+                if ratio > 1 + bound:
+                    status = "❌ REGRESSED"
+                    regressions.append(key)
+                else:
+                    status = "✅ ok"
+
+            print(f"{key:<28} {items:>8} {seconds * 1000:>9.3f}ms {seconds / items * 1e6:>9.3f}µs {change:>9} "
+                  f"{allowed:>8}  {status}")
+
+    print("-" * 100)
+
+    if args.save_baseline:
+        merged = dict(base_results)
+        merged.update(results)
+        with open(BASELINE_PATH, "w") as f:
+            json.dump({
+                "recorded": datetime.now().isoformat(timespec="seconds"),
+                "python": platform.python_version(),
+                "calibration_s": calibration,
+                "results": merged,
+            }, f, indent=2)
+        print(f"✅ Baseline saved to: {BASELINE_PATH.name}")
+        sys.exit(0)
+
+    if regressions:
+        print(f"❌ {len(regressions)} regression(s) beyond their allowed slowdown: {', '.join(regressions)}")
+        sys.exit(1)
+
+    print("✅ No regressions")
@@ -14,48 +14,32 @@ Required credentials:
 Reference: https://docs.cdp.coinbase.com/prime/docs/rest-auth#authentication
 """
 
-import os
-from pathlib import Path
-
-from dotenv import load_dotenv
+from prime_config import CREDENTIAL_VARS, ENV_PATH, get_credentials
 
 
 def check_credentials():
     """Load and validate Coinbase Prime credentials"""
 
     # Load from parent directory's .env.local
-    env_path = Path(__file__).parent.parent / ".env.local"
+    env_path = ENV_PATH
 
     if not env_path.exists():
         print(f"❌ Error: .env.local not found at {env_path}")
         print("\nExpected location: robinhood-onramp/.env.local")
         return False
 
-    load_dotenv(env_path)
+    credentials = get_credentials()
 
     print("Coinbase Prime Credential Check")
     print("=" * 70)
     print(f"Loading from: {env_path}\n")
 
-    # Define required credentials (check both naming conventions)
-    required_creds = {
-        "ACCESS_KEY": ["COINBASE_PRIME_ACCESS_KEY", "COINBASE_PRIME_API_KEY"],
-        "SIGNING_KEY": ["COINBASE_PRIME_SIGNING_KEY"],
-        "PASSPHRASE": ["COINBASE_PRIME_PASSPHRASE"],
-        "PORTFOLIO_ID": ["COINBASE_PRIME_PORTFOLIO_ID"]
-    }
-
     all_present = True
 
-    for display_name, env_var_list in required_creds.items():
-        # Try each possible environment variable name
-        value = None
-        found_var = None
-        for env_var in env_var_list:
-            value = os.getenv(env_var)
-            if value:
-                found_var = env_var
-                break
+    for field, env_var_list in CREDENTIAL_VARS.items():
+        display_name = field.upper()
+        value = getattr(credentials, field)
+        found_var = credentials.source(field)
 
         if value:
             # Mask value for security (show first 8 and last 4 chars)
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Robinhood Connect URL Helpers
+
+Shared URL builder used by the URL testing and generation scripts, including
+the URL-combination test scripts in
+.cursor/plans/robinhood-asset-preselection/implementation-logs/, which import
+it from here, so the same logic is reused and benchmarked.
+
+Reference IDs are UUIDv7 (RFC 9562): a 48-bit millisecond timestamp followed
+by random bits, so IDs sort by issue time. Used as primary keys they append to
+the end of a B-tree index instead of scattering inserts, and "all links issued
+today" is a range scan. reference_id_timestamp() recovers the issue time.
+
+Usage:
+  from connect_urls import build_url, generate_reference_id
+
+  reference_ids = generate_reference_ids(10000)   # one entropy read, ascending
+  issued_at = reference_id_timestamp(reference_ids[0])
+
+  # Bulk generation: encode the constant part once, then only per-donor fields
+  template = ConnectUrlTemplate(static_params, ["walletAddress", "referenceId"])
+  url = template.render(wallet_address, reference_id)
+"""
+
+import os
+import re
+import threading
+import time
+import urllib.parse
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+from uuid import UUID
+
+CONNECT_BASE_URL = "https://applink.robinhood.com/u/connect"
+
+# The 60 bits above the variant are unix_ts_ms (48) + rand_a (12). rand_a is
+# used as a sub-millisecond counter (RFC 9562 method 1) so IDs generated in
+# the same millisecond stay ordered; it starts at a random value below 2048,
+# leaving room for 2048+ IDs per millisecond before the timestamp is borrowed.
+_V7_VERSION = 0x7 << 76
+_V7_VARIANT = 0b10 << 62
+_RAND_B_MASK = (1 << 62) - 1
+_last_counter = 0
+_counter_lock = threading.Lock()
+
+
+def _next_counters(count: int, seed: int) -> int:
+    """Reserve count consecutive (timestamp << 12 | seq) values; returns the first"""
+    global _last_counter
+    start = (time.time_ns() // 1_000_000 << 12) | (seed & 0x7FF)
+    with _counter_lock:
+        if start <= _last_counter:
+            start = _last_counter + 1
+        _last_counter = start + count - 1
+    return start
+
+
+def _format_v7(counter: int, rand_b: int) -> str:
+    value = _V7_VERSION | (counter >> 12 << 80) | ((counter & 0xFFF) << 64) | _V7_VARIANT | (rand_b & _RAND_B_MASK)
+    h = f"{value:032x}"
+    return f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
+
+
+def generate_reference_id() -> str:
+    """Generate a time-ordered UUIDv7 reference ID"""
+    entropy = int.from_bytes(os.urandom(10), "big")
+    return _format_v7(_next_counters(1, entropy >> 64), entropy)
+
+
+def generate_reference_ids(count: int) -> List[str]:
+    """Generate count ascending UUIDv7 reference IDs from a single entropy read"""
+    if count <= 0:
+        return []
+    entropy = os.urandom(8 * count + 2)
+    counter = _next_counters(count, int.from_bytes(entropy[-2:], "big"))
+    from_bytes = int.from_bytes
+    return [
+        _format_v7(counter + idx, from_bytes(entropy[8 * idx:8 * idx + 8], "big"))
+        for idx in range(count)
+    ]
+
+
+def reference_id_stream(chunk: int = 4096) -> Iterator[str]:
+    """Endless reference IDs, generated in bulk chunks (for batch URL runs)"""
+    while True:
+        yield from generate_reference_ids(chunk)
+
+
+def reference_id_timestamp(reference_id: str) -> datetime:
+    """Issue time (UTC, millisecond precision) encoded in a UUIDv7 reference ID"""
+    uuid = UUID(reference_id)
+    if uuid.version != 7:
+        raise ValueError(f"{reference_id} is not a UUIDv7 reference ID (version {uuid.version})")
+    return datetime.fromtimestamp((uuid.int >> 80) / 1000, tz=timezone.utc)
+
+
+def encode_value(value: Any) -> str:
+    """Convert a parameter value to its URL string form (lists → comma-joined)"""
+    if isinstance(value, list):
+        return ",".join(str(v) for v in value)
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return str(value)
+
+
+def build_url(params: Dict[str, Any]) -> str:
+    """
+    Build Robinhood Connect URL with given parameters
+
+    Args:
+        params: Dictionary of URL parameters (None values are skipped)
+
+    Returns:
+        Complete URL string
+    """
+    encoded_params = {
+        key: encode_value(value)
+        for key, value in params.items()
+        if value is not None
+    }
+
+    query_string = urllib.parse.urlencode(encoded_params)
+    return f"{CONNECT_BASE_URL}?{query_string}"
+
+
+# Characters urlencode() leaves untouched - values made only of these need no quoting
+_needs_no_quoting = re.compile(r"[A-Za-z0-9_.~-]*\Z").match
+_quote_plus = urllib.parse.quote_plus
+
+
+class ConnectUrlTemplate:
+    """
+    Precompiled Connect URL for bulk generation
+
+    The static parameters (applicationId, redirectUrl, supportedNetworks,
+    asset, ...) are urlencoded once into a prefix. render() then only encodes
+    the per-donor fields, skipping quote_plus for values that are already
+    URL-safe (UUIDs, hex and base58 addresses).
+
+    Static parameters come first in the query string, followed by the
+    dynamic fields in the order given.
+    """
+
+    def __init__(self, static_params: Dict[str, Any], dynamic_fields: Sequence[str]):
+        encoded = {
+            key: encode_value(value)
+            for key, value in static_params.items()
+            if value is not None
+        }
+        self.static_params = encoded
+        self.dynamic_fields = tuple(dynamic_fields)
+        self.prefix = build_url(encoded)
+
+        separator = "&" if encoded else ""
+        self._keys = tuple(
+            (separator if idx == 0 else "&") + _quote_plus(field) + "="
+            for idx, field in enumerate(self.dynamic_fields)
+        )
+
+    def render(self, *values: Optional[str]) -> str:
+        """Build one URL from dynamic field values (None values are skipped)"""
+        parts = [self.prefix]
+        for key, value in zip(self._keys, values):
+            if value is None:
+                continue
+            parts.append(key)
+            parts.append(value if _needs_no_quoting(value) else _quote_plus(value))
+        return "".join(parts)
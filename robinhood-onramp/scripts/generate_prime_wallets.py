@@ -10,18 +10,62 @@ Priority order for wallet selection:
 Usage:
   python3 generate_prime_wallets.py              # Returns preferred wallets only
   python3 generate_prime_wallets.py --all-wallets # Returns all wallets for prioritization
+
+  # Highest-value assets first; whatever is unresolved after 5s is 'pending'
+  python3 generate_prime_wallets.py --all-wallets --json-only --priority --deadline 5
+  python3 generate_prime_wallets.py --priority donation-volume.json
+
+  # 4 symbols in parallel, historically slowest first (latency_history.py);
+  # reports predicted vs actual makespan
+  python3 generate_prime_wallets.py --all-wallets --workers 4
+
+  # Requests time out after 30s by default; --hedge re-sends a GET that is
+  # slower than the endpoint's p95 and takes whichever answer comes first
+  python3 generate_prime_wallets.py --all-wallets --json-only --hedge --request-timeout 10
+
+  # Up to 16 workers, in-flight requests adapted to Prime's throttling (AIMD)
+  python3 generate_prime_wallets.py --all-wallets --workers 16 --adaptive
+
+  # Extra API keys (COINBASE_PRIME_ACCESS_KEY_2 / _SIGNING_KEY_2 / _PASSPHRASE_2, ...)
+  # are pooled automatically; requests go to the least-loaded healthy key
+  python3 generate_prime_wallets.py --all-wallets --workers 12 --key-strategy round_robin
+
+  # Full crawl paced to 20 req/s, of which bulk traffic uses at most 80%; a
+  # concurrent on-demand lookup (interactive lane) gets the remaining share
+  python3 generate_prime_wallets.py --all-wallets --workers 8 --rate-limit 20 --reserve 0.2
+  python3 generate_prime_wallets.py --symbols SOL --json-only
+
+Progress is journaled (resolution_journal.py); after a crash, Ctrl-C or
+SIGTERM, --resume lists from the last cursor and skips resolved symbols:
+
+  python3 generate_prime_wallets.py --all-wallets --json-only --resume
+
+SIGTERM stops resolution early as well: the results so far are printed (in
+--json-only mode as the usual JSON) with the remaining symbols 'pending'.
+
+  python3 generate_prime_wallets.py --record-cassette prime.cassette.json.gz
+  python3 generate_prime_wallets.py --replay-cassette prime.cassette.json.gz --latency-scale 0
+
+The listing and addresses come from the shared wallet snapshot
+(wallet_snapshot.py) while younger than --max-age; --offline runs from it alone:
+
+  python3 generate_prime_wallets.py --all-wallets --json-only --offline
 """
 
 import argparse
 import json
 import logging
-import os
+import signal
 import sys
+import threading
 import time
+from contextlib import contextmanager
 from pathlib import Path
 
-from dotenv import load_dotenv
-from prime_api_client import CoinbasePrimeClient
+from latency_history import DEFAULT_HISTORY_PATH, LatencyHistory, lpt_schedule, makespan_lower_bound
+from prime_cassette import PrimeCassette
+from prime_config import create_client
+from wallet_snapshot import add_snapshot_arguments, snapshot_from_args
 
 logging.basicConfig(
     level=logging.INFO,
@@ -84,55 +128,50 @@ ROBINHOOD_ASSETS = {
     # 'TON': 'TONCOIN',
 }
 
-def get_robinhood_wallet_addresses(return_all_wallets=False, json_only=False):
-    """
-    Get wallet addresses for all Robinhood-supported assets
+# Resolution order for --priority (higher first; unlisted symbols weigh 0 and
+# follow alphabetically). Roughly donation volume - pass --priority PATH with a
+# JSON {symbol: weight} mapping to use current figures instead.
+ASSET_PRIORITY = {
+    'BTC': 100,
+    'ETH': 95,
+    'USDC': 90,
+    'SOL': 80,
+    'ETH_BASE': 60,
+    'XRP': 50,
+    'DOGE': 45,
+    'LTC': 40,
+    'AVAX': 35,
+    'LINK': 35,
+    'POL': 30,
+    'ARB': 30,
+    'OP': 30,
+}
 
-    Args:
-        return_all_wallets: If True, returns ALL wallets per symbol.
-                          If False, returns only the preferred wallet (Trading > Trading Balance)
-        json_only: If True, suppress all print statements (output only JSON)
-    """
+def fetch_all_wallets(client, progress=print, page_delay=0.2, history=None, journal=None):
+    """Fetch wallets from every listing page and merge them into one list
     
-    # Helper to print progress (goes to stderr in json_only mode)
-    def progress(msg):
-        if json_only:
-            print(msg, file=sys.stderr)
-        else:
-            print(msg)
-    
-    if not json_only:
-        print("=" * 100)
-        print("Coinbase Prime - Robinhood Asset Deposit Addresses")
-        if return_all_wallets:
-            print("Mode: Returning ALL wallet types for each asset")
-        else:
-            print("Mode: Returning PREFERRED wallet only (Trading > Trading Balance)")
-        print("=" * 100)
-    
-    # Load credentials
-    env_path = Path(__file__).parent.parent / ".env.local"
-    load_dotenv(env_path)
-    
-    access_key = os.getenv("COINBASE_PRIME_ACCESS_KEY") or os.getenv("COINBASE_PRIME_API_KEY")
-    signing_key = os.getenv("COINBASE_PRIME_SIGNING_KEY")
-    passphrase = os.getenv("COINBASE_PRIME_PASSPHRASE")
-    portfolio_id = os.getenv("COINBASE_PRIME_PORTFOLIO_ID")
-    
-    # Initialize client
-    logger.info("Initializing API client...")
-    client = CoinbasePrimeClient(access_key, signing_key, passphrase, portfolio_id)
-    progress("✅ API client initialized")
-    
-    # Get all wallets (ALL pages)
-    logger.info("Fetching all wallets across all pages...")
+    With a journal, each page is checkpointed; a resumed journal's pages are
+    reused and listing continues at its cursor.
+    """
     all_wallets = []
     cursor = None
     page = 1
+    if journal is not None and journal.resumed:
+        all_wallets = list(journal.wallets)
+        if journal.listed:
+            progress(f"  ✓ Listing restored from journal ({len(all_wallets)} wallets, {journal.pages} pages)")
+            return all_wallets
+        cursor = journal.cursor
+        page = journal.pages + 1
+        if journal.pages:
+            progress(f"  ✓ {journal.pages} page(s) restored from journal, continuing at page {page}")
     
     while True:
         progress(f"  Fetching page {page}...")
+        started = time.monotonic()
         result = client.list_wallets(cursor=cursor)
+        if history is not None and not client.from_snapshot:
+            history.observe("endpoint", "list_wallets", time.monotonic() - started)
         wallets = result.get("wallets", [])
         all_wallets.extend(wallets)
         progress(f"  ✓ Page {page}: found {len(wallets)} wallets (total: {len(all_wallets)})")
@@ -140,136 +179,188 @@ def get_robinhood_wallet_addresses(return_all_wallets=False, json_only=False):
         # Check for next page
         pagination = result.get("pagination", {})
         has_next = pagination.get("has_next", False)
+        cursor = pagination.get("next_cursor") if has_next else None
+        if journal is not None:
+            journal.record_page(cursor, wallets, bool(cursor))
         
-        if not has_next:
-            break
-        
-        cursor = pagination.get("next_cursor")
         if not cursor:
             break
         
         page += 1
-        time.sleep(0.2)  # Small delay between pages
+        if not client.from_snapshot:
+            time.sleep(page_delay)  # Small delay between pages
     
     logger.info(f"Found {len(all_wallets)} total wallets across {page} pages")
-    
-    # Create lookup by symbol
+    return all_wallets
+
+def group_wallets_by_symbol(wallets):
+    """Create lookup of symbol → wallets (wallets without a symbol are skipped)"""
     wallets_by_symbol = {}
-    for wallet in all_wallets:
+    for wallet in wallets:
         symbol = wallet.get("symbol")
         if symbol:
             if symbol not in wallets_by_symbol:
                 wallets_by_symbol[symbol] = []
             wallets_by_symbol[symbol].append(wallet)
+    return wallets_by_symbol
+
+def select_preferred_wallet(symbol_wallets):
+    """Pick the preferred wallet: Trading > Trading Balance > first wallet"""
+    # Priority 1: Trading account (exact match)
+    trading_wallet = next(
+        (w for w in symbol_wallets if w.get("name") == "Trading"),
+        None
+    )
     
-    progress(f"\n[1/2] Found wallets for {len(wallets_by_symbol)} different symbols")
-    progress(f"[2/2] Retrieving deposit addresses for {len(ROBINHOOD_ASSETS)} Robinhood assets...")
+    # Priority 2: Trading Balance
+    if not trading_wallet:
+        trading_wallet = next(
+            (w for w in symbol_wallets if "Trading Balance" in w.get("name", "")),
+            None
+        )
     
-    if not json_only:
-        print("=" * 100)
+    # Priority 3: Any wallet
+    if not trading_wallet:
+        trading_wallet = symbol_wallets[0]
+    
+    return trading_wallet
+
+def render_typescript(results, generated_at):
+    """Render found addresses as PRIME_DEPOSIT_ADDRESSES / PRIME_DEPOSIT_MEMOS TypeScript"""
+    lines = [
+        "// Coinbase Prime Deposit Addresses\n",
+        "// Generated: " + generated_at + "\n\n",
+        "export const PRIME_DEPOSIT_ADDRESSES = {\n",
+    ]
+    
+    for r in results:
+        if r['status'] == 'found':
+            lines.append(f"  {r['network']}: '{r['address']}',")
+            if r['memo']:
+                lines.append(f" // Memo: {r['memo']}")
+            lines.append("\n")
+    
+    lines.append("}\n\n")
     
+    lines.append("export const PRIME_DEPOSIT_MEMOS = {\n")
+    for r in results:
+        if r['status'] == 'found' and r['memo']:
+            lines.append(f"  {r['network']}: '{r['memo']}',\n")
+    lines.append("}\n")
+    
+    return "".join(lines)
+
+class ResolutionInterrupted(BaseException):
+    """
+    Raised into the resolution loop when the deadline passes or SIGTERM
+    arrives. A BaseException (like KeyboardInterrupt) so the per-wallet
+    'except Exception' handlers cannot swallow it.
+    """
+
+
+@contextmanager
+def resolution_deadline(deadline=None):
+    """
+    Raise ResolutionInterrupted at the deadline (time.monotonic() value) or
+    on SIGTERM while the block runs. The deadline uses a real-time timer so it
+    also interrupts a request that is blocked on the network. Handlers are
+    only installed on the main thread; previous handlers are restored on exit.
+    """
+    if threading.current_thread() is not threading.main_thread():
+        yield
+        return
+
+    def interrupt(reason):
+        def handler(signum, frame):
+            raise ResolutionInterrupted(reason)
+        return handler
+
+    previous_term = signal.signal(signal.SIGTERM, interrupt("SIGTERM"))
+    timer = deadline is not None and hasattr(signal, "setitimer")
+    if timer:
+        previous_alarm = signal.signal(signal.SIGALRM, interrupt("deadline"))
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            signal.signal(signal.SIGALRM, previous_alarm)
+            signal.signal(signal.SIGTERM, previous_term)
+            raise ResolutionInterrupted("deadline")
+        signal.setitimer(signal.ITIMER_REAL, remaining)
+    try:
+        yield
+    finally:
+        if timer:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, previous_alarm)
+        signal.signal(signal.SIGTERM, previous_term)
+
+
+def load_priority(path=None):
+    """Symbol → weight: ASSET_PRIORITY, or a JSON mapping (e.g. donation volume by symbol)"""
+    if not path:
+        return dict(ASSET_PRIORITY)
+    with open(path) as f:
+        return {symbol: float(weight) for symbol, weight in json.load(f).items()}
+
+
+def order_assets(priority=None):
+    """ROBINHOOD_ASSETS items, highest weight first (ties and unweighted symbols alphabetical)"""
+    if priority is None:
+        return sorted(ROBINHOOD_ASSETS.items())
+    return sorted(ROBINHOOD_ASSETS.items(), key=lambda item: (-priority.get(item[0], 0), item[0]))
+
+
+def pending_result(symbol, network_name):
+    """Result row for a symbol the run did not get to"""
+    return {
+        "symbol": symbol,
+        "network": network_name,
+        "status": "pending",
+        "address": None,
+        "memo": None,
+        "wallet_id": None,
+        "wallet_name": None
+    }
+
+
+# Pause after each deposit_instructions call (rate limiting), by mode
+ALL_WALLETS_PAUSE = 0.05
+PREFERRED_PAUSE = 0.3
+
+
+def get_deposit_address(client, symbol, wallet_id, history=None):
+    """Deposit address and memo, recording the call latency per symbol and endpoint"""
+    started = time.monotonic()
+    address, memo = client.get_wallet_deposit_address(wallet_id)
+    if history is not None and not client.from_snapshot:
+        elapsed = time.monotonic() - started
+        history.observe("symbol", symbol, elapsed)
+        history.observe("endpoint", "deposit_instructions", elapsed)
+    return address, memo
+
+
+def resolve_symbol(client, symbol, network_name, symbol_wallets, return_all_wallets, json_only, pause,
+                   history=None):
+    """Deposit address result rows for one symbol"""
     results = []
-    found_count = 0
-    missing_count = 0
-    total_assets = len(ROBINHOOD_ASSETS)
-    current_asset = 0
-    
-    for symbol, network_name in sorted(ROBINHOOD_ASSETS.items()):
-        current_asset += 1
-        progress(f"[{current_asset}/{total_assets}] Processing {symbol} ({network_name})...")
-        
-        # Find ALL wallets for this symbol
-        if symbol not in wallets_by_symbol:
-            if not json_only:
-                print(f"  ⚠️  No wallet found for {symbol}")
-            missing_count += 1
-            results.append({
-                "symbol": symbol,
-                "network": network_name,
-                "status": "missing",
-                "address": None,
-                "memo": None,
-                "wallet_id": None,
-                "wallet_name": None
-            })
-            continue
-        
-        symbol_wallets = wallets_by_symbol[symbol]
-        
-        if return_all_wallets:
-            # Return ALL wallets for this symbol
-            for wallet_idx, wallet in enumerate(symbol_wallets, 1):
-                wallet_id = wallet.get("id")
-                wallet_name = wallet.get("name")
-                
-                if not json_only:
-                    print(f"  Wallet {wallet_idx}/{len(symbol_wallets)}: {wallet_name}")
-                    print(f"  ID:     {wallet_id}")
-                
-                try:
-                    address, memo = client.get_wallet_deposit_address(wallet_id)
-                    
-                    if not json_only:
-                        print(f"  ✅ Address: {address}")
-                        if memo:
-                            print(f"  📝 Memo:    {memo}")
-                    
-                    found_count += 1
-                    results.append({
-                        "symbol": symbol,
-                        "network": network_name,
-                        "status": "found",
-                        "wallet_name": wallet_name,
-                        "wallet_id": wallet_id,
-                        "address": address,
-                        "memo": memo
-                    })
-                    
-                    time.sleep(0.05)  # Reduced delay for faster execution (still prevents rate limiting)
-                    
-                except Exception as e:
-                    logger.error(f"Failed to get address for {symbol} ({wallet_name}): {e}")
-                    if not json_only:
-                        print(f"  ❌ Failed: {e}")
-        
-        else:
-            # Return only PREFERRED wallet (existing priority logic)
-            # Priority 1: Trading account (exact match)
-            trading_wallet = next(
-                (w for w in symbol_wallets if w.get("name") == "Trading"),
-                None
-            )
-            
-            # Priority 2: Trading Balance
-            if not trading_wallet:
-                trading_wallet = next(
-                    (w for w in symbol_wallets if "Trading Balance" in w.get("name", "")),
-                    None
-                )
-            
-            # Priority 3: Any wallet
-            if not trading_wallet:
-                trading_wallet = symbol_wallets[0]
-                print(f"  ℹ️  Using: {trading_wallet.get('name')} (no Trading/Trading Balance found)")
-            
-            wallet = trading_wallet
+    
+    if return_all_wallets:
+        # Return ALL wallets for this symbol
+        for wallet_idx, wallet in enumerate(symbol_wallets, 1):
             wallet_id = wallet.get("id")
             wallet_name = wallet.get("name")
             
-            print(f"  Wallet: {wallet_name}")
-            print(f"  ID:     {wallet_id}")
-            
-            if len(symbol_wallets) > 1:
-                print(f"  📊 Note: {len(symbol_wallets)} wallets available, selected: {wallet_name}")
+            if not json_only:
+                print(f"  Wallet {wallet_idx}/{len(symbol_wallets)}: {wallet_name}")
+                print(f"  ID:     {wallet_id}")
             
             try:
-                address, memo = client.get_wallet_deposit_address(wallet_id)
+                address, memo = get_deposit_address(client, symbol, wallet_id, history)
                 
-                print(f"  ✅ Address: {address}")
-                if memo:
-                    print(f"  📝 Memo:    {memo}")
+                if not json_only:
+                    print(f"  ✅ Address: {address}")
+                    if memo:
+                        print(f"  📝 Memo:    {memo}")
                 
-                found_count += 1
                 results.append({
                     "symbol": symbol,
                     "network": network_name,
@@ -280,25 +371,310 @@ def get_robinhood_wallet_addresses(return_all_wallets=False, json_only=False):
                     "memo": memo
                 })
                 
-                time.sleep(0.3)
+                pause(ALL_WALLETS_PAUSE)  # Reduced delay for faster execution (still prevents rate limiting)
                 
             except Exception as e:
-                logger.error(f"Failed to get address for {symbol}: {e}")
-                print(f"  ❌ Failed: {e}")
-                results.append({
-                    "symbol": symbol,
-                    "network": network_name,
-                    "status": "error",
-                    "wallet_id": wallet_id,
-                    "wallet_name": wallet_name,
-                    "address": None,
-                    "memo": None,
-                    "error": str(e)
-                })
-                continue
+                logger.error(f"Failed to get address for {symbol} ({wallet_name}): {e}")
+                if not json_only:
+                    print(f"  ❌ Failed: {e}")
+        
+        return results
+    
+    # Return only PREFERRED wallet (Trading > Trading Balance > any)
+    wallet = select_preferred_wallet(symbol_wallets)
+    if wallet.get("name") != "Trading" and "Trading Balance" not in wallet.get("name", ""):
+        print(f"  ℹ️  Using: {wallet.get('name')} (no Trading/Trading Balance found)")
+    
+    wallet_id = wallet.get("id")
+    wallet_name = wallet.get("name")
+    
+    print(f"  Wallet: {wallet_name}")
+    print(f"  ID:     {wallet_id}")
+    
+    if len(symbol_wallets) > 1:
+        print(f"  📊 Note: {len(symbol_wallets)} wallets available, selected: {wallet_name}")
+    
+    try:
+        address, memo = get_deposit_address(client, symbol, wallet_id, history)
+        
+        print(f"  ✅ Address: {address}")
+        if memo:
+            print(f"  📝 Memo:    {memo}")
+        
+        results.append({
+            "symbol": symbol,
+            "network": network_name,
+            "status": "found",
+            "wallet_name": wallet_name,
+            "wallet_id": wallet_id,
+            "address": address,
+            "memo": memo
+        })
+        
+        pause(PREFERRED_PAUSE)
+        
+    except Exception as e:
+        logger.error(f"Failed to get address for {symbol}: {e}")
+        print(f"  ❌ Failed: {e}")
+        results.append({
+            "symbol": symbol,
+            "network": network_name,
+            "status": "error",
+            "wallet_id": wallet_id,
+            "wallet_name": wallet_name,
+            "address": None,
+            "memo": None,
+            "error": str(e)
+        })
+    
+    return results
+
+def get_robinhood_wallet_addresses(return_all_wallets=False, json_only=False, cassette=None,
+                                   deadline=None, priority=None, workers=1, history=None,
+                                   client_options=None, symbols=None, journal_path=None, resume=False,
+                                   discard_journal=False, validate_addresses=True):
+    """
+    Get wallet addresses for all Robinhood-supported assets
+
+    Args:
+        return_all_wallets: If True, returns ALL wallets per symbol.
+                          If False, returns only the preferred wallet (Trading > Trading Balance)
+        json_only: If True, suppress all print statements (output only JSON)
+        cassette: Optional PrimeCassette to record into or replay from
+        deadline: Optional time.monotonic() value; symbols not resolved by
+                  then (or when SIGTERM arrives) are returned as 'pending'
+        priority: Optional symbol → weight; higher weights resolve first
+                  (default: alphabetical)
+        workers: Resolve this many symbols in parallel, historically slowest
+                 first (LPT scheduling, within priority weights)
+        history: Optional LatencyHistory used to schedule and updated with
+                 this run's call latencies
+        client_options: Extra CoinbasePrimeClient options (timeout, hedge, limiter, lanes) and key_strategy
+        symbols: Only resolve these symbols; requests then go in the
+                 interactive lane instead of the bulk lane
+        journal_path: Checkpoint listing pages and completed symbols here
+                      (see resolution_journal.py); removed when the run completes
+        resume: Continue from the journal at journal_path instead of starting over
+        discard_journal: Replace an unfinished journal for another portfolio or
+                         mode at journal_path (otherwise JournalConflictError)
+        validate_addresses: Check every found address against its network's
+                            format, checksum and memo rules (address_validation.py);
+                            failures are returned as 'invalid' and never rendered
+    """
+    
+    # Helper to print progress (goes to stderr in json_only mode)
+    def progress(msg):
+        if json_only:
+            print(msg, file=sys.stderr)
+        else:
+            print(msg)
+    
+    # Pauses between requests never run past the deadline (none after a snapshot answer)
+    def pause(seconds):
+        if client is not None and client.from_snapshot:
+            return
+        if deadline is not None:
+            seconds = min(seconds, max(0.0, deadline - time.monotonic()))
+        time.sleep(seconds)
+    
+    if not json_only:
+        print("=" * 100)
+        print("Coinbase Prime - Robinhood Asset Deposit Addresses")
+        if return_all_wallets:
+            print("Mode: Returning ALL wallet types for each asset")
+        else:
+            print("Mode: Returning PREFERRED wallet only (Trading > Trading Balance)")
+        if priority is not None:
+            print("Order: by priority weight")
+        if deadline is not None:
+            print(f"Deadline: {max(0.0, deadline - time.monotonic()):.1f}s (unresolved symbols → pending)")
+        print("=" * 100)
+    
+    if history is None:
+        history = LatencyHistory()
+    
+    ordered_assets = order_assets(priority)
+    if symbols:
+        ordered_assets = [(symbol, network) for symbol, network in ordered_assets if symbol in symbols]
+    position = {symbol: index for index, (symbol, _) in enumerate(ordered_assets)}
+    makespan = None
+    results = []
+    resolved = set()
+    interrupted = None
+    client = None
+    journal = None
+    
+    try:
+        with resolution_deadline(deadline):
+            # Initialize client (credentials from .env.local; optional on replay)
+            logger.info("Initializing API client...")
+            client = create_client(cassette=cassette, validate=False,
+                                   default_lane="interactive" if symbols else "bulk", **(client_options or {}))
+            progress("✅ API client initialized")
+            
+            if journal_path:
+                from resolution_journal import ResolutionJournal
+                key = {"portfolio": client.portfolio_id, "mode": "all" if return_all_wallets else "preferred"}
+                journal = ResolutionJournal.open(journal_path, key, resume=resume, overwrite=discard_journal)
+                if journal.resumed:
+                    progress(f"↻ Resuming from {journal_path}: {len(journal.wallets)} wallets listed, "
+                             f"{len(journal.done)} symbol(s) resolved")
+                elif resume:
+                    progress(f"↻ Nothing to resume at {journal_path} - starting a fresh run")
+            
+            # Get all wallets (ALL pages)
+            logger.info("Fetching all wallets across all pages...")
+            all_wallets = fetch_all_wallets(client, progress, history=history, journal=journal)
+            
+            # Create lookup by symbol
+            wallets_by_symbol = group_wallets_by_symbol(all_wallets)
+            
+            progress(f"\n[1/2] Found wallets for {len(wallets_by_symbol)} different symbols")
+            progress(f"[2/2] Retrieving deposit addresses for {len(ordered_assets)} Robinhood assets...")
+            
+            if not json_only:
+                print("=" * 100)
+            
+            total_assets = len(ordered_assets)
+            
+            def resolve(current_asset, symbol, network_name):
+                if journal is not None and symbol in journal.done:
+                    progress(f"[{current_asset}/{total_assets}] {symbol} ({network_name}) restored from journal")
+                    return journal.done[symbol]
+                progress(f"[{current_asset}/{total_assets}] Processing {symbol} ({network_name})...")
+                rows = lookup(symbol, network_name)
+                if journal is not None and fully_resolved(symbol, rows):
+                    journal.record_symbol(symbol, rows)
+                return rows
+            
+            # Failed lookups are left out of the journal so --resume asks again
+            def fully_resolved(symbol, rows):
+                if any(row["status"] == "error" for row in rows):
+                    return False
+                # All-wallets mode drops failed wallets instead of returning an error row
+                return not return_all_wallets or len(rows) == len(wallets_by_symbol.get(symbol, rows))
+            
+            def lookup(symbol, network_name):
+                # Find ALL wallets for this symbol
+                if symbol not in wallets_by_symbol:
+                    if not json_only:
+                        print(f"  ⚠️  No wallet found for {symbol}")
+                    return [{
+                        "symbol": symbol,
+                        "network": network_name,
+                        "status": "missing",
+                        "address": None,
+                        "memo": None,
+                        "wallet_id": None,
+                        "wallet_name": None
+                    }]
+                return resolve_symbol(client, symbol, network_name, wallets_by_symbol[symbol],
+                                      return_all_wallets, json_only, pause, history)
+            
+            if workers > 1:
+                # Longest (historically slowest) symbols first so none is left running alone at the end
+                per_call_pause = ALL_WALLETS_PAUSE if return_all_wallets else PREFERRED_PAUSE
+                durations = {}
+                for symbol, _ in ordered_assets:
+                    calls = len(wallets_by_symbol.get(symbol, [])) if return_all_wallets else 1
+                    known = symbol in wallets_by_symbol and not (journal is not None and symbol in journal.done)
+                    durations[symbol] = history.predict(symbol, calls, per_call_pause) if known else 0.0
+                order, predicted = lpt_schedule(durations, workers, priority)
+                ordered_assets = [(symbol, ROBINHOOD_ASSETS[symbol]) for symbol in order]
+                makespan = {"predicted_s": predicted, "lower_bound_s": makespan_lower_bound(durations, workers)}
+                progress(f"  LPT schedule on {workers} workers: predicted makespan {predicted:.2f}s "
+                         f"(lower bound {makespan['lower_bound_s']:.2f}s)")
+                
+                # Imported here: sequential runs (the default) skip concurrent.futures at startup
+                from concurrent.futures import ThreadPoolExecutor, as_completed
+                
+                started = time.monotonic()
+                stop = threading.Event()
+                
+                def job(current_asset, symbol, network_name):
+                    # Queued jobs do nothing once the run is cut short
+                    return None if stop.is_set() else resolve(current_asset, symbol, network_name)
+                
+                pool = ThreadPoolExecutor(max_workers=workers)
+                try:
+                    futures = {
+                        pool.submit(job, idx, symbol, network_name): symbol
+                        for idx, (symbol, network_name) in enumerate(ordered_assets, 1)
+                    }
+                    for future in as_completed(futures):
+                        rows = future.result()
+                        if rows is not None:
+                            results.extend(rows)
+                            resolved.add(futures[future])
+                finally:
+                    stop.set()
+                    pool.shutdown(wait=False, cancel_futures=True)
+                    makespan["actual_s"] = time.monotonic() - started
+            else:
+                for current_asset, (symbol, network_name) in enumerate(ordered_assets, 1):
+                    results.extend(resolve(current_asset, symbol, network_name))
+                    resolved.add(symbol)
+    
+    except ResolutionInterrupted as e:
+        interrupted = str(e)
+    finally:
+        # Interrupted or failed runs keep their journal for --resume
+        if journal is not None:
+            journal.close()
+    if journal is not None and not interrupted:
+        journal.complete()
+    
+    # Same order as a sequential run, however the work was split or resumed
+    results.sort(key=lambda row: position.get(row["symbol"], len(position)))
+    
+    # Whatever was not resolved is reported as pending (found rows are kept)
+    if interrupted:
+        answered = resolved | {r["symbol"] for r in results}
+        pending = [(s, n) for s, n in ordered_assets if s not in answered]
+        results.extend(pending_result(symbol, network_name) for symbol, network_name in pending)
+        logger.warning(f"Stopped early ({interrupted}): {len(pending)} symbol(s) pending")
+    
+    # A malformed address must never reach PRIME_DEPOSIT_ADDRESSES
+    if validate_addresses:
+        from address_validation import validate_batch
+        for r, error in zip(results, validate_batch(results)):
+            if error and r["status"] == "found":
+                r["status"], r["error"] = "invalid", error
+                logger.error(f"Invalid deposit address for {r['symbol']} ({r['wallet_name']}): {error}")
+    
+    found_count = sum(1 for r in results if r["status"] == "found")
+    missing_count = sum(1 for r in results if r["status"] == "missing")
+    pending_count = sum(1 for r in results if r["status"] == "pending")
+    invalid_count = sum(1 for r in results if r["status"] == "invalid")
+    
+    # Parallel run: how close the schedule came to its prediction
+    if makespan and "actual_s" in makespan:
+        progress(f"  Makespan: predicted {makespan['predicted_s']:.2f}s, actual {makespan['actual_s']:.2f}s "
+                 f"(lower bound {makespan['lower_bound_s']:.2f}s)")
+        # A run answered from the snapshot says nothing about Prime's timing
+        if not interrupted and client.requests_sent:
+            history.record_run(
+                at=time.strftime("%Y-%m-%dT%H:%M:%S"),
+                workers=workers,
+                **{key: round(value, 3) for key, value in makespan.items()}
+            )
+    limiter = (client_options or {}).get("limiter")
+    if limiter:
+        progress(f"  Concurrency window: {limiter.snapshot()}")
+    lanes = (client_options or {}).get("lanes")
+    if lanes:
+        progress(f"  Lanes: {lanes.snapshot()}")
+    if client and client.credentials:
+        for key in client.credentials.snapshot():
+            progress(f"  API key {key['key']}: {key['requests']} requests, {key['throttled']} throttled, "
+                     f"{key['unauthorized']} unauthorized ({key['state']})")
+    if client and client.snapshot:
+        progress(f"  {client.snapshot.summary()}")
     
     # Summary
-    progress(f"\n✅ Complete! Found {found_count} addresses ({missing_count} missing)")
+    progress(f"\n✅ Complete! Found {found_count} addresses ({missing_count} missing"
+             + (f", {pending_count} pending" if pending_count else "")
+             + (f", {invalid_count} invalid" if invalid_count else "") + ")")
     
     if not json_only:
         print("\n" + "=" * 100)
@@ -307,7 +683,11 @@ def get_robinhood_wallet_addresses(return_all_wallets=False, json_only=False):
         print(f"\nRobinhood Assets: {len(ROBINHOOD_ASSETS)}")
         print(f"  ✅ Found:     {found_count}")
         print(f"  ⚠️  Missing:   {missing_count}")
-        print(f"  ❌ Errors:    {len(results) - found_count - missing_count}")
+        if pending_count:
+            print(f"  ⏳ Pending:   {pending_count} ({interrupted})")
+        if invalid_count:
+            print(f"  🚫 Invalid:   {invalid_count} (failed address validation)")
+        print(f"  ❌ Errors:    {len(results) - found_count - missing_count - pending_count - invalid_count}")
     
     # Show addresses
     print("\n" + "=" * 100)
@@ -329,7 +709,15 @@ def get_robinhood_wallet_addresses(return_all_wallets=False, json_only=False):
         for r in results:
             if r['status'] == 'missing':
                 print(f"  • {r['symbol']:10} ({r['network']})")
-    
+
+    if invalid_count > 0:
+        print("\n" + "=" * 100)
+        print("INVALID ADDRESSES (left out of the TypeScript output)")
+        print("=" * 100)
+        for r in results:
+            if r['status'] == 'invalid':
+                print(f"  • {r['symbol']:10} {r['address']}  {r['error']}")
+
     print("\n" + "=" * 100)
     
     return results
@@ -347,7 +735,144 @@ if __name__ == "__main__":
         action="store_true",
         help="Output only JSON to stdout (for TypeScript consumption)"
     )
+    parser.add_argument(
+        "--record-cassette",
+        metavar="PATH",
+        help="Record Prime responses (secrets scrubbed) to a cassette file"
+    )
+    parser.add_argument(
+        "--replay-cassette",
+        metavar="PATH",
+        help="Serve Prime responses from a cassette file instead of the API"
+    )
+    parser.add_argument(
+        "--latency-scale",
+        type=float,
+        default=1.0,
+        help="Multiplier for recorded latencies on replay (0 = no delay)"
+    )
+    parser.add_argument(
+        "--deadline",
+        type=float,
+        metavar="SECONDS",
+        help="Total time budget; symbols not resolved in time are returned as 'pending'"
+    )
+    parser.add_argument(
+        "--priority",
+        nargs="?",
+        const="",
+        metavar="PATH",
+        help="Resolve high-priority assets first (ASSET_PRIORITY, or a JSON {symbol: weight} file)"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Resolve symbols in parallel, historically slowest first (default: 1, sequential)"
+    )
+    parser.add_argument(
+        "--latency-history",
+        type=Path,
+        default=DEFAULT_HISTORY_PATH,
+        metavar="PATH",
+        help="Per-symbol/endpoint latency history used for scheduling (updated on live runs)"
+    )
+    parser.add_argument(
+        "--request-timeout",
+        type=float,
+        default=30.0,
+        metavar="SECONDS",
+        help="Per-request read timeout (connect timeout is 5s)"
+    )
+    parser.add_argument(
+        "--adaptive",
+        action="store_true",
+        help="Adapt in-flight requests to Prime's throttling (AIMD, up to --workers)"
+    )
+    parser.add_argument(
+        "--hedge",
+        action="store_true",
+        help="Re-send deposit/listing GETs slower than the observed p95 (within a 5%% budget)"
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue an interrupted run from its journal (completed symbols are not fetched again)"
+    )
+    parser.add_argument(
+        "--journal",
+        type=Path,
+        default=Path(__file__).parent / "resolution-journal.jsonl",
+        metavar="PATH",
+        help="Checkpoint journal of listing pages and resolved symbols (removed when a run completes)"
+    )
+    parser.add_argument(
+        "--discard-journal",
+        action="store_true",
+        help="Replace an unfinished --journal left by another portfolio or mode instead of refusing to start"
+    )
+    parser.add_argument(
+        "--symbols",
+        metavar="SYM,SYM",
+        help="Resolve only these symbols (an on-demand lookup: sent in the interactive lane)"
+    )
+    parser.add_argument(
+        "--rate-limit",
+        type=float,
+        default=0,
+        metavar="REQ_PER_S",
+        help="Pace requests client-side, keeping --reserve of the rate for interactive lookups (0 = off)"
+    )
+    parser.add_argument(
+        "--reserve",
+        type=float,
+        default=0.2,
+        metavar="FRACTION",
+        help="Share of --rate-limit that bulk (full crawl) requests never use"
+    )
+    parser.add_argument(
+        "--skip-address-validation",
+        action="store_true",
+        help="Do not check addresses against their network's format/checksum/memo rules"
+    )
+    parser.add_argument(
+        "--key-strategy",
+        choices=["least_loaded", "round_robin"],
+        default="least_loaded",
+        help="How requests are spread over API keys when COINBASE_PRIME_ACCESS_KEY_2... are set"
+    )
+    add_snapshot_arguments(parser)
     args = parser.parse_args()
+    deadline = time.monotonic() + args.deadline if args.deadline is not None else None
+    
+    cassette = None
+    if args.record_cassette and args.replay_cassette:
+        parser.error("--record-cassette and --replay-cassette are mutually exclusive")
+    if args.record_cassette:
+        cassette = PrimeCassette.record(args.record_cassette)
+    elif args.replay_cassette:
+        cassette = PrimeCassette.replay(args.replay_cassette, latency_scale=args.latency_scale)
+    if cassette and args.offline:
+        parser.error("--offline and cassettes are mutually exclusive")
+    
+    history = LatencyHistory.load(args.latency_history)
+    client_options = {"timeout": (5.0, args.request_timeout), "hedge": args.hedge,
+                      "hedge_concurrency": max(1, args.workers), "key_strategy": args.key_strategy}
+    if args.adaptive:
+        from prime_api_client import AimdLimiter
+        client_options["limiter"] = AimdLimiter(max_window=max(1, args.workers))
+    if args.rate_limit:
+        from prime_api_client import PriorityLanes
+        client_options["lanes"] = PriorityLanes(args.rate_limit, reserve=args.reserve)
+    # Cassette runs record or replay exact requests: no snapshot in between
+    if not cassette:
+        client_options["snapshot"] = snapshot_from_args(args)
+    symbols = None
+    if args.symbols:
+        symbols = {symbol.strip().upper() for symbol in args.symbols.split(",") if symbol.strip()}
+        unknown = sorted(symbols - set(ROBINHOOD_ASSETS))
+        if unknown:
+            parser.error(f"Unknown symbol(s): {', '.join(unknown)}")
     
     try:
         # Suppress stdout if json_only mode
@@ -358,7 +883,19 @@ if __name__ == "__main__":
         
         results = get_robinhood_wallet_addresses(
             return_all_wallets=args.all_wallets,
-            json_only=args.json_only
+            json_only=args.json_only,
+            cassette=cassette,
+            deadline=deadline,
+            priority=load_priority(args.priority) if args.priority is not None else None,
+            workers=args.workers,
+            history=history,
+            client_options=client_options,
+            symbols=symbols,
+            # Replays and on-demand lookups must not overwrite a crawl's journal
+            journal_path=None if args.replay_cassette or symbols else args.journal,
+            resume=args.resume,
+            discard_journal=args.discard_journal,
+            validate_addresses=not args.skip_address_validation
         )
         
         if args.json_only:
@@ -379,24 +916,7 @@ if __name__ == "__main__":
             # Also create a TypeScript-friendly format
             ts_filename = f"robinhood_assets_addresses_{timestamp}.ts"
             with open(ts_filename, 'w') as f:
-                f.write("// Coinbase Prime Deposit Addresses\n")
-                f.write("// Generated: " + datetime.now().isoformat() + "\n\n")
-                f.write("export const PRIME_DEPOSIT_ADDRESSES = {\n")
-                
-                for r in results:
-                    if r['status'] == 'found':
-                        f.write(f"  {r['network']}: '{r['address']}',")
-                        if r['memo']:
-                            f.write(f" // Memo: {r['memo']}")
-                        f.write("\n")
-                
-                f.write("}\n\n")
-                
-                f.write("export const PRIME_DEPOSIT_MEMOS = {\n")
-                for r in results:
-                    if r['status'] == 'found' and r['memo']:
-                        f.write(f"  {r['network']}: '{r['memo']}',\n")
-                f.write("}\n")
+                f.write(render_typescript(results, datetime.now().isoformat()))
             
             print(f"✅ TypeScript format saved to: {ts_filename}")
         
@@ -405,3 +925,13 @@ if __name__ == "__main__":
         import traceback
         traceback.print_exc()
         sys.exit(1)
+    
+    finally:
+        if cassette and not cassette.is_replay:
+            cassette.save()
+        # Replayed latencies are scaled, so only live runs update the history
+        if not (cassette and cassette.is_replay):
+            try:
+                history.save()
+            except OSError as e:
+                logger.warning(f"Could not save latency history: {e}")
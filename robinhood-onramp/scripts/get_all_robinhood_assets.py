@@ -6,16 +6,20 @@ Maps every asset that Robinhood supports to its Coinbase Prime Trading Balance w
 Each asset gets its own unique address, regardless of shared network.
 
 Reference: https://robinhood.com/us/en/support/articles/coin-availability/
+
+Usage:
+  python3 get_all_robinhood_assets.py
+  python3 get_all_robinhood_assets.py --offline     # from the shared wallet snapshot only
+  python3 get_all_robinhood_assets.py --max-age 0   # ignore the snapshot, crawl Prime
 """
 
+import argparse
 import json
 import logging
-import os
 import time
-from pathlib import Path
 
-from dotenv import load_dotenv
-from prime_api_client import CoinbasePrimeClient
+from prime_config import create_client
+from wallet_snapshot import add_snapshot_arguments, snapshot_from_args
 
 logging.basicConfig(
     level=logging.INFO,
@@ -81,7 +85,7 @@ ROBINHOOD_SUPPORTED_ASSETS = {
     'WLFI': 'World Liberty Financial',
 }
 
-def get_all_robinhood_asset_addresses():
+def get_all_robinhood_asset_addresses(snapshot=None):
     """Get Trading Balance wallet addresses for ALL Robinhood-supported assets"""
     
     print("=" * 100)
@@ -89,18 +93,9 @@ def get_all_robinhood_asset_addresses():
     print("=" * 100)
     print(f"\nTarget: {len(ROBINHOOD_SUPPORTED_ASSETS)} Robinhood-supported assets")
     
-    # Load credentials
-    env_path = Path(__file__).parent.parent / ".env.local"
-    load_dotenv(env_path)
-    
-    access_key = os.getenv("COINBASE_PRIME_ACCESS_KEY") or os.getenv("COINBASE_PRIME_API_KEY")
-    signing_key = os.getenv("COINBASE_PRIME_SIGNING_KEY")
-    passphrase = os.getenv("COINBASE_PRIME_PASSPHRASE")
-    portfolio_id = os.getenv("COINBASE_PRIME_PORTFOLIO_ID")
-    
     # Initialize client
     logger.info("Initializing API client...")
-    client = CoinbasePrimeClient(access_key, signing_key, passphrase, portfolio_id)
+    client = create_client(validate=False, snapshot=snapshot)
     print("✅ API client initialized\n")
     
     # Get ALL wallets across all pages
@@ -128,7 +123,8 @@ def get_all_robinhood_asset_addresses():
             break
         
         page += 1
-        time.sleep(0.2)  # Small delay between pages
+        if not client.from_snapshot:
+            time.sleep(0.2)  # Small delay between pages
     
     print(f"\n✅ Fetched {len(all_wallets)} total wallets across {page} pages")
     
@@ -210,8 +206,9 @@ def get_all_robinhood_asset_addresses():
                 "memo": memo
             })
             
-            # Small delay to avoid rate limiting
-            time.sleep(0.3)
+            # Small delay to avoid rate limiting (not needed for snapshot answers)
+            if not client.from_snapshot:
+                time.sleep(0.3)
             
         except Exception as e:
             logger.error(f"Failed to get address for {symbol}: {e}")
@@ -238,12 +235,18 @@ def get_all_robinhood_asset_addresses():
     print(f"  ⚠️  Missing:   {missing_count}")
     print(f"  ❌ Errors:    {error_count}")
     print(f"\nCoverage: {found_count}/{len(ROBINHOOD_SUPPORTED_ASSETS)} ({100*found_count/len(ROBINHOOD_SUPPORTED_ASSETS):.1f}%)")
+    if snapshot:
+        print(f"📦 {snapshot.summary()}")
     
     return results
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Trading Balance deposit addresses for every Robinhood asset")
+    add_snapshot_arguments(parser)
+    args = parser.parse_args()
+
     try:
-        results = get_all_robinhood_asset_addresses()
+        results = get_all_robinhood_asset_addresses(snapshot_from_args(args))
         
         # Save comprehensive results
         from datetime import datetime
@@ -3,35 +3,29 @@
 Get Deposit Addresses for Trading Balance Wallets
 
 Retrieves deposit addresses for all "Trading Balance" wallets.
+
+Usage:
+  python3 get_trading_balance_addresses.py
+  python3 get_trading_balance_addresses.py --offline   # from the shared wallet snapshot only
 """
 
-import os
+import argparse
 import time
-from pathlib import Path
 
-from dotenv import load_dotenv
-from prime_api_client import CoinbasePrimeClient
+from prime_config import create_client
+from wallet_snapshot import add_snapshot_arguments, snapshot_from_args
 
 
-def get_trading_balance_addresses():
+def get_trading_balance_addresses(snapshot=None):
     """Get deposit addresses for all Trading Balance wallets"""
     
     print("=" * 100)
     print("Coinbase Prime - Trading Balance Wallet Deposit Addresses")
     print("=" * 100)
     
-    # Load credentials
-    env_path = Path(__file__).parent.parent / ".env.local"
-    load_dotenv(env_path)
-    
-    access_key = os.getenv("COINBASE_PRIME_ACCESS_KEY") or os.getenv("COINBASE_PRIME_API_KEY")
-    signing_key = os.getenv("COINBASE_PRIME_SIGNING_KEY")
-    passphrase = os.getenv("COINBASE_PRIME_PASSPHRASE")
-    portfolio_id = os.getenv("COINBASE_PRIME_PORTFOLIO_ID")
-    
     # Initialize client
     print(f"\n[1/3] Initializing API client...")
-    client = CoinbasePrimeClient(access_key, signing_key, passphrase, portfolio_id)
+    client = create_client(validate=False, snapshot=snapshot)
     print("✅ Client initialized")
     
     # Get first page of wallets
@@ -75,8 +69,9 @@ def get_trading_balance_addresses():
                 "memo": memo
             })
             
-            # Small delay to avoid rate limiting
-            time.sleep(0.5)
+            # Small delay to avoid rate limiting (not needed for snapshot answers)
+            if not client.from_snapshot:
+                time.sleep(0.5)
             
         except Exception as e:
             print(f"  ❌ Failed: {e}")
@@ -95,13 +90,19 @@ def get_trading_balance_addresses():
     
     print("\n" + "=" * 100)
     print(f"Retrieved {len(results)} deposit addresses successfully!")
+    if snapshot:
+        print(f"📦 {snapshot.summary()}")
     print("=" * 100)
     
     return results
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Deposit addresses of Trading Balance wallets (first page)")
+    add_snapshot_arguments(parser)
+    args = parser.parse_args()
+
     try:
-        results = get_trading_balance_addresses()
+        results = get_trading_balance_addresses(snapshot_from_args(args))
         
         # Optionally save to file
         import json
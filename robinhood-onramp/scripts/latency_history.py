@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Resolution Latency History and LPT Scheduling
+
+Keeps an exponentially weighted average of Prime call latency per symbol and
+per endpoint across runs, and uses it to schedule parallel address resolution
+longest-processing-time first: the historically slowest symbols start first,
+so no slow symbol is left to run alone at the end of the pool.
+
+Prediction for one symbol = calls × (symbol latency, else endpoint latency,
+else DEFAULT_LATENCY) + calls × pause. LPT on N workers is within 4/3 of the
+optimal makespan; the lower bound max(longest job, total / N) is reported next
+to the predicted and the actual makespan.
+
+Usage:
+  python3 generate_prime_wallets.py --all-wallets --workers 4   # records + schedules
+  python3 latency_history.py                                    # slowest symbols, recent runs
+  python3 latency_history.py --workers 4 --pause 0.05           # predicted schedule
+
+  from latency_history import LatencyHistory, lpt_schedule
+  history = LatencyHistory.load()
+  history.observe("symbol", "BTC", 0.42)
+  order, makespan = lpt_schedule({"BTC": 1.2, "ETH": 0.4}, workers=2)
+  history.save()
+"""
+
+import argparse
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+DEFAULT_HISTORY_PATH = Path(__file__).parent / "resolution-latency.json"
+DEFAULT_LATENCY = 0.25  # seconds per call before anything has been observed
+ALPHA = 0.3  # EWMA weight of the newest observation
+MAX_RUNS = 50
+
+
+class LatencyHistory:
+    """Per-symbol and per-endpoint EWMA call latency, persisted as JSON"""
+
+    def __init__(self, path: Path = DEFAULT_HISTORY_PATH, data: Optional[Dict] = None):
+        self.path = Path(path)
+        data = data or {}
+        self.symbols: Dict[str, Dict] = data.get("symbols", {})
+        self.endpoints: Dict[str, Dict] = data.get("endpoints", {})
+        self.runs: List[Dict] = data.get("runs", [])
+        self.lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path: Path = DEFAULT_HISTORY_PATH) -> "LatencyHistory":
+        """History from path (empty when missing or unreadable)"""
+        try:
+            with open(path) as f:
+                return cls(path, json.load(f))
+        except (OSError, ValueError):
+            return cls(path)
+
+    def observe(self, kind: str, key: str, seconds: float) -> None:
+        """Fold one call latency into the 'symbol' or 'endpoint' average"""
+        table = self.symbols if kind == "symbol" else self.endpoints
+        with self.lock:
+            entry = table.get(key)
+            if entry is None:
+                table[key] = {"ewma": seconds, "count": 1}
+            else:
+                entry["ewma"] = ALPHA * seconds + (1 - ALPHA) * entry["ewma"]
+                entry["count"] += 1
+
+    def call_latency(self, symbol: str, endpoint: str = "deposit_instructions") -> float:
+        """Expected seconds per call for a symbol"""
+        entry = self.symbols.get(symbol) or self.endpoints.get(endpoint)
+        return entry["ewma"] if entry else DEFAULT_LATENCY
+
+    def predict(self, symbol: str, calls: int, pause: float = 0.0) -> float:
+        """Expected seconds to resolve a symbol with this many deposit_instructions calls"""
+        return calls * (self.call_latency(symbol) + pause)
+
+    def record_run(self, **run) -> None:
+        """Keep a summary of a scheduled run (predicted vs actual makespan)"""
+        with self.lock:
+            self.runs = (self.runs + [run])[-MAX_RUNS:]
+
+    def save(self) -> None:
+        """Write atomically (temp file + rename)"""
+        with self.lock:
+            data = {"symbols": self.symbols, "endpoints": self.endpoints, "runs": self.runs}
+        tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(data, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+
+def lpt_schedule(durations: Dict[str, float], workers: int,
+                 priority: Optional[Dict[str, float]] = None) -> Tuple[List[str], float]:
+    """
+    Longest-processing-time-first order and its predicted makespan
+
+    Jobs are dispatched in the returned order to whichever worker frees up
+    first (what a ThreadPoolExecutor does). With priority weights, higher
+    weights still go first and LPT orders jobs within each weight.
+    """
+    priority = priority or {}
+    order = sorted(durations, key=lambda key: (-priority.get(key, 0), -durations[key], key))
+    return order, simulate_makespan(order, durations, workers)
+
+
+def simulate_makespan(order: List[str], durations: Dict[str, float], workers: int) -> float:
+    """Makespan of dispatching jobs in order to the earliest-free of N workers"""
+    import heapq
+
+    finish = [0.0] * max(1, workers)
+    for key in order:
+        heapq.heappush(finish, heapq.heappop(finish) + durations[key])
+    return max(finish)
+
+
+def makespan_lower_bound(durations: Dict[str, float], workers: int) -> float:
+    """No schedule can beat the longest job or an even split of the total work"""
+    if not durations:
+        return 0.0
+    return max(max(durations.values()), sum(durations.values()) / max(1, workers))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Show resolution latency history and the LPT schedule")
+    parser.add_argument("--path", type=Path, default=DEFAULT_HISTORY_PATH, help="History file")
+    parser.add_argument("--workers", type=int, default=4, help="Workers to plan for")
+    parser.add_argument("--pause", type=float, default=0.05, help="Pause after each call (seconds)")
+    parser.add_argument("--top", type=int, default=10, help="Slowest symbols to show")
+    args = parser.parse_args()
+
+    from generate_prime_wallets import ROBINHOOD_ASSETS
+
+    history = LatencyHistory.load(args.path)
+
+    print("=" * 100)
+    print("Resolution Latency History")
+    print("=" * 100)
+    if not history.symbols:
+        print(f"⚠️  No history yet at {args.path} (run generate_prime_wallets.py first)")
+
+    print("\nEndpoints:")
+    for endpoint, entry in sorted(history.endpoints.items()):
+        print(f"  {endpoint:24} {entry['ewma'] * 1000:8.1f} ms  ({entry['count']} calls)")
+
+    print("\nSlowest symbols (per call):")
+    slowest = sorted(history.symbols.items(), key=lambda item: -item[1]["ewma"])[:args.top]
+    for symbol, entry in slowest:
+        print(f"  {symbol:24} {entry['ewma'] * 1000:8.1f} ms  ({entry['count']} calls)")
+
+    durations = {symbol: history.predict(symbol, 1, args.pause) for symbol in ROBINHOOD_ASSETS}
+    order, predicted = lpt_schedule(durations, args.workers)
+    alphabetical = simulate_makespan(sorted(durations), durations, args.workers)
+    print(f"\nOne call per symbol on {args.workers} workers:")
+    print(f"  LPT order:         {', '.join(order[:8])}{', ...' if len(order) > 8 else ''}")
+    print(f"  LPT makespan:      {predicted:.2f}s")
+    print(f"  Alphabetical:      {alphabetical:.2f}s")
+    print(f"  Lower bound:       {makespan_lower_bound(durations, args.workers):.2f}s")
+
+    if history.runs:
+        print("\nRecent runs:")
+        for run in history.runs[-5:]:
+            print(f"  {run.get('at', '?'):20} {run.get('workers', '?'):>2} workers  "
+                  f"predicted {run['predicted_s']:6.2f}s  actual {run['actual_s']:6.2f}s  "
+                  f"bound {run['lower_bound_s']:6.2f}s")
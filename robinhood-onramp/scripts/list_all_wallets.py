@@ -3,33 +3,39 @@
 List All Coinbase Prime Wallets
 
 Displays all wallets in the portfolio with detailed information.
+
+Usage:
+  python3 list_all_wallets.py                          # tables only
+  python3 list_all_wallets.py --csv                    # tables + timestamped CSV
+  python3 list_all_wallets.py --export wallets.parquet # stream pages to a file, no tables
+  python3 list_all_wallets.py --offline                # from the shared wallet snapshot only
+
+--csv and --export use the fixed schema in wallet_export.py (WALLET_FIELDS),
+so wallets with different field sets never break the header. --export writes
+each page as it arrives (.csv, .parquet, .arrow, .npy) without holding the
+portfolio in memory.
+
+The listing is served from the shared wallet snapshot (wallet_snapshot.py)
+while it is younger than --max-age; a live crawl refreshes it.
 """
 
-import os
+import argparse
 from pathlib import Path
 
-from dotenv import load_dotenv
-from prime_api_client import CoinbasePrimeClient
+from prime_config import create_client
+from wallet_export import export_wallets, normalize_wallet, open_writer
+from wallet_snapshot import add_snapshot_arguments, snapshot_from_args
 
 
-def list_all_wallets():
+def list_all_wallets(snapshot=None):
     """List all wallets with detailed information"""
     
     print("=" * 100)
     print("Coinbase Prime - All Wallets")
     print("=" * 100)
     
-    # Load credentials
-    env_path = Path(__file__).parent.parent / ".env.local"
-    load_dotenv(env_path)
-    
-    access_key = os.getenv("COINBASE_PRIME_ACCESS_KEY") or os.getenv("COINBASE_PRIME_API_KEY")
-    signing_key = os.getenv("COINBASE_PRIME_SIGNING_KEY")
-    passphrase = os.getenv("COINBASE_PRIME_PASSPHRASE")
-    portfolio_id = os.getenv("COINBASE_PRIME_PORTFOLIO_ID")
-    
-    # Initialize client
-    client = CoinbasePrimeClient(access_key, signing_key, passphrase, portfolio_id)
+    client = create_client(validate=False, snapshot=snapshot)
+    portfolio_id = client.portfolio_id
     
     # Get all wallets (with pagination support)
     all_wallets = []
@@ -124,26 +130,37 @@ def list_all_wallets():
     print(f"\n{'=' * 100}")
     print("Export Complete")
     print(f"{'=' * 100}\n")
+    if snapshot:
+        print(f"📦 {snapshot.summary()}\n")
     
     # Return data for potential CSV export
     return all_wallets
 
 if __name__ == "__main__":
-    wallets = list_all_wallets()
+    parser = argparse.ArgumentParser(description="List all Coinbase Prime wallets")
+    parser.add_argument("--csv", action="store_true", help="Also save a timestamped CSV")
+    parser.add_argument("--export", type=Path, metavar="PATH",
+                        help="Stream wallets to PATH (.csv, .parquet, .arrow, .npy) without printing tables")
+    parser.add_argument("--format", help="Export format when PATH has no known extension")
+    add_snapshot_arguments(parser)
+    args = parser.parse_args()
+    snapshot = snapshot_from_args(args)
+
+    if args.export:
+        count = export_wallets(create_client(validate=False, snapshot=snapshot), args.export, args.format)
+        print(f"✅ Exported {count} wallets to: {args.export}")
+        raise SystemExit(0)
+
+    wallets = list_all_wallets(snapshot)
     
     # Optionally save to CSV
-    import sys
-    if len(sys.argv) > 1 and sys.argv[1] == "--csv":
-        import csv
+    if args.csv:
         from datetime import datetime
         
         filename = f"coinbase_prime_wallets_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
         
-        with open(filename, 'w', newline='') as f:
-            if wallets:
-                writer = csv.DictWriter(f, fieldnames=wallets[0].keys())
-                writer.writeheader()
-                writer.writerows(wallets)
+        writer = open_writer(Path(filename), "csv")
+        writer.write_page([normalize_wallet(w) for w in wallets])
+        writer.close()
         
         print(f"✅ Saved to: {filename}")
-
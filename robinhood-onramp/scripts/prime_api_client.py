@@ -9,20 +9,397 @@ import hashlib
 import hmac
 import json
 import logging
+import math
+import threading
 import time
-from typing import Dict, Optional, Tuple
+from collections import deque
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Tuple, Union
 
-import requests
+if TYPE_CHECKING:
+    import requests
+
+    from prime_cassette import PrimeCassette
+    from wallet_snapshot import WalletSnapshot
 
 logger = logging.getLogger(__name__)
 
+# (connect, read) seconds; without a timeout requests can wait forever
+DEFAULT_TIMEOUT = (5.0, 30.0)
+
+# Hedging: fire a second GET once the first has taken longer than the
+# endpoint's observed p95, as long as hedges stay within HEDGE_BUDGET of all
+# requests. Until HEDGE_MIN_SAMPLES latencies are known there is no p95.
+HEDGE_BUDGET = 0.05
+HEDGE_MIN_SAMPLES = 20
+# Calling threads assumed when sizing the hedge pool without a limiter or an
+# explicit hedge_concurrency; each hedged GET holds up to two pool workers
+HEDGE_CONCURRENCY = 16
+LATENCY_WINDOW = 200
+
+# AimdLimiter latency baseline: minimum healthy latency over this many seconds,
+# so a lasting latency change becomes the new baseline once older samples age out
+BASE_LATENCY_WINDOW_S = 10.0
+
+# Priority lanes (see PriorityLanes and CoinbasePrimeClient.lane)
+INTERACTIVE = "interactive"
+BULK = "bulk"
+
+
+class _InFlight:
+    """One upstream GET whose outcome is shared by every caller waiting on it"""
+
+    __slots__ = ("done", "response", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.response: Optional["requests.Response"] = None
+        self.error: Optional[BaseException] = None
+
+
+class _EndpointLatency:
+    """Recent request latencies per endpoint (last LATENCY_WINDOW) for the hedging delay"""
+
+    def __init__(self):
+        self.samples: Dict[str, deque] = {}
+        self.lock = threading.Lock()
+
+    def add(self, endpoint: str, seconds: float) -> None:
+        with self.lock:
+            self.samples.setdefault(endpoint, deque(maxlen=LATENCY_WINDOW)).append(seconds)
+
+    def percentile(self, endpoint: str, pct: float) -> Optional[float]:
+        """Latency percentile, or None with fewer than HEDGE_MIN_SAMPLES samples"""
+        with self.lock:
+            samples = sorted(self.samples.get(endpoint, ()))
+        if len(samples) < HEDGE_MIN_SAMPLES:
+            return None
+        return samples[min(len(samples) - 1, int(pct / 100 * len(samples)))]
+
+
+class AimdLimiter:
+    """
+    Adaptive cap on in-flight requests (additive increase, multiplicative decrease)
+
+    Every healthy response grows the window by 1/window (about +1 per round
+    trip of the whole window); a 429, 5xx, transport error or latency spike
+    (spike_factor × the base latency) cuts it by `decrease`. Only
+    requests sent after the last cut can cut again, so one burst of 429s counts
+    as a single congestion event. Share one limiter between clients that share
+    an API key.
+
+    The base latency is the minimum latency of healthy responses (spikes
+    included) over the last base_window_s seconds. A brief spike does not move
+    it, but if latency rises and stays up the minimum follows within that
+    window. Otherwise every response would count as a spike and pin the window
+    at min_window.
+
+    A window below 1 paces requests instead: one at a time, sent at most every
+    latency / window seconds. A rate limit can be below what a single in-flight
+    request produces, and 429s come back fast.
+
+    Requests in the interactive lane are admitted before any waiting bulk
+    request (see PriorityLanes).
+
+    Metrics: window (current cap), in_flight, snapshot()
+    """
+
+    def __init__(self, initial: float = 4, min_window: float = 0.05, max_window: float = 64,
+                 decrease: float = 0.5, spike_factor: float = 3.0, base_window_s: float = BASE_LATENCY_WINDOW_S):
+        self.window = float(min(initial, max_window))
+        self.min_window = min_window
+        self.max_window = max_window
+        self.decrease = decrease
+        self.spike_factor = spike_factor
+        self.in_flight = 0
+        self.base_latency: Optional[float] = None
+        self.base_window_s = base_window_s
+        self._latency_samples: deque = deque()  # (time, latency), latencies ascending: windowed minimum
+        self.last_decrease = 0.0
+        self.next_send = 0.0
+        self.increases = 0
+        self.decreases = 0
+        self.interactive_waiting = 0
+        self.cond = threading.Condition()
+
+    def acquire(self, lane: str = BULK) -> float:
+        """Wait for a free slot; returns the send time to pass to release()"""
+        with self.cond:
+            if lane == INTERACTIVE:
+                self.interactive_waiting += 1
+            try:
+                while True:
+                    if self.in_flight >= max(1, int(self.window)) or (lane != INTERACTIVE and self.interactive_waiting):
+                        self.cond.wait()
+                        continue
+                    delay = self.next_send - time.perf_counter() if self.window < 1 else 0.0
+                    if delay <= 0:
+                        break
+                    self.cond.wait(delay)
+            finally:
+                if lane == INTERACTIVE:
+                    self.interactive_waiting -= 1
+            self.in_flight += 1
+            now = time.perf_counter()
+            if self.window < 1:
+                self.next_send = now + (self.base_latency or 0.0) / self.window
+            return now
+
+    def release(self, sent_at: float, status: Optional[int], latency: float) -> None:
+        """Record the outcome (status None = transport error or timeout) and adjust the window"""
+        with self.cond:
+            self.in_flight -= 1
+            congested = status is None or status == 429 or status >= 500
+            spike = self.base_latency is not None and latency > self.spike_factor * self.base_latency
+
+            if congested or spike:
+                if sent_at >= self.last_decrease:
+                    self.window = max(self.min_window, self.window * self.decrease)
+                    self.last_decrease = time.perf_counter()
+                    self.decreases += 1
+            elif self.window < self.max_window:
+                step = 1 / self.window if self.window >= 1 else 0.1
+                self.window = min(self.max_window, self.window + step)
+                self.increases += 1
+            if not congested:
+                self._observe_latency(time.perf_counter(), latency)
+            self.cond.notify_all()
+
+    def _observe_latency(self, now: float, latency: float) -> None:
+        """Add a healthy latency sample; base_latency = minimum over the last base_window_s"""
+        samples = self._latency_samples
+        while samples and samples[-1][1] >= latency:
+            samples.pop()
+        samples.append((now, latency))
+        while samples[0][0] < now - self.base_window_s:
+            samples.popleft()
+        self.base_latency = samples[0][1]
+
+    def snapshot(self) -> Dict:
+        with self.cond:
+            return {
+                "window": round(self.window, 2),
+                "in_flight": self.in_flight,
+                "base_latency_ms": round(self.base_latency * 1000, 1) if self.base_latency else None,
+                "increases": self.increases,
+                "decreases": self.decreases,
+            }
+
+
+class PriorityLanes:
+    """
+    Client-side rate scheduler with an interactive and a bulk lane
+
+    Two token buckets: every request takes a token from the shared bucket
+    (rate req/s); bulk requests also need one from the bulk bucket, which
+    refills at (1 - reserve) × rate. Bulk traffic can therefore never use the
+    reserved share, so a one-off interactive lookup finds capacity even while
+    a full crawl saturates the limit. Waiting interactive requests are served
+    before waiting bulk requests.
+
+    Set rate a little below the API key's limit; Prime itself does not know
+    about lanes. Metrics: snapshot() (sent and wait time per lane).
+    """
+
+    def __init__(self, rate: float, reserve: float = 0.2, burst: Optional[float] = None):
+        if rate <= 0 or not 0 <= reserve < 1:
+            raise ValueError("PriorityLanes needs rate > 0 and 0 <= reserve < 1")
+        self.rate = rate
+        self.reserve = reserve
+        self.burst = burst or max(1.0, rate / 10)
+        self.tokens = self.burst
+        self.bulk_tokens = max(1.0, self.burst * (1 - reserve))
+        self.updated = time.perf_counter()
+        self.interactive_waiting = 0
+        self.sent = {INTERACTIVE: 0, BULK: 0}
+        self.waited = {INTERACTIVE: 0.0, BULK: 0.0}
+        self.max_wait = {INTERACTIVE: 0.0, BULK: 0.0}
+        self.cond = threading.Condition()
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self.updated
+        self.updated = now
+        self.tokens = min(self.burst, self.tokens + elapsed * self.rate)
+        self.bulk_tokens = min(max(1.0, self.burst * (1 - self.reserve)),
+                               self.bulk_tokens + elapsed * self.rate * (1 - self.reserve))
+
+    def acquire(self, lane: str = BULK) -> None:
+        """Block until the lane may send one request"""
+        interactive = lane == INTERACTIVE
+        started = time.perf_counter()
+        with self.cond:
+            if interactive:
+                self.interactive_waiting += 1
+            try:
+                while True:
+                    now = time.perf_counter()
+                    self._refill(now)
+                    if interactive and self.tokens >= 1:
+                        break
+                    if not interactive and not self.interactive_waiting and self.tokens >= 1 and self.bulk_tokens >= 1:
+                        self.bulk_tokens -= 1
+                        break
+                    need = max(1 - self.tokens, 0) / self.rate
+                    if not interactive:
+                        need = max(need, (1 - self.bulk_tokens) / (self.rate * (1 - self.reserve)))
+                    self.cond.wait(max(need, 0.001))
+            finally:
+                if interactive:
+                    self.interactive_waiting -= 1
+            self.tokens -= 1
+            waited = time.perf_counter() - started
+            self.sent[lane] += 1
+            self.waited[lane] += waited
+            self.max_wait[lane] = max(self.max_wait[lane], waited)
+            self.cond.notify_all()
+
+    def snapshot(self) -> Dict:
+        with self.cond:
+            return {lane: {
+                "sent": self.sent[lane],
+                "mean_wait_ms": round(1000 * self.waited[lane] / self.sent[lane], 1) if self.sent[lane] else None,
+                "max_wait_ms": round(1000 * self.max_wait[lane], 1),
+            } for lane in (INTERACTIVE, BULK)}
+
+
+class ApiKey:
+    """One Prime API key triple plus its load, health and observed rate limit"""
+
+    def __init__(self, access_key: str, signing_key: str, passphrase: str, label: str = ""):
+        self.access_key = access_key
+        self.signing_key = signing_key
+        self.passphrase = passphrase
+        self.label = label or f"...{access_key[-4:]}"
+        self.in_flight = 0
+        self.requests = 0
+        self.throttled = 0
+        self.unauthorized = 0
+        self.ejected_until = 0.0
+        self.backoff = 0.0
+        self.limit_estimate: Optional[float] = None  # req/s at which 429s started
+        self.recent: deque = deque()  # send times within the last second
+
+    def rate(self, now: float) -> float:
+        """Requests sent in the last second"""
+        while self.recent and now - self.recent[0] > 1.0:
+            self.recent.popleft()
+        return float(len(self.recent))
+
+
+class CredentialPool:
+    """
+    Several API keys for one portfolio; Prime rate limits are per key
+
+    Each request is signed with a key picked round-robin or least-loaded
+    (fewest in flight, then fewest sent in the last second). A 429 takes the
+    key out of rotation for a backoff that doubles from 0.5s up to 60s; a 401/403 takes
+    it out for UNAUTHORIZED_EJECT_S. When every key is out, the one back
+    soonest is used (after waiting up to MAX_WAIT_S).
+
+    Headroom per key is the observed 429 rate minus the current rate.
+    """
+
+    UNAUTHORIZED_EJECT_S = 600.0
+    MIN_BACKOFF_S = 0.5
+    MAX_BACKOFF_S = 60.0
+    MAX_WAIT_S = 5.0
+
+    def __init__(self, keys: List[ApiKey], strategy: str = "least_loaded"):
+        if not keys:
+            raise ValueError("CredentialPool needs at least one key")
+        if strategy not in ("least_loaded", "round_robin"):
+            raise ValueError(f"Unknown key strategy: {strategy}")
+        self.keys = keys
+        self.strategy = strategy
+        self.lock = threading.Lock()
+        self._next = 0
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def live_keys(self) -> int:
+        """Keys currently in rotation"""
+        now = time.monotonic()
+        return sum(1 for key in self.keys if key.ejected_until <= now)
+
+    def acquire(self) -> ApiKey:
+        """Pick a key for one request"""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                live = [key for key in self.keys if key.ejected_until <= now]
+                if live:
+                    if self.strategy == "round_robin":
+                        key = live[self._next % len(live)]
+                        self._next += 1
+                    else:
+                        key = min(live, key=lambda k: (k.in_flight, k.rate(now)))
+                    key.in_flight += 1
+                    key.requests += 1
+                    key.recent.append(now)
+                    return key
+                soonest = min(self.keys, key=lambda k: k.ejected_until)
+                wait = soonest.ejected_until - now
+                if wait > self.MAX_WAIT_S:
+                    logger.warning(f"All {len(self.keys)} API keys are out of rotation - using {soonest.label}")
+                    soonest.in_flight += 1
+                    soonest.requests += 1
+                    soonest.recent.append(now)
+                    return soonest
+            time.sleep(wait)
+
+    def release(self, key: ApiKey, status: Optional[int]) -> None:
+        """Record the response status for the key (None = transport error)"""
+        with self.lock:
+            now = time.monotonic()
+            key.in_flight -= 1
+            if status in (401, 403):
+                key.unauthorized += 1
+                key.ejected_until = now + self.UNAUTHORIZED_EJECT_S
+                logger.error(f"API key {key.label} got {status} - out of rotation for "
+                             f"{self.UNAUTHORIZED_EJECT_S:.0f}s")
+            elif status == 429:
+                key.throttled += 1
+                if key.ejected_until > now:
+                    return  # Sent before the key was ejected - one backoff step per ejection
+                rate = key.rate(now)
+                key.limit_estimate = rate if key.limit_estimate is None else 0.7 * key.limit_estimate + 0.3 * rate
+                key.backoff = min(self.MAX_BACKOFF_S, key.backoff * 2 if key.backoff else self.MIN_BACKOFF_S)
+                key.ejected_until = now + key.backoff
+                logger.info(f"API key {key.label} throttled - out of rotation for {key.backoff:.1f}s")
+            elif status is not None and status < 400:
+                key.backoff = 0.0
+
+    def snapshot(self) -> List[Dict]:
+        """Per-key health and load"""
+        with self.lock:
+            now = time.monotonic()
+            return [{
+                "key": key.label,
+                "state": "active" if key.ejected_until <= now else "ejected",
+                "back_in_s": round(max(0.0, key.ejected_until - now), 1),
+                "in_flight": key.in_flight,
+                "requests": key.requests,
+                "throttled": key.throttled,
+                "unauthorized": key.unauthorized,
+                "rate": key.rate(now),
+                "headroom": round(key.limit_estimate - key.rate(now), 1) if key.limit_estimate else None,
+            } for key in self.keys]
+
 
 class CoinbasePrimeClient:
     """Coinbase Prime API client with authentication"""
 
     BASE_URL = "https://api.prime.coinbase.com"
 
-    def __init__(self, access_key: str, signing_key: str, passphrase: str, portfolio_id: str):
+    def __init__(self, access_key: str, signing_key: str, passphrase: str, portfolio_id: str,
+                 cassette: Optional["PrimeCassette"] = None, base_url: Optional[str] = None,
+                 coalesce: bool = True, timeout: Union[float, Tuple[float, float]] = DEFAULT_TIMEOUT,
+                 hedge: bool = False, hedge_budget: float = HEDGE_BUDGET,
+                 hedge_concurrency: Optional[int] = None,
+                 limiter: Optional[AimdLimiter] = None, credentials: Optional[CredentialPool] = None,
+                 lanes: Optional[PriorityLanes] = None, default_lane: str = INTERACTIVE,
+                 snapshot: Optional["WalletSnapshot"] = None):
         """Initialize Coinbase Prime API client
         
         Args:
@@ -30,15 +407,89 @@ class CoinbasePrimeClient:
             signing_key: Your API Signing Key (secret) from Prime UI
             passphrase: Your API Passphrase from Prime UI
             portfolio_id: Your Portfolio ID from Prime UI
+            cassette: Optional cassette to record responses into or replay
+                      responses from (see prime_cassette.py)
+            base_url: Override the API host (e.g. a local stub server)
+            coalesce: Share one upstream call between threads issuing the
+                      same GET at the same time (see _request)
+            timeout: Per-request timeout in seconds, or (connect, read)
+            hedge: Send a second copy of a GET that is slower than the
+                   endpoint's p95 and use whichever answers first (see _send)
+            hedge_budget: Maximum hedged requests as a fraction of all requests
+            hedge_concurrency: Most threads calling the client at once; the
+                               hedge pool gets two workers per caller
+                               (default: the limiter's max_window, else
+                               HEDGE_CONCURRENCY)
+            limiter: Optional AimdLimiter gating in-flight requests; its
+                     window adapts to Prime's throttling and latency
+            credentials: Optional CredentialPool of keys for this portfolio;
+                         each request is signed with a key from the pool
+                         (access_key/signing_key/passphrase are then ignored)
+            lanes: Optional PriorityLanes reserving part of the request rate
+                   for interactive lookups
+            default_lane: Lane of requests made outside a lane() block
+            snapshot: Optional WalletSnapshot that serves the listing and
+                      deposit addresses while fresh and records what is
+                      fetched (see wallet_snapshot.py)
         """
+        if credentials:
+            primary = credentials.keys[0]
+            access_key, signing_key, passphrase = primary.access_key, primary.signing_key, primary.passphrase
         self.access_key = access_key
         self.signing_key = signing_key
         self.passphrase = passphrase
+        self.credentials = credentials
         self.portfolio_id = portfolio_id
+        self.cassette = cassette
+        self.base_url = base_url or self.BASE_URL
+        self.coalesce = coalesce
+        self.coalesced = 0  # GETs answered by another caller's in-flight request
+        self._inflight: Dict[Tuple[str, str, str], _InFlight] = {}
+        self._inflight_lock = threading.Lock()
+        self.timeout = timeout
+        self.hedge = hedge
+        self.hedge_budget = hedge_budget
+        self.hedge_concurrency = hedge_concurrency
+        self.latency = _EndpointLatency()
+        self.requests_sent = 0
+        self.hedges_sent = 0
+        self.hedges_won = 0  # Hedged requests that answered before the original
+        self._hedge_pool = None
+        self.limiter = limiter
+        self.lanes = lanes
+        self.default_lane = default_lane
+        self._lane = threading.local()
+        self.snapshot = snapshot
+        self._served = threading.local()
         
         logger.info(f"Initialized Prime client for portfolio: {portfolio_id}")
+        if cassette:
+            logger.info(f"Cassette {cassette.mode} mode: {cassette.path}")
+
+    @property
+    def from_snapshot(self) -> bool:
+        """Whether this thread's last listing/deposit call was answered by the snapshot"""
+        return getattr(self._served, "value", False)
 
-    def _generate_signature(self, timestamp: str, method: str, path: str, body: str = "") -> str:
+    @contextmanager
+    def lane(self, name: str) -> Iterator[None]:
+        """Send this thread's requests in the given lane (INTERACTIVE or BULK)
+
+        Crawls wrap their worker bodies in client.lane(BULK); everything else
+        defaults to default_lane.
+        """
+        previous = getattr(self._lane, "name", None)
+        self._lane.name = name
+        try:
+            yield
+        finally:
+            self._lane.name = previous
+
+    def current_lane(self) -> str:
+        return getattr(self._lane, "name", None) or self.default_lane
+
+    def _generate_signature(self, timestamp: str, method: str, path: str, body: str = "",
+                            signing_key: Optional[str] = None) -> str:
         """Generate X-CB-ACCESS-SIGNATURE header
         
         CRITICAL: Returns base64-encoded HMAC-SHA256 signature (NOT hex!)
@@ -48,29 +499,182 @@ class CoinbasePrimeClient:
         
         # Create HMAC signature and encode to base64 (NOT hexdigest!)
         signature_bytes = hmac.new(
-            self.signing_key.encode('utf-8'),
+            (signing_key or self.signing_key).encode('utf-8'),
             message.encode('utf-8'),
             hashlib.sha256
         ).digest()
         
         return base64.b64encode(signature_bytes).decode('utf-8')
 
-    def _get_headers(self, method: str, path: str, body: str = "") -> Dict[str, str]:
-        """Generate authentication headers for API request
+    def _get_headers(self, method: str, path: str, body: str = "", key: Optional[ApiKey] = None) -> Dict[str, str]:
+        """Generate authentication headers for API request (signed with key if given)
         
         Reference: https://docs.cdp.coinbase.com/prime/docs/rest-auth
         """
         timestamp = str(int(time.time()))
-        signature = self._generate_signature(timestamp, method, path, body)
+        signature = self._generate_signature(timestamp, method, path, body, key.signing_key if key else None)
 
         return {
-            "X-CB-ACCESS-KEY": self.access_key,
-            "X-CB-ACCESS-PASSPHRASE": self.passphrase,
+            "X-CB-ACCESS-KEY": key.access_key if key else self.access_key,
+            "X-CB-ACCESS-PASSPHRASE": key.passphrase if key else self.passphrase,
             "X-CB-ACCESS-SIGNATURE": signature,
             "X-CB-ACCESS-TIMESTAMP": timestamp,
             "Content-Type": "application/json"
         }
 
+    def _request(self, method: str, base_path: str, query: str = "", body: str = "") -> "requests.Response":
+        """Send a signed request (or serve it from the cassette)
+        
+        Important: Signature uses base path WITHOUT query parameters
+        """
+        if self.cassette and self.cassette.is_replay:
+            return self.cassette.play(method, base_path, query, self.portfolio_id)
+
+        if method != "GET" or not self.coalesce:
+            return self._send(method, base_path, query, body)
+
+        # Single-flight: identical GETs already in flight wait for that call
+        # instead of spending another signed request against the rate limit
+        key = (method, base_path, query)
+        with self._inflight_lock:
+            call = self._inflight.get(key)
+            leader = call is None
+            if leader:
+                call = self._inflight[key] = _InFlight()
+
+        if not leader:
+            call.done.wait()
+            with self._inflight_lock:
+                self.coalesced += 1
+            logger.debug(f"Coalesced {method} {base_path} with an in-flight request")
+            if call.error is not None:
+                raise call.error
+            return call.response
+
+        try:
+            call.response = self._send(method, base_path, query, body)
+            return call.response
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._inflight_lock:
+                del self._inflight[key]
+            call.done.set()
+
+    def _send(self, method: str, base_path: str, query: str = "", body: str = "") -> "requests.Response":
+        """Send one signed request upstream (recording it if a cassette is set)
+        
+        With hedging on, a GET still unanswered after the endpoint's observed
+        p95 gets a second, identical request (budget permitting); the first
+        successful response wins and the other is discarded.
+        """
+        endpoint = base_path.rstrip("/").rsplit("/", 1)[-1]
+        delay = self.latency.percentile(endpoint, 95) if self.hedge and method == "GET" else None
+        lane = self.current_lane()
+
+        started = time.perf_counter()
+        if delay is None:
+            response = self._send_once(method, base_path, query, body, lane)
+        else:
+            response = self._send_hedged(method, base_path, query, body, delay, lane)
+        latency = time.perf_counter() - started
+
+        if self.cassette:
+            self.cassette.add(method, base_path, query, response, latency, self.portfolio_id)
+
+        return response
+
+    def _send_once(self, method: str, base_path: str, query: str = "", body: str = "",
+                   lane: str = INTERACTIVE) -> "requests.Response":
+        """One signed HTTP request with the client timeout; feeds the endpoint latency window"""
+        # Imported here: requests accounts for most of this module's import time,
+        # and --help / offline / replay runs never need it
+        import requests
+
+        url = f"{self.base_url}{base_path}?{query}" if query else f"{self.base_url}{base_path}"
+        if self.lanes:
+            self.lanes.acquire(lane)
+        sent_at = self.limiter.acquire(lane) if self.limiter else None
+        key = self.credentials.acquire() if self.credentials else None
+        headers = self._get_headers(method, base_path, body, key)
+
+        with self._inflight_lock:
+            self.requests_sent += 1
+        started = time.perf_counter()
+        status = None
+        try:
+            response = requests.request(method, url, headers=headers, data=body or None, timeout=self.timeout)
+            status = response.status_code
+        finally:
+            latency = time.perf_counter() - started
+            if key:
+                self.credentials.release(key, status)
+            if self.limiter:
+                self.limiter.release(sent_at, status, latency)
+        if status in (401, 403) and key and self.credentials.live_keys():
+            # The key is now out of rotation; the request itself may succeed on another one
+            return self._send_once(method, base_path, query, body, lane)
+        if status < 400:
+            self.latency.add(base_path.rstrip("/").rsplit("/", 1)[-1], latency)
+        return response
+
+    def _send_hedged(self, method: str, base_path: str, query: str, body: str,
+                     delay: float, lane: str = INTERACTIVE) -> "requests.Response":
+        """Original request, plus a hedge after delay seconds if the budget allows
+
+        The first 2xx response wins. An error response (429, 5xx, ...) or an
+        exception from one request waits for the other; only when neither
+        succeeds is the first error response returned (or the exception
+        raised, if both raised).
+        """
+        from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+        with self._inflight_lock:
+            if self._hedge_pool is None:
+                # An original and its hedge per caller: a smaller pool queues
+                # originals behind each other, which inflates their latency
+                # past the p95 and fires hedges that only add load
+                callers = self.hedge_concurrency or (
+                    math.ceil(self.limiter.max_window) if self.limiter else HEDGE_CONCURRENCY)
+                self._hedge_pool = ThreadPoolExecutor(max_workers=2 * callers, thread_name_prefix="prime-hedge")
+        send = lambda: self._send_once(method, base_path, query, body, lane)
+
+        original = self._hedge_pool.submit(send)
+        done, _ = wait([original], timeout=delay)
+        if done or not self._take_hedge():
+            return original.result()
+
+        logger.debug(f"Hedging {method} {base_path} after {delay * 1000:.0f} ms")
+        hedged = self._hedge_pool.submit(send)
+        pending = {original, hedged}
+        failed, error = None, None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is not None:
+                    error = error or future.exception()
+                    continue
+                response = future.result()
+                if not 200 <= response.status_code < 300:
+                    failed = failed or response
+                    continue
+                if future is hedged:
+                    with self._inflight_lock:
+                        self.hedges_won += 1
+                return response
+        if failed is not None:
+            return failed
+        raise error
+
+    def _take_hedge(self) -> bool:
+        """Reserve one hedge if hedges stay within hedge_budget of all requests"""
+        with self._inflight_lock:
+            if self.hedges_sent + 1 > self.hedge_budget * self.requests_sent:
+                return False
+            self.hedges_sent += 1
+            return True
+
     def list_wallets(self, cursor: Optional[str] = None) -> Dict:
         """List all wallets with pagination support
         
@@ -79,24 +683,28 @@ class CoinbasePrimeClient:
         # Base path for signature (without query params)
         base_path = f"/v1/portfolios/{self.portfolio_id}/wallets"
         
-        # Build URL with cursor if provided
-        if cursor:
-            url = f"{self.BASE_URL}{base_path}?cursor={cursor}"
-        else:
-            url = f"{self.BASE_URL}{base_path}"
-        
-        # Important: Signature uses base path WITHOUT query parameters
-        headers = self._get_headers("GET", base_path)
+        # Add cursor query param if provided
+        query = f"cursor={cursor}" if cursor else ""
 
-        logger.info(f"Listing wallets: {url}")
-        response = requests.get(url, headers=headers)
+        if self.snapshot:
+            page = self.snapshot.listing_page(self.portfolio_id, cursor)
+            self._served.value = page is not None
+            if page is not None:
+                logger.info(f"Listing wallets from snapshot: {base_path}{'?' + query if query else ''}")
+                return page
+
+        logger.info(f"Listing wallets: {base_path}{'?' + query if query else ''}")
+        response = self._request("GET", base_path, query)
         
         if response.status_code != 200:
             logger.error(f"Failed to list wallets: {response.status_code}")
             logger.error(f"Response: {response.text}")
             response.raise_for_status()
         
-        return response.json()
+        result = response.json()
+        if self.snapshot:
+            self.snapshot.record_page(self.portfolio_id, cursor, result)
+        return result
 
     def create_trading_wallet(self, symbol: str, name: str) -> Dict:
         """Create a TRADING wallet for specified asset
@@ -105,7 +713,6 @@ class CoinbasePrimeClient:
         Note: network_family is NOT needed - Coinbase determines this from symbol
         """
         path = f"/v1/portfolios/{self.portfolio_id}/wallets"
-        url = f"{self.BASE_URL}{path}"
 
         payload = {
             "name": name,
@@ -114,10 +721,9 @@ class CoinbasePrimeClient:
         }
 
         body = json.dumps(payload)
-        headers = self._get_headers("POST", path, body)
 
         logger.info(f"Creating TRADING wallet for {symbol} with name '{name}'")
-        response = requests.post(url, headers=headers, data=body)
+        response = self._request("POST", path, body=body)
         
         if response.status_code not in [200, 201]:
             logger.error(f"Failed to create wallet: {response.status_code}")
@@ -132,14 +738,16 @@ class CoinbasePrimeClient:
         """Get deposit address and memo (if applicable) for wallet"""
         # Base path for signature (without query params)
         base_path = f"/v1/portfolios/{self.portfolio_id}/wallets/{wallet_id}/deposit_instructions"
-        # Full URL with query params
-        url = f"{self.BASE_URL}{base_path}?deposit_type=CRYPTO"
 
-        # Important: Signature uses base path WITHOUT query parameters
-        headers = self._get_headers("GET", base_path)
+        if self.snapshot:
+            stored = self.snapshot.deposit_address(self.portfolio_id, wallet_id)
+            self._served.value = stored is not None
+            if stored is not None:
+                logger.info(f"Deposit address for wallet {wallet_id} from snapshot: {stored[0]}")
+                return stored
 
         logger.info(f"Fetching deposit address for wallet: {wallet_id}")
-        response = requests.get(url, headers=headers)
+        response = self._request("GET", base_path, "deposit_type=CRYPTO")
         
         if response.status_code != 200:
             logger.error(f"Failed to get deposit address: {response.status_code}")
@@ -157,30 +765,32 @@ class CoinbasePrimeClient:
         if memo:
             logger.info(f"Memo: {memo}")
 
+        if self.snapshot:
+            self.snapshot.record_address(self.portfolio_id, wallet_id, address, memo)
         return address, memo
 
-    def list_all_wallets(self) -> list:
-        """Get ALL wallets across all pages"""
-        all_wallets = []
+    def iter_wallet_pages(self, page_delay: float = 0.0) -> Iterator[List[Dict]]:
+        """Yield the wallets of each listing page as it arrives"""
         cursor = None
-        
+
         while True:
             response = self.list_wallets(cursor=cursor)
-            wallets = response.get('wallets', [])
-            all_wallets.extend(wallets)
-            
-            logger.info(f"Retrieved {len(wallets)} wallets (total so far: {len(all_wallets)})")
-            
+            yield response.get('wallets', [])
+
             pagination = response.get('pagination', {})
-            if not pagination.get('has_next'):
-                break
-                
             cursor = pagination.get('next_cursor')
-        
-        logger.info(f"Retrieved all {len(all_wallets)} wallets")
-        return all_wallets
-
-
+            if not pagination.get('has_next') or not cursor:
+                break
+            if page_delay:
+                time.sleep(page_delay)
 
+    def list_all_wallets(self) -> list:
+        """Get ALL wallets across all pages"""
+        all_wallets = []
 
+        for wallets in self.iter_wallet_pages():
+            all_wallets.extend(wallets)
+            logger.info(f"Retrieved {len(wallets)} wallets (total so far: {len(all_wallets)})")
 
+        logger.info(f"Retrieved all {len(all_wallets)} wallets")
+        return all_wallets
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Prime API Cassettes
+
+Record/replay of Coinbase Prime request/response pairs so scripts can be
+benchmarked and profiled against the real shape of our portfolio (page sizes,
+symbol mix, memo networks) without hitting Prime or leaking credentials.
+
+Only the method, path, query, status, body and latency of each call are stored.
+Request headers (access key, passphrase, signature, timestamp) are never
+written, and the portfolio ID is replaced with a placeholder everywhere.
+
+Usage:
+  cassette = PrimeCassette.record("prime.cassette.json.gz")
+  client = CoinbasePrimeClient(..., cassette=cassette)
+  ...
+  cassette.save()
+
+  cassette = PrimeCassette.replay("prime.cassette.json.gz", latency_scale=0.5)
+  client = CoinbasePrimeClient("-", "-", "-", "replay", cassette=cassette)
+"""
+
+import gzip
+import json
+import logging
+import threading
+import time
+from collections import defaultdict, deque
+from pathlib import Path
+from typing import TYPE_CHECKING, Deque, Dict, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    import requests
+
+logger = logging.getLogger(__name__)
+
+PORTFOLIO_PLACEHOLDER = "{portfolio_id}"
+CASSETTE_VERSION = 1
+
+
+class CassetteMissError(KeyError):
+    """Raised in replay mode when no recorded interaction matches a request"""
+
+
+class PrimeCassette:
+    """Recorded Prime API interactions with record and replay modes"""
+
+    RECORD = "record"
+    REPLAY = "replay"
+
+    def __init__(self, path: str, mode: str, latency_scale: float = 1.0):
+        """Create a cassette bound to a file
+
+        Args:
+            path: Cassette file (gzip-compressed when it ends with .gz)
+            mode: PrimeCassette.RECORD or PrimeCassette.REPLAY
+            latency_scale: Multiplier for recorded latencies on replay
+                           (0 disables sleeping, 1 replays real timing)
+        """
+        if mode not in (self.RECORD, self.REPLAY):
+            raise ValueError(f"Unknown cassette mode: {mode}")
+
+        self.path = Path(path)
+        self.mode = mode
+        self.latency_scale = latency_scale
+        self.interactions: List[Dict] = []
+        self._queues: Dict[Tuple[str, str, str], Deque[Dict]] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def record(cls, path: str) -> "PrimeCassette":
+        """Start a new recording that will be written to path on save()"""
+        return cls(path, cls.RECORD)
+
+    @classmethod
+    def replay(cls, path: str, latency_scale: float = 1.0) -> "PrimeCassette":
+        """Load an existing cassette for replay"""
+        cassette = cls(path, cls.REPLAY, latency_scale)
+        cassette.load()
+        return cassette
+
+    @property
+    def is_replay(self) -> bool:
+        return self.mode == self.REPLAY
+
+    # ------------------------------------------------------------------
+    # Recording
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def scrub(text: str, portfolio_id: Optional[str]) -> str:
+        """Replace the portfolio ID with a placeholder"""
+        if portfolio_id and text:
+            return text.replace(portfolio_id, PORTFOLIO_PLACEHOLDER)
+        return text
+
+    def add(self, method: str, path: str, query: str, response: "requests.Response",
+            latency: float, portfolio_id: Optional[str]) -> None:
+        """Record one request/response pair (headers are never stored)"""
+        try:
+            body = json.loads(self.scrub(response.text, portfolio_id))
+        except ValueError:
+            body = self.scrub(response.text, portfolio_id)
+
+        interaction = {
+            "method": method,
+            "path": self.scrub(path, portfolio_id),
+            "query": query,
+            "status": response.status_code,
+            "latency_ms": round(latency * 1000, 2),
+            "body": body,
+        }
+        with self._lock:
+            self.interactions.append(interaction)
+
+    def save(self) -> None:
+        """Write recorded interactions to disk in compact JSON"""
+        payload = {"version": CASSETTE_VERSION, "interactions": self.interactions}
+        data = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+
+        if self.path.suffix == ".gz":
+            data = gzip.compress(data)
+        self.path.write_bytes(data)
+
+        logger.info(f"Saved {len(self.interactions)} interactions to {self.path}")
+
+    # ------------------------------------------------------------------
+    # Replay
+    # ------------------------------------------------------------------
+
+    def load(self) -> None:
+        """Read a cassette file and index it for replay"""
+        data = self.path.read_bytes()
+        if self.path.suffix == ".gz":
+            data = gzip.decompress(data)
+
+        payload = json.loads(data)
+        if payload.get("version") != CASSETTE_VERSION:
+            raise ValueError(f"Unsupported cassette version: {payload.get('version')}")
+
+        self.interactions = payload["interactions"]
+
+        queues: Dict[Tuple[str, str, str], Deque[Dict]] = defaultdict(deque)
+        for interaction in self.interactions:
+            key = (interaction["method"], interaction["path"], interaction["query"])
+            queues[key].append(interaction)
+        self._queues = dict(queues)
+
+        logger.info(f"Loaded {len(self.interactions)} interactions from {self.path}")
+
+    def play(self, method: str, path: str, query: str,
+             portfolio_id: Optional[str]) -> "requests.Response":
+        """Serve the next recorded response for a request
+
+        Identical requests are answered in recorded order and then cycle, so
+        a cassette can drive benchmarks for longer than the original run.
+        """
+        key = (method, self.scrub(path, portfolio_id), query)
+
+        with self._lock:
+            queue = self._queues.get(key)
+            if not queue:
+                raise CassetteMissError(f"No recorded interaction for {method} {key[1]}?{query}")
+            interaction = queue.popleft()
+            queue.append(interaction)
+
+        if self.latency_scale > 0:
+            time.sleep(interaction["latency_ms"] / 1000 * self.latency_scale)
+
+        body = interaction["body"]
+        text = body if isinstance(body, str) else json.dumps(body)
+        if portfolio_id:
+            text = text.replace(PORTFOLIO_PLACEHOLDER, portfolio_id)
+
+        import requests
+
+        response = requests.Response()
+        response.status_code = interaction["status"]
+        response._content = text.encode("utf-8")
+        response.encoding = "utf-8"
+        response.url = f"{path}?{query}" if query else path
+        response.headers["Content-Type"] = "application/json"
+        return response
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Shared Prime Configuration and Client Factory
+
+One place for what every script used to repeat: load robinhood-onramp/.env.local,
+read the four Coinbase Prime credentials, build a CoinbasePrimeClient.
+
+  - .env.local is parsed once per process (no python-dotenv import); values
+    never override variables already set in the environment, like load_dotenv
+  - credentials are read and validated once and cached
+  - prime_api_client (and with it requests, ~140 ms of imports) is only
+    imported when a client is actually created, so --help, check_creds.py and
+    offline modes start at close to bare-interpreter speed
+
+Usage:
+  from prime_config import create_client, get_credentials, load_env
+
+  client = create_client()                       # raises MissingCredentialsError
+  credentials = get_credentials()                # PrimeCredentials (may be incomplete)
+  credentials.missing()                          # ["COINBASE_PRIME_PASSPHRASE", ...]
+  load_env()                                     # just apply .env.local (e.g. ROBINHOOD_APP_ID)
+
+Extra API keys for the same portfolio (Prime rate limits are per key) are read
+from numbered variables COINBASE_PRIME_ACCESS_KEY_2 / _SIGNING_KEY_2 /
+_PASSPHRASE_2, _3, ... up to the first incomplete set; create_client() then
+signs requests from a CredentialPool of all keys.
+"""
+
+import os
+import re
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+ENV_PATH = Path(__file__).parent.parent / ".env.local"
+
+# Credential → accepted environment variable names, in order of preference
+CREDENTIAL_VARS = {
+    "access_key": ("COINBASE_PRIME_ACCESS_KEY", "COINBASE_PRIME_API_KEY"),
+    "signing_key": ("COINBASE_PRIME_SIGNING_KEY",),
+    "passphrase": ("COINBASE_PRIME_PASSPHRASE",),
+    "portfolio_id": ("COINBASE_PRIME_PORTFOLIO_ID",),
+}
+
+_LINE = re.compile(r"^\s*(?:export\s+)?([A-Za-z_][A-Za-z0-9_.]*)\s*=\s*(.*?)\s*$")
+_VARIABLE = re.compile(r"\$\{([A-Za-z_][A-Za-z0-9_]*)\}")
+
+
+class MissingCredentialsError(ValueError):
+    """Raised when a client is requested but credentials are incomplete"""
+
+
+def parse_env_file(path: Path) -> Dict[str, str]:
+    """
+    Parse a .env file the way python-dotenv does for the cases we use:
+    KEY=value, optional 'export', single/double quotes, '#' comments after
+    unquoted values, and ${VAR} expansion outside single quotes.
+    """
+    values: Dict[str, str] = {}
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            match = _LINE.match(line)
+            if not match or line.lstrip().startswith("#"):
+                continue
+            key, raw = match.groups()
+
+            if raw[:1] in ("'", '"') and raw[:1] in raw[1:]:
+                quote = raw[0]
+                value = raw[1:raw.index(quote, 1)]
+                if quote == '"':
+                    value = value.replace("\\n", "\n").replace('\\"', '"')
+            else:
+                quote = ""
+                value = re.split(r"\s+#", raw, maxsplit=1)[0]
+
+            if quote != "'":
+                value = _VARIABLE.sub(lambda m: os.environ.get(m.group(1), values.get(m.group(1), "")), value)
+            values[key] = value
+    return values
+
+
+@lru_cache(maxsize=None)
+def load_env(path: Path = ENV_PATH) -> Dict[str, str]:
+    """Apply .env.local to os.environ once (existing variables win); returns the parsed values"""
+    if not path.exists():
+        return {}
+    values = parse_env_file(path)
+    for key, value in values.items():
+        os.environ.setdefault(key, value)
+    return values
+
+
+class PrimeCredentials(NamedTuple):
+    """Coinbase Prime API credentials (None when not configured)"""
+
+    access_key: Optional[str]
+    signing_key: Optional[str]
+    passphrase: Optional[str]
+    portfolio_id: Optional[str]
+
+    def missing(self) -> List[str]:
+        """Environment variable names that still need a value"""
+        missing = []
+        for field in self._fields:
+            if getattr(self, field):
+                continue
+            names = CREDENTIAL_VARS[field]
+            missing.append(names[0] if len(names) == 1 else f"{names[-1]} (or {', '.join(names[:-1])})")
+        return missing
+
+    def source(self, field: str) -> Optional[str]:
+        """Which environment variable a credential was read from"""
+        return next((name for name in CREDENTIAL_VARS[field] if os.getenv(name)), None)
+
+
+@lru_cache(maxsize=None)
+def get_credentials(path: Path = ENV_PATH) -> PrimeCredentials:
+    """Credentials from the environment after applying .env.local (cached)"""
+    load_env(path)
+    return PrimeCredentials(*(
+        next((os.getenv(name) for name in names if os.getenv(name)), None)
+        for names in CREDENTIAL_VARS.values()
+    ))
+
+
+@lru_cache(maxsize=None)
+def get_api_keys(path: Path = ENV_PATH) -> List[Tuple[str, str, str]]:
+    """(access_key, signing_key, passphrase) for the primary and every numbered extra key (cached)"""
+    credentials = get_credentials(path)
+    if not (credentials.access_key and credentials.signing_key and credentials.passphrase):
+        return []
+    keys = [(credentials.access_key, credentials.signing_key, credentials.passphrase)]
+    while True:
+        n = len(keys) + 1
+        extra = tuple(os.getenv(f"{CREDENTIAL_VARS[field][0]}_{n}")
+                      for field in ("access_key", "signing_key", "passphrase"))
+        if not all(extra):
+            return keys
+        keys.append(extra)
+
+
+def create_client(cassette=None, base_url: Optional[str] = None, validate: bool = True,
+                  key_strategy: str = "least_loaded", snapshot=None, **options):
+    """
+    CoinbasePrimeClient for the configured portfolio
+
+    Replaying a cassette needs no credentials (the portfolio ID defaults to
+    "replay"). Otherwise missing credentials raise MissingCredentialsError
+    unless validate=False. COINBASE_PRIME_BASE_URL overrides the API host
+    (e.g. prime_stub_server.py) when base_url is not given. Other keyword
+    arguments (timeout, hedge, ...) go to CoinbasePrimeClient; key_strategy
+    ("least_loaded" or "round_robin") applies when several API keys are set.
+    A WalletSnapshot (wallet_snapshot.py) serves listing pages and deposit
+    addresses while fresh; an offline one needs no credentials either (the
+    portfolio ID defaults to the snapshot's).
+    """
+    from prime_api_client import ApiKey, CoinbasePrimeClient, CredentialPool
+
+    credentials = get_credentials()
+    replaying = cassette is not None and cassette.is_replay
+    offline = snapshot is not None and snapshot.offline
+    if validate and not (replaying or offline) and credentials.missing():
+        raise MissingCredentialsError(f"Missing credentials: {', '.join(credentials.missing())}")
+
+    portfolio_id = (credentials.portfolio_id or (snapshot.portfolio_id if offline else None)
+                    or ("replay" if replaying else None))
+    keys = get_api_keys()
+    if len(keys) > 1 and not (replaying or offline) and "credentials" not in options:
+        options["credentials"] = CredentialPool([ApiKey(*key, label=f"key {n}") for n, key in enumerate(keys, 1)],
+                                                strategy=key_strategy)
+    return CoinbasePrimeClient(credentials.access_key, credentials.signing_key, credentials.passphrase,
+                               portfolio_id, cassette=cassette, snapshot=snapshot,
+                               base_url=base_url or os.getenv("COINBASE_PRIME_BASE_URL"), **options)
@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Local Coinbase Prime Stand-in
+
+A small threaded HTTP server that answers the Prime endpoints our scripts use
+(wallet listing and deposit_instructions) with a server-side token-bucket rate
+limit. Requests over the limit get 429, like Prime does. With per_key the
+limit applies to each X-CB-ACCESS-KEY separately (as Prime's does), and
+revoked keys are answered with 401.
+
+Responses come from a recorded cassette (see prime_cassette.py) when one is
+given, otherwise from a synthetic portfolio built from ROBINHOOD_ASSETS.
+
+Usage:
+  python3 prime_stub_server.py --port 8099 --rate-limit 25 --burst 25
+  python3 prime_stub_server.py --cassette prime.cassette.json.gz --latency-scale 1
+  python3 prime_stub_server.py --rate-limit 25 --per-key --revoked-key old-access-key
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Sequence
+
+from prime_cassette import CassetteMissError, PrimeCassette
+
+MEMO_SYMBOLS = {"XLM", "XRP", "HBAR"}
+WALLET_NAMES = ["Trading", "Trading Balance", "Vault"]
+
+
+class TokenBucket:
+    """Thread-safe token bucket (rate tokens/sec, up to burst tokens)"""
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def take(self) -> bool:
+        """Consume one token if available"""
+        if self.rate <= 0:
+            return True
+
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return True
+            return False
+
+
+def synthetic_wallets(wallets_per_symbol: int = 2) -> List[Dict]:
+    """Build a Prime-shaped wallet list for every Robinhood asset"""
+    from generate_prime_wallets import ROBINHOOD_ASSETS
+
+    wallets = []
+    for symbol in sorted(ROBINHOOD_ASSETS):
+        for idx in range(wallets_per_symbol):
+            name = WALLET_NAMES[idx % len(WALLET_NAMES)]
+            wallets.append({
+                "id": f"{symbol.lower()}-{idx:04d}",
+                "symbol": symbol,
+                "name": name if idx < len(WALLET_NAMES) else f"{name} {idx}",
+                "wallet_type": "VAULT" if name == "Vault" else "TRADING",
+            })
+    return wallets
+
+
+class PrimeStubServer(ThreadingHTTPServer):
+    """Threaded HTTP server holding stub state and counters"""
+
+    daemon_threads = True
+    request_queue_size = 1024
+
+    def __init__(self, port: int = 0, rate_limit: float = 0, burst: Optional[float] = None,
+                 latency: float = 0.02, page_size: int = 100,
+                 slow_fraction: float = 0.0, slow_latency: float = 1.0,
+                 wallets: Optional[List[Dict]] = None, cassette: Optional[PrimeCassette] = None,
+                 per_key: bool = False, revoked_keys: Sequence[str] = ()):
+        """Create the stub (port 0 picks a free port)
+
+        Args:
+            rate_limit: Allowed requests/sec across all clients (0 = unlimited)
+            burst: Bucket size (defaults to one second of rate_limit)
+            latency: Simulated service time per request, in seconds
+            slow_fraction: Share of requests that take slow_latency instead
+                           (a latency tail, e.g. for hedging experiments)
+            page_size: Wallets per listing page
+            wallets: Portfolio to serve (defaults to synthetic_wallets())
+            cassette: Replay-mode cassette to serve instead of synthetic data
+            per_key: Give every access key its own rate_limit bucket
+            revoked_keys: Access keys answered with 401
+        """
+        super().__init__(("127.0.0.1", port), StubRequestHandler)
+        self.bucket = TokenBucket(rate_limit, burst or max(rate_limit, 1))
+        self.per_key = per_key
+        self.key_buckets: Dict[str, TokenBucket] = {}
+        self.revoked_keys = set(revoked_keys)
+        self.latency = latency
+        self.slow_fraction = slow_fraction
+        self.slow_latency = slow_latency
+        self.page_size = page_size
+        self.wallets = wallets if wallets is not None else synthetic_wallets()
+        self.wallets_by_id = {w["id"]: w for w in self.wallets}
+        self.cassette = cassette
+        self.stats = {"requests": 0, "throttled": 0, "unauthorized": 0}
+        self.stats_lock = threading.Lock()
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server_port}"
+
+    def count(self, key: str) -> None:
+        with self.stats_lock:
+            self.stats[key] += 1
+
+    def bucket_for(self, access_key: str) -> TokenBucket:
+        """The shared bucket, or the access key's own bucket with per_key"""
+        if not self.per_key:
+            return self.bucket
+        with self.stats_lock:
+            if access_key not in self.key_buckets:
+                self.key_buckets[access_key] = TokenBucket(self.bucket.rate, self.bucket.burst)
+            return self.key_buckets[access_key]
+
+    def reset_buckets(self) -> None:
+        """Refill every bucket (e.g. between benchmark levels)"""
+        for bucket in [self.bucket, *self.key_buckets.values()]:
+            bucket.tokens = bucket.burst
+
+    def start(self) -> "PrimeStubServer":
+        """Serve in a background thread"""
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+
+class StubRequestHandler(BaseHTTPRequestHandler):
+    """Answers Prime GET endpoints from the server's portfolio"""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status: int, body: Dict) -> None:
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        server: PrimeStubServer = self.server
+        server.count("requests")
+
+        access_key = self.headers.get("X-CB-ACCESS-KEY", "")
+        if access_key in server.revoked_keys:
+            server.count("unauthorized")
+            self._send(401, {"message": "Unauthorized"})
+            return
+
+        if not server.bucket_for(access_key).take():
+            server.count("throttled")
+            self._send(429, {"message": "Too many requests"})
+            return
+
+        path, _, query = self.path.partition("?")
+        # v1/portfolios/{portfolio_id}/wallets[/{wallet_id}/deposit_instructions]
+        parts = path.strip("/").split("/")
+
+        if server.cassette:
+            portfolio_id = parts[2] if len(parts) > 2 else None
+            try:
+                response = server.cassette.play("GET", path, query, portfolio_id)
+                self._send(response.status_code, response.json())
+            except CassetteMissError as e:
+                self._send(404, {"message": str(e)})
+            return
+
+        if server.slow_fraction and random.random() < server.slow_fraction:
+            time.sleep(server.slow_latency)
+        elif server.latency:
+            time.sleep(server.latency)
+
+        if len(parts) == 4 and parts[3] == "wallets":
+            params = dict(p.split("=", 1) for p in query.split("&") if "=" in p)
+            start = int(params.get("cursor") or 0)
+            end = start + server.page_size
+            has_next = end < len(server.wallets)
+            self._send(200, {
+                "wallets": server.wallets[start:end],
+                "pagination": {"has_next": has_next, "next_cursor": str(end) if has_next else ""},
+            })
+        elif len(parts) == 6 and parts[5] == "deposit_instructions":
+            wallet = server.wallets_by_id.get(parts[4])
+            if not wallet:
+                self._send(404, {"message": "wallet not found"})
+                return
+            memo = str(zlib.crc32(wallet["id"].encode())) if wallet["symbol"] in MEMO_SYMBOLS else None
+            self._send(200, {"crypto_instructions": {
+                "address": f"stub-{wallet['id']}",
+                "account_identifier": memo,
+            }})
+        else:
+            self._send(404, {"message": f"unknown path {path}"})
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a local Coinbase Prime stand-in")
+    parser.add_argument("--port", type=int, default=8099, help="Port to listen on")
+    parser.add_argument("--rate-limit", type=float, default=0, help="Requests/sec before 429 (0 = unlimited)")
+    parser.add_argument("--burst", type=float, default=None, help="Token bucket size")
+    parser.add_argument("--latency", type=float, default=0.02, help="Service time per request (seconds)")
+    parser.add_argument("--slow-fraction", type=float, default=0.0, help="Share of requests that are slow")
+    parser.add_argument("--slow-latency", type=float, default=1.0, help="Service time of slow requests")
+    parser.add_argument("--per-key", action="store_true", help="Apply the rate limit per access key")
+    parser.add_argument("--revoked-key", action="append", default=[], metavar="ACCESS_KEY",
+                        help="Answer this access key with 401 (repeatable)")
+    parser.add_argument("--cassette", metavar="PATH", help="Serve responses from a recorded cassette")
+    parser.add_argument("--latency-scale", type=float, default=1.0, help="Cassette latency multiplier")
+    args = parser.parse_args()
+
+    cassette = PrimeCassette.replay(args.cassette, args.latency_scale) if args.cassette else None
+    server = PrimeStubServer(args.port, args.rate_limit, args.burst, args.latency, cassette=cassette,
+                             slow_fraction=args.slow_fraction, slow_latency=args.slow_latency,
+                             per_key=args.per_key, revoked_keys=args.revoked_key)
+
+    print(f"✅ Prime stub listening on {server.base_url}")
+    print(f"   Rate limit: {args.rate_limit or 'unlimited'} req/s | Wallets: {len(server.wallets)}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nStopped")
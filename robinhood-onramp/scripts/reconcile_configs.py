@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Reconcile Committed Asset Configs Against Live Coinbase Prime
+
+robinhood-assets-config.json and robinhood-otc-tokens.json are committed
+snapshots. Checking them by regenerating costs a full crawl (one deposit
+lookup per asset). Reconciling costs one wallet listing (a handful of pages)
+plus a deposit lookup only for wallets that actually changed:
+
+  1. Each committed file is hashed (SHA-256) and indexed: config rows by
+     wallet id and symbol, OTC tokens by symbol (checked against the
+     reconciled config row of the same symbol).
+  2. The live listing is indexed by wallet id and symbol.
+  3. A committed wallet still listed under the same id and name is current;
+     its address is not fetched. Renamed, replaced and new wallets are
+     re-resolved.
+
+Differences:
+
+  changed_address   address or memo differs from the live wallet
+  renamed           wallet name changed, address unchanged
+  missing_wallet    committed wallet no longer listed and nothing replaces it
+  new_asset         a Robinhood asset committed as missing/fallback (or not at
+                    all) now has a Prime wallet
+
+Exits 1 when anything differs, so it can gate CI or a deploy.
+
+Usage:
+  python3 reconcile_configs.py
+  python3 reconcile_configs.py --json > drift.json
+  python3 reconcile_configs.py --config robinhood_assets_addresses_20250101_120000.json --otc ''
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import sys
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from address_index import normalize_address, normalize_memo
+from generate_prime_wallets import ROBINHOOD_ASSETS, fetch_all_wallets, group_wallets_by_symbol, select_preferred_wallet
+from prime_config import create_client
+from watch_prime_wallets import fingerprint, index_wallets
+
+logger = logging.getLogger(__name__)
+
+SCRIPTS_DIR = Path(__file__).parent
+DEFAULT_CONFIG_PATH = SCRIPTS_DIR / "robinhood-assets-config.json"
+DEFAULT_OTC_PATH = SCRIPTS_DIR / "robinhood-otc-tokens.json"
+
+
+def file_digest(path: Path) -> str:
+    """SHA-256 of a committed file, as reported alongside the diff"""
+    return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+
+
+def load_config(path: Path) -> List[Dict]:
+    """Every row of an asset config or generate_prime_wallets.py JSON output (missing rows included)"""
+    with open(path) as f:
+        return json.load(f)
+
+
+def load_otc_tokens(path: Path) -> List[Dict]:
+    """Tokens of robinhood-otc-tokens.json ({address, symbol, name, memo, logoUrl})"""
+    with open(path) as f:
+        return json.load(f)["tokens"]
+
+
+def same_destination(address: Optional[str], memo, other_address: Optional[str], other_memo) -> bool:
+    return (normalize_address(address or "") == normalize_address(other_address or "")
+            and normalize_memo(memo) == normalize_memo(other_memo))
+
+
+def reconcile(config_rows: List[Dict], listing: List[Dict],
+              resolve: Callable[[str], Tuple[Optional[str], Optional[str]]],
+              otc_tokens: Optional[List[Dict]] = None) -> List[Dict]:
+    """
+    Differences between the committed rows/tokens and the live listing
+
+    resolve(wallet_id) → (address, memo) is only called for wallets whose id
+    or name differs from what was committed.
+    """
+    live = index_wallets(listing)
+    by_symbol = group_wallets_by_symbol(listing)
+    claimed = {row["wallet_id"] for row in config_rows if row.get("wallet_id")}
+    current: Dict[str, List[Tuple[Optional[str], Optional[str]]]] = {}  # symbol → reconciled (address, memo)
+    diff = []
+
+    def unclaimed(symbol: str) -> Optional[Dict]:
+        """Preferred live wallet for symbol that no committed row accounts for"""
+        wallets = [w for w in by_symbol.get(symbol, []) if w["id"] not in claimed]
+        if not wallets:
+            return None
+        wallet = select_preferred_wallet(wallets)
+        claimed.add(wallet["id"])
+        return wallet
+
+    def record(source: str, kind: str, symbol: str, committed: Dict, wallet: Optional[Dict] = None,
+               address: Optional[str] = None, memo=None) -> None:
+        entry = {"source": source, "kind": kind, "symbol": symbol,
+                 "committed_wallet_id": committed.get("wallet_id"), "committed_name": committed.get("wallet_name"),
+                 "committed_address": committed.get("address"), "committed_memo": committed.get("memo")}
+        if wallet:
+            entry.update(live_wallet_id=wallet["id"], live_name=wallet.get("name"),
+                         live_address=address, live_memo=memo)
+        diff.append(entry)
+
+    for row in config_rows:
+        symbol, wallet_id = row["symbol"], row.get("wallet_id")
+        destinations = current.setdefault(symbol, [])
+        if wallet_id and wallet_id in live:
+            wallet = {"id": wallet_id, **live[wallet_id]}
+            if wallet["name"] == row.get("wallet_name"):
+                destinations.append((row.get("address"), row.get("memo")))  # Unchanged: no call
+                continue
+            address, memo = resolve(wallet_id)
+            kind = "renamed" if same_destination(row.get("address"), row.get("memo"), address, memo) \
+                else "changed_address"
+            record("config", kind, symbol, row, wallet, address, memo)
+            destinations.append((address, memo))
+        elif wallet_id:
+            wallet = unclaimed(symbol)
+            if wallet is None:
+                record("config", "missing_wallet", symbol, row)
+                continue
+            address, memo = resolve(wallet["id"])
+            record("config", "changed_address", symbol, row, wallet, address, memo)
+            destinations.append((address, memo))
+        else:
+            wallet = unclaimed(symbol)
+            if wallet is None:
+                if row.get("address"):
+                    destinations.append((row["address"], row.get("memo")))  # Fallback address stays in use
+                continue
+            address, memo = resolve(wallet["id"])
+            record("config", "new_asset", symbol, row, wallet, address, memo)
+            destinations.append((address, memo))
+
+    for symbol in ROBINHOOD_ASSETS:
+        if symbol not in current:
+            wallet = unclaimed(symbol)
+            if wallet is not None:
+                address, memo = resolve(wallet["id"])
+                record("config", "new_asset", symbol, {}, wallet, address, memo)
+                current[symbol] = [(address, memo)]
+
+    for token in otc_tokens or []:
+        symbol = token["symbol"]
+        if symbol not in current:
+            wallet = unclaimed(symbol)
+            current[symbol] = [resolve(wallet["id"])] if wallet else []
+        destinations = current[symbol]
+        if not destinations:
+            record("otc", "missing_wallet", symbol, token)
+        elif not any(same_destination(token.get("address"), token.get("memo"), a, m) for a, m in destinations):
+            address, memo = destinations[0]
+            record("otc", "changed_address", symbol, token, {"id": None, "name": None}, address, memo)
+    return diff
+
+
+def print_diff(diff: List[Dict]) -> None:
+    for entry in diff:
+        print(f"\n⚠️  {entry['source']:6} {entry['symbol']:10} {entry['kind']}")
+        if entry.get("committed_wallet_id") or entry.get("committed_name"):
+            print(f"     committed: {entry['committed_wallet_id']} ({entry['committed_name']})")
+        if entry.get("live_wallet_id"):
+            print(f"     live:      {entry['live_wallet_id']} ({entry['live_name']})")
+        if entry["kind"] != "renamed":
+            memo = f"  memo {entry['committed_memo']}" if entry.get("committed_memo") else ""
+            print(f"     was:       {entry.get('committed_address')}{memo}")
+            if "live_address" in entry:
+                memo = f"  memo {entry['live_memo']}" if entry.get("live_memo") else ""
+                print(f"     now:       {entry['live_address']}{memo}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Diff committed asset configs against the live Prime listing")
+    parser.add_argument("--config", type=Path, default=DEFAULT_CONFIG_PATH, help="Asset config (or generate output)")
+    parser.add_argument("--otc", default=str(DEFAULT_OTC_PATH), metavar="PATH",
+                        help="OTC token export to check as well ('' to skip)")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+
+    # Client logs every request at INFO; the diff is the output
+    logging.getLogger("prime_api_client").setLevel(logging.WARNING)
+    logging.getLogger("generate_prime_wallets").setLevel(logging.WARNING)
+
+    config_rows = load_config(args.config)
+    otc_path = Path(args.otc) if args.otc else None
+    otc_tokens = load_otc_tokens(otc_path) if otc_path else None
+    files = {str(args.config): file_digest(args.config)}
+    if otc_path:
+        files[str(otc_path)] = file_digest(otc_path)
+
+    client = create_client()
+    listing = fetch_all_wallets(client, progress=logger.debug, page_delay=0)
+    listing_calls = client.requests_sent
+
+    def resolve(wallet_id):
+        return client.get_wallet_deposit_address(wallet_id)
+
+    diff = reconcile(config_rows, listing, resolve, otc_tokens)
+    deposit_calls = client.requests_sent - listing_calls
+    # What regenerating would have cost: the same listing plus one lookup per asset with a wallet
+    by_symbol = group_wallets_by_symbol(listing)
+    regenerate_calls = listing_calls + sum(1 for symbol in ROBINHOOD_ASSETS if symbol in by_symbol)
+
+    if args.json:
+        print(json.dumps({
+            "files": files,
+            "listing": {"wallets": len(listing), "fingerprint": fingerprint(index_wallets(listing))},
+            "requests": {"listing": listing_calls, "deposit": deposit_calls, "regenerate": regenerate_calls},
+            "diff": diff,
+        }, indent=2))
+        sys.exit(1 if diff else 0)
+
+    print("=" * 100)
+    print("Reconcile Committed Configs Against Coinbase Prime")
+    print("=" * 100)
+    print(f"{args.config.name:32} sha256 {files[str(args.config)][:12]}  {len(config_rows)} rows")
+    if otc_path:
+        print(f"{otc_path.name:32} sha256 {files[str(otc_path)][:12]}  {len(otc_tokens)} tokens")
+    print(f"{'Live listing':32} {len(listing)} wallets (fingerprint {fingerprint(index_wallets(listing))})")
+
+    print_diff(diff)
+
+    print("\n" + "=" * 100)
+    if diff:
+        print(f"⚠️  {len(diff)} difference(s) - regenerate with generate_prime_wallets.py")
+    else:
+        print("✅ Committed configs match Prime")
+    print(f"Cost: {listing_calls} listing + {deposit_calls} deposit call(s) "
+          f"(a full regeneration: ~{regenerate_calls})")
+    sys.exit(1 if diff else 0)
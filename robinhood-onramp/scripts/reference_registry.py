@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Issued referenceId Registry
+
+Records every referenceId minted for a Connect link so the callback can reject
+forged or stale IDs. IDs live in a TTL-bounded SQLite store; a Bloom filter
+rebuilt from the live IDs on open sits in front of it, so the common "never
+issued" case is answered from memory without touching the store.
+
+  verify(id) → Bloom miss  → False (no store hit)
+             → Bloom hit   → store lookup (issued and not expired?)
+
+The filter is sized for 1% false positives at the expected capacity and is
+rebuilt at twice the size when the store outgrows it.
+
+Usage:
+  python3 reference_registry.py verify 0190a4c6-... [more IDs]
+  python3 reference_registry.py stats
+  python3 reference_registry.py purge
+  python3 reference_registry.py benchmark --count 1000000
+
+  from reference_registry import ReferenceRegistry
+  with ReferenceRegistry() as registry:
+      registry.issue(reference_id, asset="ETH")
+      registry.verify(reference_id)   # True until the TTL runs out
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import sqlite3
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+from uuid import uuid4
+
+DEFAULT_DB_PATH = Path(__file__).parent / "reference-registry.sqlite3"
+DEFAULT_TTL_DAYS = 30
+DEFAULT_CAPACITY = 100_000
+FLUSH_EVERY = 10_000
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings (double hashing of one blake2b digest)"""
+
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        capacity = max(capacity, 1)
+        self.capacity = capacity
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key: str):
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        size = self.size
+        return [(h1 + i * h2) % size for i in range(self.hashes)]
+
+    def add(self, key: str) -> None:
+        bits = self.bits
+        for pos in self._positions(key):
+            bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, key: str) -> bool:
+        bits = self.bits
+        for pos in self._positions(key):
+            if not bits[pos >> 3] & (1 << (pos & 7)):
+                return False
+        return True
+
+
+class ReferenceRegistry:
+    """TTL-bounded store of issued referenceIds with a Bloom filter fast path"""
+
+    def __init__(self, path: Path = DEFAULT_DB_PATH, ttl_days: float = DEFAULT_TTL_DAYS,
+                 capacity: int = DEFAULT_CAPACITY):
+        """Open (or create) the registry and rebuild the filter from live IDs
+
+        Args:
+            path: SQLite database file (":memory:" for a throwaway registry)
+            ttl_days: How long an issued ID stays valid
+            capacity: Expected live IDs; the filter grows past this if needed
+        """
+        self.ttl = ttl_days * 86400
+        self.lock = threading.Lock()
+        self.pending = []
+        self.stats = {"filter_rejects": 0, "store_lookups": 0, "verified": 0}
+
+        self.db = sqlite3.connect(str(path), check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS issued ("
+            " reference_id TEXT PRIMARY KEY,"
+            " issued_at REAL NOT NULL,"
+            " expires_at REAL NOT NULL,"
+            " meta TEXT"
+            ") WITHOUT ROWID"
+        )
+        self.db.execute("CREATE INDEX IF NOT EXISTS issued_expires ON issued (expires_at)")
+        self.purge()
+        self._rebuild_filter(capacity)
+
+    def _rebuild_filter(self, capacity: int) -> None:
+        live = self.db.execute("SELECT COUNT(*) FROM issued").fetchone()[0]
+        self.filter = BloomFilter(max(capacity, 2 * live))
+        for (reference_id,) in self.db.execute("SELECT reference_id FROM issued"):
+            self.filter.add(reference_id)
+
+    def issue(self, reference_id: str, **meta) -> None:
+        """Record one issued ID immediately"""
+        self.issue_many([reference_id], meta or None)
+
+    def issue_many(self, reference_ids: Iterable[str], meta: Optional[Dict] = None) -> int:
+        """Record many IDs in one transaction; returns how many were written"""
+        now = time.time()
+        meta_json = json.dumps(meta) if meta else None
+        rows = [(reference_id, now, now + self.ttl, meta_json) for reference_id in reference_ids]
+        with self.lock:
+            with self.db:
+                self.db.executemany("INSERT OR REPLACE INTO issued VALUES (?, ?, ?, ?)", rows)
+            if self.filter.count + len(rows) > self.filter.capacity:
+                self._rebuild_filter(2 * (self.filter.count + len(rows)))
+            else:
+                for row in rows:
+                    self.filter.add(row[0])
+        return len(rows)
+
+    def record(self, reference_id: str) -> None:
+        """Buffer an ID for bulk runs; written every FLUSH_EVERY IDs and on flush()"""
+        self.pending.append(reference_id)
+        if len(self.pending) >= FLUSH_EVERY:
+            self.flush()
+
+    def flush(self) -> int:
+        """Write buffered IDs"""
+        pending, self.pending = self.pending, []
+        return self.issue_many(pending) if pending else 0
+
+    def verify(self, reference_id: str) -> bool:
+        """True if the ID was issued here and has not expired"""
+        if reference_id not in self.filter:
+            self.stats["filter_rejects"] += 1
+            return False
+
+        self.stats["store_lookups"] += 1
+        with self.lock:
+            row = self.db.execute(
+                "SELECT expires_at FROM issued WHERE reference_id = ?", (reference_id,)
+            ).fetchone()
+        if row is None or row[0] <= time.time():
+            return False
+        self.stats["verified"] += 1
+        return True
+
+    def purge(self) -> int:
+        """Delete expired IDs (the filter keeps them until the next rebuild)"""
+        with self.lock, self.db:
+            return self.db.execute("DELETE FROM issued WHERE expires_at <= ?", (time.time(),)).rowcount
+
+    def live_count(self) -> int:
+        return self.db.execute("SELECT COUNT(*) FROM issued WHERE expires_at > ?", (time.time(),)).fetchone()[0]
+
+    def close(self) -> None:
+        self.flush()
+        self.db.close()
+
+    def __enter__(self) -> "ReferenceRegistry":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def benchmark(count: int, probes: int) -> None:
+    """Issue count IDs into a throwaway registry, then verify a spam-heavy mix"""
+    registry = ReferenceRegistry(":memory:", capacity=count)
+    issued = [str(uuid4()) for _ in range(count)]
+
+    started = time.perf_counter()
+    registry.issue_many(issued)
+    print(f"Issued {count:,} IDs in {time.perf_counter() - started:.2f}s")
+
+    # 90% forged/never-issued callbacks, 10% genuine
+    genuine = issued[:probes // 10]
+    forged = [str(uuid4()) for _ in range(probes - len(genuine))]
+    for label, ids in (("forged", forged), ("genuine", genuine)):
+        started = time.perf_counter()
+        accepted = sum(registry.verify(reference_id) for reference_id in ids)
+        elapsed = time.perf_counter() - started
+        print(f"  {label:8} {len(ids):>8,} verifies: {elapsed / len(ids) * 1e6:7.2f}µs each, "
+              f"{accepted:,} accepted")
+
+    stats = registry.stats
+    print(f"Filter rejects: {stats['filter_rejects']:,} | Store lookups: {stats['store_lookups']:,} "
+          f"| Filter: {len(registry.filter.bits) / 1024:.0f} KiB, {registry.filter.hashes} hashes")
+    registry.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Verify and maintain issued Connect referenceIds")
+    parser.add_argument("--db", type=Path, default=DEFAULT_DB_PATH, help="Registry database")
+    parser.add_argument("--ttl-days", type=float, default=DEFAULT_TTL_DAYS, help="Validity of an issued ID")
+    sub = parser.add_subparsers(dest="command", required=True)
+    verify_parser = sub.add_parser("verify", help="Check referenceIds (exit 1 if any is not valid)")
+    verify_parser.add_argument("reference_ids", nargs="+")
+    sub.add_parser("stats", help="Show live ID count and filter size")
+    sub.add_parser("purge", help="Delete expired IDs")
+    bench_parser = sub.add_parser("benchmark", help="Measure verification speed in memory")
+    bench_parser.add_argument("--count", type=int, default=100_000, help="IDs to issue")
+    bench_parser.add_argument("--probes", type=int, default=100_000, help="Callbacks to verify")
+    args = parser.parse_args()
+
+    if args.command == "benchmark":
+        benchmark(args.count, args.probes)
+        sys.exit(0)
+
+    with ReferenceRegistry(args.db, args.ttl_days) as registry:
+        if args.command == "verify":
+            invalid = 0
+            for reference_id in args.reference_ids:
+                valid = registry.verify(reference_id)
+                invalid += not valid
+                print(f"{'✅' if valid else '❌'} {reference_id}")
+            sys.exit(1 if invalid else 0)
+        elif args.command == "stats":
+            print(f"Live IDs: {registry.live_count():,} | TTL: {args.ttl_days:g} days | "
+                  f"Filter: {len(registry.filter.bits) / 1024:.0f} KiB ({registry.filter.hashes} hashes)")
+        elif args.command == "purge":
+            print(f"✅ Purged {registry.purge():,} expired ID(s)")
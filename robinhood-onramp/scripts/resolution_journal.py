@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Resolution Journal (checkpoint / resume for generate_prime_wallets.py)
+
+Every live address-resolution run appends its progress to a JSON-lines
+journal: each wallet listing page with the cursor that follows it, then each
+symbol once all of its deposit addresses are resolved. If the run dies (crash,
+Ctrl-C, the app's SIGTERM on timeout), `--resume` replays the journal:
+listing continues from the last cursor and completed symbols are not asked for
+again, so a big portfolio never pays twice for the same call.
+
+A journal belongs to one portfolio and one mode (preferred vs all wallets); a
+journal older than MAX_AGE_S is discarded, but a live journal for another
+portfolio or mode is never overwritten (JournalConflictError) unless the run
+passes --discard-journal - give such runs their own --journal instead. Lines
+are flushed as written; a line torn by a crash is ignored. Only symbols whose
+addresses all resolved are recorded, so --resume retries failed wallets. The
+file is removed once a run completes.
+
+Usage:
+  python3 generate_prime_wallets.py --all-wallets              # journals as it goes
+  python3 generate_prime_wallets.py --all-wallets --resume     # finish what is left
+  python3 resolution_journal.py                                # what a resume would skip
+
+  from resolution_journal import ResolutionJournal
+  journal = ResolutionJournal.open(path, {"portfolio": "...", "mode": "all"}, resume=True)
+  journal.record_page(next_cursor, wallets, has_next)
+  journal.record_symbol("BTC", rows)
+  journal.complete()
+"""
+
+import argparse
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+DEFAULT_JOURNAL_PATH = Path(__file__).parent / "resolution-journal.jsonl"
+MAX_AGE_S = 24 * 3600  # Addresses are stable, but do not resume a day-old crawl
+
+
+class JournalConflictError(ValueError):
+    """The journal path holds an unfinished run for another portfolio or mode"""
+
+
+class ResolutionJournal:
+    """Append-only record of listed pages and resolved symbols for one run"""
+
+    def __init__(self, path: Path, key: Dict):
+        self.path = Path(path)
+        self.key = key
+        self.wallets: List[Dict] = []
+        self.cursor: Optional[str] = None  # Next listing cursor (None = start or done)
+        self.pages = 0
+        self.listed = False
+        self.done: Dict[str, List[Dict]] = {}  # symbol → result rows
+        self.resumed = False
+        self.started = 0.0
+        self.valid_bytes = 0  # Length of the intact prefix (a crash can tear the last line)
+        self.lock = threading.Lock()
+        self._file = None
+
+    @classmethod
+    def read(cls, path: Path = DEFAULT_JOURNAL_PATH) -> "ResolutionJournal":
+        """Journal state from path (nothing recorded when missing or unusable)"""
+        journal = cls(path, {})
+        try:
+            with open(path, "rb") as f:
+                lines = f.readlines()
+        except OSError:
+            return journal
+
+        for line in lines:
+            try:
+                entry = json.loads(line) if line.endswith(b"\n") else None
+            except ValueError:
+                entry = None
+            if entry is None:
+                break  # Torn last line of a killed run
+            journal.valid_bytes += len(line)
+            kind = entry.get("type")
+            if kind == "run":
+                journal.key = entry["key"]
+                journal.started = entry.get("started", 0)
+            elif kind == "page":
+                journal.wallets.extend(entry["wallets"])
+                journal.cursor = entry["cursor"]
+                journal.pages += 1
+                journal.listed = not entry["has_next"]
+            elif kind == "symbol":
+                journal.done[entry["symbol"]] = entry["rows"]
+        return journal
+
+    @classmethod
+    def open(cls, path: Path, key: Dict, resume: bool = False, overwrite: bool = False) -> "ResolutionJournal":
+        """Journal for a run with this key; with resume, continue a matching journal
+
+        Raises JournalConflictError rather than replace another key's unfinished
+        journal, unless overwrite is set.
+        """
+        previous = cls.read(path)
+        live = previous.key and time.time() - previous.started <= MAX_AGE_S
+        if resume and live and previous.key == key:
+            previous.resumed = True
+            os.truncate(path, previous.valid_bytes)
+            previous._file = open(path, "a")
+            return previous
+        if live and previous.key != key and not overwrite:
+            raise JournalConflictError(
+                f"{path} holds an unfinished run for {previous.key}, not {key}: "
+                f"pass another --journal, or --discard-journal to replace it")
+
+        journal = cls(path, key)
+        journal.started = time.time()
+        journal._file = open(path, "w")
+        journal._write({"type": "run", "key": key, "started": journal.started})
+        return journal
+
+    def _write(self, entry: Dict) -> None:
+        with self.lock:
+            if self._file is None:
+                return  # Closed: a worker finishing after the run stopped
+            self._file.write(json.dumps(entry, separators=(",", ":")) + "\n")
+            self._file.flush()
+
+    def record_page(self, cursor: Optional[str], wallets: List[Dict], has_next: bool) -> None:
+        """One listing page and the cursor of the page after it"""
+        self._write({"type": "page", "cursor": cursor, "wallets": wallets, "has_next": has_next})
+
+    def record_symbol(self, symbol: str, rows: List[Dict]) -> None:
+        """All result rows of a fully resolved symbol (pending or failed symbols are not recorded)"""
+        self._write({"type": "symbol", "symbol": symbol, "rows": rows})
+
+    def close(self) -> None:
+        """Stop recording; later writes are dropped"""
+        with self.lock:
+            if self._file:
+                self._file.close()
+                self._file = None
+
+    def complete(self) -> None:
+        """The run finished: nothing left to resume"""
+        self.close()
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Show what generate_prime_wallets.py --resume would skip")
+    parser.add_argument("--path", type=Path, default=DEFAULT_JOURNAL_PATH, help="Journal file")
+    args = parser.parse_args()
+
+    journal = ResolutionJournal.read(args.path)
+
+    print("=" * 100)
+    print("Resolution Journal")
+    print("=" * 100)
+    if not journal.key:
+        print(f"✅ No unfinished run at {args.path}")
+    else:
+        age = time.time() - journal.started
+        print(f"Run:      {journal.key} ({age / 60:.0f} min ago)")
+        print(f"Listing:  {journal.pages} page(s), {len(journal.wallets)} wallets"
+              f"{' - complete' if journal.listed else f', resumes at cursor {journal.cursor!r}'}")
+        print(f"Resolved: {len(journal.done)} symbol(s): {', '.join(sorted(journal.done)) or '-'}")
+        if age > MAX_AGE_S:
+            print(f"⚠️  Older than {MAX_AGE_S // 3600}h - --resume will start over")
@@ -5,12 +5,9 @@ Test Single Wallet Creation
 Creates one test wallet and retrieves its deposit address.
 """
 
-import os
 import time
-from pathlib import Path
 
-from dotenv import load_dotenv
-from prime_api_client import CoinbasePrimeClient
+from prime_config import create_client
 
 
 def create_test_wallet():
@@ -20,18 +17,9 @@ def create_test_wallet():
     print("Coinbase Prime - Test Wallet Creation")
     print("=" * 80)
     
-    # Load credentials
-    env_path = Path(__file__).parent.parent / ".env.local"
-    load_dotenv(env_path)
-    
-    access_key = os.getenv("COINBASE_PRIME_ACCESS_KEY") or os.getenv("COINBASE_PRIME_API_KEY")
-    signing_key = os.getenv("COINBASE_PRIME_SIGNING_KEY")
-    passphrase = os.getenv("COINBASE_PRIME_PASSPHRASE")
-    portfolio_id = os.getenv("COINBASE_PRIME_PORTFOLIO_ID")
-    
     # Initialize client
     print(f"\n[1/4] Initializing API client...")
-    client = CoinbasePrimeClient(access_key, signing_key, passphrase, portfolio_id)
+    client = create_client(validate=False)
     print("✅ Client initialized")
     
     # Create wallet
@@ -2,54 +2,51 @@
 """
 End-to-End Verification for Coinbase Prime API Integration
 
-Runs all tests to confirm API client is ready for wallet generation.
+Runs all tests to confirm API client is ready for wallet generation. The
+listing is always fetched from Prime (authenticated), never from a fresh
+wallet snapshot; the snapshot is still refreshed. Only --offline skips Prime.
+
+Usage:
+  python3 verify_api_ready.py
+  python3 verify_api_ready.py --offline   # CI: listing from the shared wallet snapshot, no network
 """
 
-import os
-from pathlib import Path
+import argparse
 
-from dotenv import load_dotenv
-from prime_api_client import CoinbasePrimeClient
+from prime_config import create_client, get_credentials
+from wallet_snapshot import add_snapshot_arguments, snapshot_from_args
 
 
-def verify_api_ready():
+def verify_api_ready(snapshot=None):
     """Run comprehensive verification"""
 
     print("=" * 70)
     print("Coinbase Prime API - End-to-End Verification")
     print("=" * 70)
 
-    # Load credentials
-    env_path = Path(__file__).parent.parent / ".env.local"
-    load_dotenv(env_path)
-
-    # Get access key (support both naming conventions)
-    access_key = os.getenv("COINBASE_PRIME_ACCESS_KEY") or os.getenv("COINBASE_PRIME_API_KEY")
-    signing_key = os.getenv("COINBASE_PRIME_SIGNING_KEY")
-    passphrase = os.getenv("COINBASE_PRIME_PASSPHRASE")
-    portfolio_id = os.getenv("COINBASE_PRIME_PORTFOLIO_ID")
-
-    # Verify credentials
+    # Verify credentials (from .env.local)
     print("\n[1/3] Checking credentials...")
-    if not all([access_key, signing_key, passphrase, portfolio_id]):
+    credentials = get_credentials()
+    portfolio_id = credentials.portfolio_id
+    missing = credentials.missing()
+    if snapshot and snapshot.offline:
+        print("⏭️  Offline - credentials not needed")
+        portfolio_id = portfolio_id or snapshot.portfolio_id
+    elif missing:
         print("❌ Missing credentials")
-        missing = []
-        if not access_key:
-            missing.append("COINBASE_PRIME_API_KEY (or COINBASE_PRIME_ACCESS_KEY)")
-        if not signing_key:
-            missing.append("COINBASE_PRIME_SIGNING_KEY")
-        if not passphrase:
-            missing.append("COINBASE_PRIME_PASSPHRASE")
-        if not portfolio_id:
-            missing.append("COINBASE_PRIME_PORTFOLIO_ID")
         print(f"  Missing: {', '.join(missing)}")
         return False
-    print("✅ All credentials loaded")
+    else:
+        print("✅ All credentials loaded")
+
+    # A cached listing would pass without a single authenticated request
+    if snapshot and not snapshot.offline:
+        snapshot.max_age = 0
 
     # Initialize client
     print("\n[2/3] Initializing API client...")
     try:
-        client = CoinbasePrimeClient(access_key, signing_key, passphrase, portfolio_id)
+        client = create_client(snapshot=snapshot)
         print("✅ Client initialized")
     except Exception as e:
         print(f"❌ Client initialization failed: {e}")
@@ -63,7 +60,8 @@ def verify_api_ready():
         trading_wallets = [w for w in wallets if w.get("wallet_type") == "TRADING"]
         vault_wallets = [w for w in wallets if w.get("wallet_type") == "VAULT"]
 
-        print(f"✅ Successfully listed {len(wallets)} wallets")
+        source = " (from the wallet snapshot)" if client.from_snapshot else ""
+        print(f"✅ Successfully listed {len(wallets)} wallets{source}")
         print(f"   - {len(trading_wallets)} TRADING wallets")
         print(f"   - {len(vault_wallets)} VAULT wallets")
         
@@ -90,8 +88,13 @@ def verify_api_ready():
     print("✅ All verifications passed!")
     print("=" * 70)
     print("\nAPI client is ready for use.")
+    if snapshot:
+        print(f"📦 {snapshot.summary()}")
     print("\nKey findings:")
-    print(f"  • Authentication: WORKING (base64-encoded HMAC-SHA256)")
+    if client.from_snapshot:
+        print(f"  • Authentication: not exercised (listing served from the wallet snapshot)")
+    else:
+        print(f"  • Authentication: WORKING (base64-encoded HMAC-SHA256)")
     print(f"  • Portfolio ID: {portfolio_id}")
     print(f"  • Total wallets: {len(wallets)}")
     print(f"  • TRADING wallets: {len(trading_wallets)}")
@@ -103,6 +106,10 @@ def verify_api_ready():
     return True
 
 if __name__ == "__main__":
-    success = verify_api_ready()
+    parser = argparse.ArgumentParser(description="Verify the Coinbase Prime API client end to end")
+    add_snapshot_arguments(parser, max_age=False)
+    args = parser.parse_args()
+
+    success = verify_api_ready(snapshot_from_args(args))
     exit(0 if success else 1)
 
@@ -5,11 +5,7 @@ Get Deposit Address for Existing Wallet
 Uses the "Zora OTC" wallet we saw in the list.
 """
 
-import os
-from pathlib import Path
-
-from dotenv import load_dotenv
-from prime_api_client import CoinbasePrimeClient
+from prime_config import create_client
 
 
 def get_deposit_address():
@@ -19,18 +15,9 @@ def get_deposit_address():
     print("Coinbase Prime - Get Deposit Address for Existing Wallet")
     print("=" * 80)
     
-    # Load credentials
-    env_path = Path(__file__).parent.parent / ".env.local"
-    load_dotenv(env_path)
-    
-    access_key = os.getenv("COINBASE_PRIME_ACCESS_KEY") or os.getenv("COINBASE_PRIME_API_KEY")
-    signing_key = os.getenv("COINBASE_PRIME_SIGNING_KEY")
-    passphrase = os.getenv("COINBASE_PRIME_PASSPHRASE")
-    portfolio_id = os.getenv("COINBASE_PRIME_PORTFOLIO_ID")
-    
     # Initialize client
     print(f"\n[1/3] Initializing API client...")
-    client = CoinbasePrimeClient(access_key, signing_key, passphrase, portfolio_id)
+    client = create_client(validate=False)
     print("✅ Client initialized")
     
     # Use the "Zora OTC" wallet we saw in the list
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Streaming Wallet Export
+
+Writes the Prime wallet listing page by page, as pages arrive, to CSV,
+Parquet, Arrow IPC or a NumPy structured array. Every format uses the same
+fixed schema (WALLET_FIELDS), so wallets with different field sets line up;
+keys outside the schema are kept as JSON in the 'extra' column. Only one page
+is held in memory at a time.
+
+Formats (picked from the file extension, or --format):
+  .csv              plain CSV, header from WALLET_FIELDS
+  .parquet          Parquet, one row group per page (needs pyarrow)
+  .arrow / .feather Arrow IPC file, one record batch per page (needs pyarrow)
+  .npy              NumPy structured array of fixed-width UTF-8 fields
+                    (needs numpy); load with np.load(path, mmap_mode="r")
+
+Usage:
+  python3 list_all_wallets.py --export wallets.parquet
+  python3 wallet_export.py wallets.npy
+  python3 wallet_export.py wallets.csv --replay-cassette prime.cassette.json.gz
+"""
+
+import argparse
+import csv
+import json
+import logging
+import os
+import shutil
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+WALLET_FIELDS = ("id", "symbol", "name", "wallet_type", "network", "address", "visibility", "created_at", "extra")
+
+# Byte widths for the .npy export (UTF-8); longer values are truncated with a warning
+NUMPY_WIDTHS = {
+    "id": 64, "symbol": 24, "name": 96, "wallet_type": 24, "network": 48,
+    "address": 128, "visibility": 32, "created_at": 40, "extra": 256,
+}
+
+FORMATS = {
+    ".csv": "csv",
+    ".parquet": "parquet",
+    ".arrow": "arrow",
+    ".feather": "arrow",
+    ".npy": "npy",
+}
+
+_KNOWN_KEYS = set(WALLET_FIELDS) | {"type"}
+
+
+def _text(value) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, str):
+        return value
+    return json.dumps(value, separators=(",", ":"), sort_keys=True)
+
+
+def normalize_wallet(wallet: Dict) -> Tuple[str, ...]:
+    """Map one Prime wallet to a WALLET_FIELDS row (all strings, '' when missing)"""
+    extra = {key: value for key, value in wallet.items() if key not in _KNOWN_KEYS}
+    return (
+        _text(wallet.get("id")),
+        _text(wallet.get("symbol")),
+        _text(wallet.get("name")),
+        _text(wallet.get("wallet_type") or wallet.get("type")),
+        _text(wallet.get("network")),
+        _text(wallet.get("address")),
+        _text(wallet.get("visibility")),
+        _text(wallet.get("created_at")),
+        _text(extra) if extra else "",
+    )
+
+
+class CsvWalletWriter:
+    """CSV with a fixed header"""
+
+    def __init__(self, path: Path):
+        self.file = open(path, "w", newline="")
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(WALLET_FIELDS)
+        self.count = 0
+
+    def write_page(self, rows: List[Tuple[str, ...]]) -> None:
+        self.writer.writerows(rows)
+        self.file.flush()
+        self.count += len(rows)
+
+    def close(self) -> None:
+        self.file.close()
+
+
+class ArrowWalletWriter:
+    """Parquet (one row group per page) or Arrow IPC (one batch per page)"""
+
+    def __init__(self, path: Path, fmt: str):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise RuntimeError(f"{fmt} export needs pyarrow (pip install pyarrow)")
+
+        self.pa = pa
+        self.schema = pa.schema([(field, pa.string()) for field in WALLET_FIELDS])
+        if fmt == "parquet":
+            self.writer = pq.ParquetWriter(str(path), self.schema)
+            self._write = lambda batch: self.writer.write_table(pa.Table.from_batches([batch]))
+        else:
+            self.writer = pa.ipc.new_file(str(path), self.schema)
+            self._write = self.writer.write_batch
+        self.count = 0
+
+    def write_page(self, rows: List[Tuple[str, ...]]) -> None:
+        if not rows:
+            return
+        columns = [self.pa.array(column, self.pa.string()) for column in zip(*rows)]
+        self._write(self.pa.RecordBatch.from_arrays(columns, schema=self.schema))
+        self.count += len(rows)
+
+    def close(self) -> None:
+        self.writer.close()
+
+
+class NumpyWalletWriter:
+    """
+    .npy structured array, streamed
+
+    The .npy header needs the final row count, so pages are appended as raw
+    records to a side file and the header is written in front on close().
+    """
+
+    def __init__(self, path: Path):
+        try:
+            import numpy as np
+        except ImportError:
+            raise RuntimeError("npy export needs numpy (pip install numpy)")
+
+        self.np = np
+        self.dtype = np.dtype([(field, f"S{NUMPY_WIDTHS[field]}") for field in WALLET_FIELDS])
+        self.path = Path(path)
+        self.raw_path = self.path.with_name(self.path.name + ".part")
+        self.raw = open(self.raw_path, "wb")
+        self.count = 0
+        self.truncated = 0
+
+    def write_page(self, rows: List[Tuple[str, ...]]) -> None:
+        widths = [NUMPY_WIDTHS[field] for field in WALLET_FIELDS]
+        encoded = []
+        for row in rows:
+            values = tuple(value.encode("utf-8") for value in row)
+            if any(len(value) > width for value, width in zip(values, widths)):
+                self.truncated += 1
+            encoded.append(values)
+        self.raw.write(self.np.array(encoded, dtype=self.dtype).tobytes())
+        self.count += len(rows)
+
+    def close(self) -> None:
+        self.raw.close()
+        header = {
+            "descr": self.np.lib.format.dtype_to_descr(self.dtype),
+            "fortran_order": False,
+            "shape": (self.count,),
+        }
+        with open(self.path, "wb") as out, open(self.raw_path, "rb") as raw:
+            self.np.lib.format.write_array_header_1_0(out, header)
+            shutil.copyfileobj(raw, out, 1 << 20)
+        os.remove(self.raw_path)
+        if self.truncated:
+            logger.warning(f"{self.truncated} wallet(s) had values longer than the .npy field widths (truncated)")
+
+
+def open_writer(path: Path, fmt: Optional[str] = None):
+    """Writer for a path; format from the extension unless given"""
+    fmt = fmt or FORMATS.get(Path(path).suffix.lower())
+    if fmt == "csv":
+        return CsvWalletWriter(path)
+    if fmt in ("parquet", "arrow"):
+        return ArrowWalletWriter(path, fmt)
+    if fmt == "npy":
+        return NumpyWalletWriter(path)
+    raise ValueError(f"Unknown export format for {path} (use {', '.join(sorted(set(FORMATS.values())))})")
+
+
+def export_wallets(client, path: Path, fmt: Optional[str] = None,
+                   progress: Callable[[str], None] = print, page_delay: float = 0.0) -> int:
+    """Stream every listing page to path; returns the number of wallets written"""
+    writer = open_writer(path, fmt)
+    try:
+        for page, wallets in enumerate(client.iter_wallet_pages(page_delay), 1):
+            writer.write_page([normalize_wallet(w) for w in wallets])
+            progress(f"  ✓ Page {page}: {len(wallets)} wallets (total: {writer.count})")
+    finally:
+        writer.close()
+    return writer.count
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Stream the Prime wallet listing to CSV/Parquet/Arrow/NumPy")
+    parser.add_argument("output", type=Path, help="Output file (.csv, .parquet, .arrow, .feather, .npy)")
+    parser.add_argument("--format", choices=sorted(set(FORMATS.values())), help="Override the extension")
+    parser.add_argument("--page-delay", type=float, default=0.0, help="Pause between pages (seconds)")
+    parser.add_argument("--replay-cassette", metavar="PATH", help="Export from a recorded cassette")
+    args = parser.parse_args()
+
+    from prime_cassette import PrimeCassette
+    from prime_config import create_client
+
+    logging.basicConfig(level=logging.WARNING)
+
+    cassette = PrimeCassette.replay(args.replay_cassette) if args.replay_cassette else None
+    client = create_client(cassette=cassette, validate=False)
+
+    started = time.perf_counter()
+    try:
+        count = export_wallets(client, args.output, args.format, page_delay=args.page_delay)
+    except (RuntimeError, ValueError) as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    print(f"✅ Exported {count} wallets to {args.output} in {time.perf_counter() - started:.2f}s")
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Shared Wallet Snapshot Store
+
+list_all_wallets.py, generate_prime_wallets.py, get_all_robinhood_assets.py,
+get_trading_balance_addresses.py and verify_api_ready.py all crawl the same
+listing and deposit addresses. The client records what it fetches to one
+local snapshot (default wallet-snapshot.json, git-ignored) and serves it back
+while it is fresh, so running those scripts in a row pays for one crawl.
+
+The snapshot holds the portfolio ID, the listing page by page (keyed by the
+cursor that requested it, so pagination behaves as it did live) with the
+time the crawl started, and each wallet's deposit address with the time it
+was fetched. Freshness contract:
+
+  - a listing is served only once a crawl reached its last page, and only
+    while it is younger than --max-age (default 15 min, or
+    PRIME_SNAPSHOT_MAX_AGE); then every page is served from it
+  - an address is served while its own fetch is younger than --max-age
+  - nothing is served for another portfolio
+  - --max-age 0 always goes to Prime (and still refreshes the snapshot);
+    verify_api_ready.py always runs this way unless --offline
+  - --offline serves whatever is stored, however old, and never calls
+    Prime; anything not in the snapshot raises SnapshotMissError
+
+A new listing replaces the old one when its last page arrives. Addresses are
+written when a listing completes and at exit.
+
+Usage:
+  python3 list_all_wallets.py                      # crawls, fills the snapshot
+  python3 generate_prime_wallets.py                # listing from the snapshot
+  python3 verify_api_ready.py --offline            # CI: no network at all
+  python3 get_all_robinhood_assets.py --max-age 0  # force a fresh crawl
+  python3 wallet_snapshot.py                       # what is stored, and how old
+
+  snapshot = WalletSnapshot.load(path, max_age=900)
+  client = create_client(snapshot=snapshot)
+"""
+
+import argparse
+import atexit
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SNAPSHOT_PATH = Path(__file__).parent / "wallet-snapshot.json"
+DEFAULT_MAX_AGE_S = 15 * 60
+SNAPSHOT_VERSION = 1
+
+
+class SnapshotMissError(KeyError):
+    """Raised offline when the snapshot has no answer for a request"""
+
+
+def default_max_age() -> float:
+    """PRIME_SNAPSHOT_MAX_AGE (environment or .env.local), else DEFAULT_MAX_AGE_S"""
+    from prime_config import load_env
+    load_env()  # Read at call time: .env.local is applied after this module is imported
+    return float(os.getenv("PRIME_SNAPSHOT_MAX_AGE", DEFAULT_MAX_AGE_S))
+
+
+def _age(seconds: float) -> str:
+    return f"{seconds:.0f}s" if seconds < 120 else f"{seconds / 60:.0f} min" if seconds < 7200 \
+        else f"{seconds / 3600:.1f} h"
+
+
+class WalletSnapshot:
+    """Last wallet listing (page by page) and deposit addresses of one portfolio"""
+
+    def __init__(self, path: Path = DEFAULT_SNAPSHOT_PATH, max_age: Optional[float] = None,
+                 offline: bool = False):
+        self.path = Path(path)
+        self.max_age = default_max_age() if max_age is None else max_age
+        self.offline = offline
+        self.portfolio_id: Optional[str] = None
+        self.crawled_at: Optional[float] = None  # When the stored listing's first page was requested
+        self.pages: Dict[str, Dict] = {}  # request cursor ('' for the first page) → listing response
+        self.addresses: Dict[str, Dict] = {}  # wallet id → {address, memo, at}
+        self.hits = 0
+        self.misses = 0
+        self._crawl: Optional[Dict[str, Dict]] = None  # Pages of a live crawl in progress
+        self._crawl_started = 0.0
+        self._dirty = False
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path: Path = DEFAULT_SNAPSHOT_PATH, max_age: Optional[float] = None,
+             offline: bool = False) -> "WalletSnapshot":
+        """Snapshot stored at path (empty when missing or unreadable); pending addresses are saved at exit"""
+        snapshot = cls(path, max_age, offline)
+        try:
+            with open(path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            data = {}
+        if data.get("version") == SNAPSHOT_VERSION:
+            snapshot.portfolio_id = data["portfolio_id"]
+            snapshot.crawled_at = data["crawled_at"]
+            snapshot.pages = data["pages"]
+            snapshot.addresses = data["addresses"]
+        if not offline:
+            atexit.register(snapshot.flush)
+        return snapshot
+
+    def _fresh(self, portfolio_id: Optional[str], at: Optional[float]) -> bool:
+        if at is None or portfolio_id != self.portfolio_id:
+            return False
+        return self.offline or time.time() - at <= self.max_age
+
+    def _miss(self, what: str) -> None:
+        if self.offline:
+            raise SnapshotMissError(f"{what} is not in the snapshot ({self.path}) - run once without --offline")
+        self.misses += 1
+
+    # ------------------------------------------------------------------
+    # Serving
+    # ------------------------------------------------------------------
+
+    def listing_page(self, portfolio_id: Optional[str], cursor: Optional[str]) -> Optional[Dict]:
+        """Stored listing response for this cursor, or None to fetch it"""
+        with self._lock:
+            page = self.pages.get(cursor or "") if self._fresh(portfolio_id, self.crawled_at) else None
+            if page is None:
+                self._miss(f"Listing page {cursor or '1'}")
+                return None
+            self.hits += 1
+            return page
+
+    def deposit_address(self, portfolio_id: Optional[str],
+                        wallet_id: str) -> Optional[Tuple[Optional[str], Optional[str]]]:
+        """Stored (address, memo) of a wallet, or None to fetch it"""
+        with self._lock:
+            entry = self.addresses.get(wallet_id)
+            if entry is None or not self._fresh(portfolio_id, entry["at"]):
+                self._miss(f"Deposit address of wallet {wallet_id}")
+                return None
+            self.hits += 1
+            return entry["address"], entry["memo"]
+
+    # ------------------------------------------------------------------
+    # Recording
+    # ------------------------------------------------------------------
+
+    def _claim(self, portfolio_id: Optional[str]) -> None:
+        """Start over when data for another portfolio arrives"""
+        if portfolio_id != self.portfolio_id:
+            self.portfolio_id = portfolio_id
+            self.crawled_at = None
+            self.pages = {}
+            self.addresses = {}
+
+    def record_page(self, portfolio_id: Optional[str], cursor: Optional[str], response: Dict) -> None:
+        """One live listing page; the crawl replaces the stored listing once its last page arrives"""
+        with self._lock:
+            if not cursor:
+                self._crawl, self._crawl_started = {}, time.time()
+            if self._crawl is None:
+                return  # Crawl started before this snapshot was attached
+            self._crawl[cursor or ""] = response
+            pagination = response.get("pagination", {})
+            if pagination.get("next_cursor") and pagination.get("has_next", True):
+                return
+            self._claim(portfolio_id)
+            self.pages, self.crawled_at, self._crawl = self._crawl, self._crawl_started, None
+            self._dirty = True
+        self.flush()
+
+    def record_address(self, portfolio_id: Optional[str], wallet_id: str, address: Optional[str], memo) -> None:
+        with self._lock:
+            self._claim(portfolio_id)
+            self.addresses[wallet_id] = {"address": address, "memo": memo, "at": time.time()}
+            self._dirty = True
+
+    def flush(self) -> None:
+        """Write to disk if anything changed (temp file + rename)"""
+        with self._lock:
+            if not self._dirty or self.offline:
+                return
+            data = {"version": SNAPSHOT_VERSION, "portfolio_id": self.portfolio_id, "crawled_at": self.crawled_at,
+                    "pages": self.pages, "addresses": self.addresses}
+            tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+            with open(tmp_path, "w") as f:
+                json.dump(data, f, separators=(",", ":"))
+            os.replace(tmp_path, self.path)
+            self._dirty = False
+
+    def summary(self) -> str:
+        """One line on what was served locally, for the end of a script's output"""
+        listing = f"listing {_age(time.time() - self.crawled_at)} old" if self.crawled_at else "no listing"
+        mode = "offline, " if self.offline else ""
+        return f"Snapshot: {self.hits} served locally, {self.misses} fetched from Prime ({mode}{listing})"
+
+
+def add_snapshot_arguments(parser: argparse.ArgumentParser, max_age: bool = True) -> None:
+    """--snapshot / --max-age / --offline, shared by every script that reads the snapshot"""
+    group = parser.add_argument_group("wallet snapshot (see wallet_snapshot.py)")
+    group.add_argument("--snapshot", type=Path, default=DEFAULT_SNAPSHOT_PATH, metavar="PATH",
+                       help="Shared snapshot of the wallet listing and deposit addresses")
+    if max_age:
+        # Default resolved in WalletSnapshot, once .env.local has been applied
+        group.add_argument("--max-age", type=float, default=None, metavar="SECONDS",
+                           help="Serve snapshot data younger than this (0 = always ask Prime; "
+                                f"default: PRIME_SNAPSHOT_MAX_AGE or {DEFAULT_MAX_AGE_S})")
+    group.add_argument("--offline", action="store_true",
+                       help="Run entirely from the snapshot, however old; never call Prime")
+
+
+def snapshot_from_args(args: argparse.Namespace) -> WalletSnapshot:
+    return WalletSnapshot.load(args.snapshot, max_age=getattr(args, "max_age", None), offline=args.offline)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Show what the shared wallet snapshot holds")
+    parser.add_argument("--path", type=Path, default=DEFAULT_SNAPSHOT_PATH, help="Snapshot file")
+    args = parser.parse_args()
+
+    snapshot = WalletSnapshot.load(args.path, offline=True)
+
+    print("=" * 100)
+    print("Wallet Snapshot")
+    print("=" * 100)
+    if snapshot.portfolio_id is None:
+        print(f"✅ Nothing stored at {args.path}")
+    else:
+        now = time.time()
+        wallets = sum(len(page.get("wallets", [])) for page in snapshot.pages.values())
+        print(f"Portfolio: {snapshot.portfolio_id}")
+        if snapshot.crawled_at:
+            max_age = default_max_age()
+            fresh = "fresh" if now - snapshot.crawled_at <= max_age else "stale"
+            print(f"Listing:   {wallets} wallets in {len(snapshot.pages)} page(s), "
+                  f"{_age(now - snapshot.crawled_at)} old ({fresh} at --max-age {max_age:.0f})")
+        else:
+            print("Listing:   none (no crawl has finished)")
+        ages = [now - entry["at"] for entry in snapshot.addresses.values()]
+        if ages:
+            print(f"Addresses: {len(ages)}, {_age(min(ages))} to {_age(max(ages))} old")
+        else:
+            print("Addresses: none")
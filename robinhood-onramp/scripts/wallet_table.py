@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+Columnar Wallet Table
+
+Holds a wallet listing as NumPy arrays so inventory questions are vectorized
+instead of loops over dicts. symbol, wallet_type and name class are
+categorical: one small-int code array per column plus the list of categories,
+so filters compare integers and group-by counts are a bincount.
+
+Name classes (NAME_CLASSES) capture the wallet naming conventions the scripts
+filter on with substring checks: "Trading Balance", "Trading", "Vault", other.
+
+Needs numpy (in requirements.txt).
+
+Usage:
+  python3 wallet_table.py wallets.npy                 # inventory summary of an export
+  python3 wallet_table.py --live                      # fetch the listing first
+  python3 wallet_table.py --benchmark 50000           # dict loops vs vectorized
+
+  from wallet_table import WalletTable
+  table = WalletTable.from_wallets(wallets)
+  trading = table.where(table.mask(wallet_type="TRADING"))
+  table.count_by("symbol")
+  table.missing_symbols(ROBINHOOD_ASSETS, name_class="trading_balance")
+"""
+
+import argparse
+import csv
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+NAME_CLASSES = ["trading_balance", "trading", "vault", "other"]
+CATEGORICAL = ("symbol", "wallet_type", "name_class")
+
+
+def classify_name(name: str) -> str:
+    """Name class for a wallet name (same substring rules the scripts use)"""
+    lowered = name.lower()
+    if "trading balance" in lowered:
+        return "trading_balance"
+    if "trading" in lowered:
+        return "trading"
+    if "vault" in lowered:
+        return "vault"
+    return "other"
+
+
+def encode(values: Sequence[str], categories: Optional[List[str]] = None):
+    """Categorical encoding → (codes, categories); codes index into categories"""
+    values = np.asarray(values, dtype=str)
+    if categories is None:
+        categories, codes = np.unique(values, return_inverse=True)
+        return codes.astype(np.int32), [str(c) for c in categories]
+
+    lookup = {category: idx for idx, category in enumerate(categories)}
+    return np.fromiter((lookup[v] for v in values), dtype=np.int32, count=len(values)), list(categories)
+
+
+class WalletTable:
+    """
+    Columnar wallet listing
+
+    Columns:
+      ids, names, addresses  - NumPy string arrays
+      codes[col]             - int32 category codes for symbol / wallet_type / name_class
+      categories[col]        - category labels for those codes
+    """
+
+    def __init__(self, ids, names, addresses, codes: Dict[str, np.ndarray], categories: Dict[str, List[str]]):
+        self.ids = ids
+        self.names = names
+        self.addresses = addresses
+        self.codes = codes
+        self.categories = categories
+
+    @classmethod
+    def from_columns(cls, ids: Sequence[str], symbols: Sequence[str], names: Sequence[str],
+                     wallet_types: Sequence[str], addresses: Optional[Sequence[str]] = None) -> "WalletTable":
+        names = np.asarray(names, dtype=str)
+        # Classify each distinct name once - portfolios reuse a handful of names
+        unique_names, name_index = np.unique(names, return_inverse=True)
+        class_codes = np.array([NAME_CLASSES.index(classify_name(n)) for n in unique_names], dtype=np.int32)
+
+        codes, categories = {}, {}
+        codes["symbol"], categories["symbol"] = encode(symbols)
+        codes["wallet_type"], categories["wallet_type"] = encode(wallet_types)
+        codes["name_class"] = class_codes[name_index] if len(names) else np.zeros(0, np.int32)
+        categories["name_class"] = list(NAME_CLASSES)
+
+        if addresses is None:
+            addresses = [""] * len(names)
+        return cls(np.asarray(ids, dtype=str), names, np.asarray(addresses, dtype=str), codes, categories)
+
+    @classmethod
+    def from_wallets(cls, wallets: Iterable[Dict]) -> "WalletTable":
+        """Build from Prime wallet dicts"""
+        wallets = list(wallets)
+        return cls.from_columns(
+            [w.get("id", "") for w in wallets],
+            [w.get("symbol", "") for w in wallets],
+            [w.get("name", "") for w in wallets],
+            [w.get("wallet_type") or w.get("type") or "" for w in wallets],
+            [w.get("address") or "" for w in wallets],
+        )
+
+    @classmethod
+    def from_export(cls, path: Path) -> "WalletTable":
+        """Load a wallet_export.py file (.npy, .parquet, .arrow/.feather or .csv)"""
+        path = Path(path)
+        suffix = path.suffix.lower()
+        if suffix == ".npy":
+            data = np.load(path)
+            column = lambda name: np.char.decode(data[name], "utf-8")
+        elif suffix in (".parquet", ".arrow", ".feather"):
+            import pyarrow.feather as feather
+            import pyarrow.parquet as pq
+            data = pq.read_table(path) if suffix == ".parquet" else feather.read_table(path)
+            column = lambda name: data.column(name).to_numpy(zero_copy_only=False).astype(str)
+        else:
+            with open(path, newline="") as f:
+                rows = list(csv.DictReader(f))
+            column = lambda name: [row[name] for row in rows]
+        return cls.from_columns(column("id"), column("symbol"), column("name"),
+                                column("wallet_type"), column("address"))
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def code_of(self, column: str, value: str) -> int:
+        """Category code for a label (-1 when the label does not occur)"""
+        try:
+            return self.categories[column].index(value)
+        except ValueError:
+            return -1
+
+    def mask(self, symbol=None, wallet_type=None, name_class=None, name_contains: Optional[str] = None) -> np.ndarray:
+        """
+        Boolean row mask; each filter takes one label or a list of labels
+
+        name_contains is a case-insensitive substring match on the wallet name.
+        """
+        mask = np.ones(len(self), dtype=bool)
+        for column, wanted in (("symbol", symbol), ("wallet_type", wallet_type), ("name_class", name_class)):
+            if wanted is None:
+                continue
+            labels = [wanted] if isinstance(wanted, str) else wanted
+            mask &= np.isin(self.codes[column], [self.code_of(column, label) for label in labels])
+        if name_contains:
+            mask &= np.char.find(np.char.lower(self.names), name_contains.lower()) >= 0
+        return mask
+
+    def where(self, mask: np.ndarray) -> "WalletTable":
+        """Sub-table of the rows selected by mask (categories are shared)"""
+        return WalletTable(
+            self.ids[mask], self.names[mask], self.addresses[mask],
+            {column: codes[mask] for column, codes in self.codes.items()},
+            self.categories,
+        )
+
+    def count_by(self, column: str, mask: Optional[np.ndarray] = None) -> Dict[str, int]:
+        """Row count per category (categories with no rows are omitted)"""
+        codes = self.codes[column] if mask is None else self.codes[column][mask]
+        counts = np.bincount(codes, minlength=len(self.categories[column]))
+        return {label: int(n) for label, n in zip(self.categories[column], counts) if n}
+
+    def count_by2(self, row_column: str, col_column: str) -> Dict[str, Dict[str, int]]:
+        """Two-way count table, e.g. count_by2("symbol", "wallet_type")"""
+        width = len(self.categories[col_column])
+        flat = self.codes[row_column] * width + self.codes[col_column]
+        counts = np.bincount(flat, minlength=len(self.categories[row_column]) * width).reshape(-1, width)
+        return {
+            row_label: {col_label: int(n) for col_label, n in zip(self.categories[col_column], row) if n}
+            for row_label, row in zip(self.categories[row_column], counts) if row.any()
+        }
+
+    def join_catalog(self, catalog: Dict[str, str], mask: Optional[np.ndarray] = None) -> np.ndarray:
+        """Per-row catalog value (e.g. network from ROBINHOOD_ASSETS); '' for symbols not in it"""
+        lookup = np.array([catalog.get(symbol, "") for symbol in self.categories["symbol"]] or [""], dtype=str)
+        codes = self.codes["symbol"] if mask is None else self.codes["symbol"][mask]
+        return lookup[codes]
+
+    def missing_symbols(self, catalog: Iterable[str], **filters) -> List[str]:
+        """Catalog symbols with no wallet matching the filters (anti-join)"""
+        present = np.zeros(len(self.categories["symbol"]), dtype=bool)
+        present[self.codes["symbol"][self.mask(**filters)]] = True
+        have = {label for label, ok in zip(self.categories["symbol"], present) if ok}
+        return sorted(symbol for symbol in catalog if symbol not in have)
+
+
+def print_summary(table: WalletTable, catalog: Dict[str, str]) -> None:
+    """Inventory answers the listing scripts compute with dict loops"""
+    print(f"Wallets: {len(table):,} | Symbols: {len(table.count_by('symbol'))}")
+
+    print("\nBy type:")
+    for wallet_type, count in sorted(table.count_by("wallet_type").items()):
+        print(f"  {wallet_type:20} {count:>8,}")
+
+    print("\nBy name class:")
+    for name_class, count in table.count_by("name_class").items():
+        print(f"  {name_class:20} {count:>8,}")
+
+    on_catalog = table.join_catalog(catalog) != ""
+    networks, counts = np.unique(table.join_catalog(catalog, on_catalog), return_counts=True)
+    print(f"\nRobinhood assets by network ({int(on_catalog.sum()):,} wallets):")
+    for network, count in zip(networks, counts):
+        print(f"  {network:20} {int(count):>8,}")
+
+    missing = table.missing_symbols(catalog, name_class="trading_balance")
+    print(f"\nRobinhood assets without a Trading Balance wallet: {', '.join(missing) or 'none'}")
+
+
+def benchmark(count: int, catalog: Dict[str, str]) -> None:
+    """Compare dict loops with the vectorized table on a synthetic portfolio"""
+    from prime_stub_server import synthetic_wallets
+
+    per_symbol = max(1, count // len(catalog))
+    wallets = synthetic_wallets(per_symbol)
+
+    started = time.perf_counter()
+    table = WalletTable.from_wallets(wallets)
+    build = time.perf_counter() - started
+
+    def loops():
+        by_type, by_symbol = {}, {}
+        for w in wallets:
+            by_type[w["wallet_type"]] = by_type.get(w["wallet_type"], 0) + 1
+            by_symbol[w["symbol"]] = by_symbol.get(w["symbol"], 0) + 1
+        trading = [w for w in wallets if w["wallet_type"] == "TRADING"]
+        balance = [w for w in wallets if "trading balance" in w["name"].lower()]
+        have = {w["symbol"] for w in balance}
+        return by_type, by_symbol, len(trading), [s for s in catalog if s not in have]
+
+    def vectorized():
+        return (table.count_by("wallet_type"), table.count_by("symbol"),
+                int(table.mask(wallet_type="TRADING").sum()),
+                table.missing_symbols(catalog, name_class="trading_balance"))
+
+    results = {}
+    for label, fn in (("dict loops", loops), ("vectorized", vectorized)):
+        started = time.perf_counter()
+        for _ in range(10):
+            fn()
+        results[label] = (time.perf_counter() - started) / 10
+    print(f"{len(wallets):,} wallets | table build {build * 1000:.1f} ms (once)")
+    for label, seconds in results.items():
+        print(f"  {label:12} {seconds * 1000:8.2f} ms per query set")
+    print(f"  speedup      {results['dict loops'] / results['vectorized']:8.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Vectorized wallet inventory queries")
+    parser.add_argument("export", nargs="?", type=Path, help="wallet_export.py output to load")
+    parser.add_argument("--live", action="store_true", help="Fetch the wallet listing from Prime")
+    parser.add_argument("--benchmark", type=int, metavar="N", help="Benchmark on N synthetic wallets")
+    args = parser.parse_args()
+
+    from generate_prime_wallets import ROBINHOOD_ASSETS
+
+    if args.benchmark:
+        benchmark(args.benchmark, ROBINHOOD_ASSETS)
+        sys.exit(0)
+
+    if args.live:
+        from prime_config import create_client
+        table = WalletTable.from_wallets(create_client().list_all_wallets())
+    elif args.export:
+        table = WalletTable.from_export(args.export)
+    else:
+        parser.error("give an export file, --live or --benchmark N")
+
+    print("=" * 100)
+    print("Wallet Inventory")
+    print("=" * 100)
+    print_summary(table, ROBINHOOD_ASSETS)
@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+Watch Coinbase Prime for New and Changed Wallets
+
+Polls the wallet listing and emits a change event whenever a wallet is added,
+removed, or changed (renamed, or a new symbol or type), so new Robinhood
+assets reach the app without anyone rerunning generate_prime_wallets.py. Only
+added wallets cost extra calls (one deposit_instructions each); everything
+else is a listing diff. A new wallet without a deposit address yet is not
+reported; it is looked up again on the next poll.
+
+Polling is adaptive: each listing is reduced to a fingerprint (SHA-256 of the
+sorted id/symbol/name/type tuples). After a change the interval drops to
+--min-interval; every unchanged poll doubles it, up to --max-interval. Errors
+back off the same way. A quiet portfolio is polled a handful of times per
+hour; a busy one every --min-interval seconds until it settles.
+
+The last listing is kept in --state (default watch-state.json, git-ignored),
+so a restart only reports what changed while the watcher was down. The first
+run without state records a baseline and reports nothing.
+
+Events are JSON lines: printed, appended to --events, and/or broadcast to
+every client connected to the Unix socket at --socket.
+
+  {"type": "added", "wallet_id": "...", "symbol": "SOL", "name": "Trading",
+   "address": "...", "memo": null, "robinhood_asset": true, "at": "..."}
+  {"type": "changed", "wallet_id": "...", "symbol": "SOL", "name": "Trading",
+   "wallet_type": "VAULT", "previous": {"name": "Trading 2"}, "at": "..."}
+  {"type": "removed", "wallet_id": "...", "symbol": "SOL", "name": "Trading", "at": "..."}
+
+Usage:
+  python3 watch_prime_wallets.py                                   # poll until Ctrl-C
+  python3 watch_prime_wallets.py --events wallet-events.jsonl
+  python3 watch_prime_wallets.py --socket /tmp/prime-wallets.sock  # nc -U /tmp/prime-wallets.sock
+  python3 watch_prime_wallets.py --once                            # one poll (cron)
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import random
+import signal
+import socket
+import sys
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from generate_prime_wallets import ROBINHOOD_ASSETS, fetch_all_wallets
+from prime_config import create_client
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STATE_PATH = Path(__file__).parent / "watch-state.json"
+MIN_INTERVAL = 30.0  # seconds, right after a change
+MAX_INTERVAL = 600.0  # seconds, once the listing has been stable for a while
+JITTER = 0.1  # ± share of the interval, so several watchers do not poll in step
+WALLET_KEYS = ("symbol", "name", "wallet_type")
+
+
+def fingerprint(wallets: Dict[str, Dict]) -> str:
+    """Order-independent hash of what the watcher compares"""
+    digest = hashlib.sha256()
+    for wallet_id in sorted(wallets):
+        digest.update(json.dumps([wallet_id, *(wallets[wallet_id].get(k) for k in WALLET_KEYS)]).encode())
+    return digest.hexdigest()[:16]
+
+
+def index_wallets(wallets: List[Dict]) -> Dict[str, Dict]:
+    """wallet id → the fields the watcher compares"""
+    return {w["id"]: {k: w.get(k) for k in WALLET_KEYS} for w in wallets if w.get("id")}
+
+
+def diff_wallets(previous: Dict[str, Dict], current: Dict[str, Dict]) -> Tuple[List[str], List[str], List[str]]:
+    """(added, changed, removed) wallet ids; changed = any fingerprinted field differs"""
+    added = sorted(set(current) - set(previous))
+    removed = sorted(set(previous) - set(current))
+    changed = sorted(wallet_id for wallet_id in set(current) & set(previous)
+                     if any(current[wallet_id].get(k) != previous[wallet_id].get(k) for k in WALLET_KEYS))
+    return added, changed, removed
+
+
+def next_interval(interval: float, changed: bool, min_interval: float = MIN_INTERVAL,
+                  max_interval: float = MAX_INTERVAL) -> float:
+    """Back to min_interval after a change, otherwise double up to max_interval"""
+    return min_interval if changed else min(max_interval, interval * 2)
+
+
+class EventSink:
+    """Writes events to stdout, an append-only JSONL file and/or a Unix socket"""
+
+    def __init__(self, path: Optional[Path] = None, socket_path: Optional[str] = None, quiet: bool = False):
+        self.file = open(path, "a") if path else None
+        self.quiet = quiet
+        self.server = None
+        self.clients: List[socket.socket] = []
+        self.lock = threading.Lock()
+        if socket_path:
+            if os.path.exists(socket_path):
+                os.remove(socket_path)
+            self.socket_path = socket_path
+            self.server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self.server.bind(socket_path)
+            self.server.listen()
+            threading.Thread(target=self._accept, daemon=True).start()
+
+    def _accept(self) -> None:
+        while True:
+            try:
+                connection, _ = self.server.accept()
+            except OSError:
+                return  # Closed
+            with self.lock:
+                self.clients.append(connection)
+
+    def emit(self, event: Dict) -> None:
+        line = json.dumps(event) + "\n"
+        if not self.quiet:
+            print(line, end="", flush=True)
+        if self.file:
+            self.file.write(line)
+            self.file.flush()
+        with self.lock:
+            for connection in list(self.clients):
+                try:
+                    connection.sendall(line.encode())
+                except OSError:
+                    self.clients.remove(connection)  # Consumer went away
+                    connection.close()
+
+    def close(self) -> None:
+        if self.file:
+            self.file.close()
+        if self.server:
+            self.server.close()
+            os.remove(self.socket_path)
+        with self.lock:
+            for connection in self.clients:
+                connection.close()
+
+
+def load_state(path: Path) -> Optional[Dict]:
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def save_state(path: Path, state: Dict) -> None:
+    """Write atomically (temp file + rename)"""
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(state, f)
+    os.replace(tmp_path, path)
+
+
+class WalletWatcher:
+    """One poll = list, fingerprint, diff, resolve additions, emit"""
+
+    def __init__(self, client, sink: EventSink, state_path: Path = DEFAULT_STATE_PATH):
+        self.client = client
+        self.sink = sink
+        self.state_path = state_path
+        state = load_state(state_path)
+        if state and state.get("portfolio") != client.portfolio_id:
+            logger.warning(f"{state_path} belongs to another portfolio - starting a new baseline")
+            state = None
+        self.wallets: Optional[Dict[str, Dict]] = state["wallets"] if state else None
+        self.fingerprint = state["fingerprint"] if state else None
+        self.polls = 0
+        self.resolve_calls = 0
+
+    def poll(self) -> int:
+        """Poll once; returns the number of change events"""
+        listing = fetch_all_wallets(self.client, progress=logger.debug, page_delay=0)
+        self.polls += 1
+        current = index_wallets(listing)
+        current_fingerprint = fingerprint(current)
+
+        if self.wallets is None:
+            logger.info(f"Baseline: {len(current)} wallets (fingerprint {current_fingerprint})")
+            self._save(current, current_fingerprint)
+            return 0
+        if current_fingerprint == self.fingerprint:
+            logger.info(f"Unchanged ({len(current)} wallets, fingerprint {current_fingerprint})")
+            return 0
+
+        added, changed, removed = diff_wallets(self.wallets, current)
+        at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+        # Resolve every addition before emitting anything: a lookup that raises
+        # fails the poll with no events out, so the retry does not repeat them
+        events = []
+        unresolved = []
+        for wallet_id in added:
+            wallet = current[wallet_id]
+            address, memo = self.client.get_wallet_deposit_address(wallet_id)
+            self.resolve_calls += 1
+            if address is None:
+                unresolved.append(wallet_id)
+                continue
+            events.append({"type": "added", "wallet_id": wallet_id, "symbol": wallet["symbol"],
+                           "name": wallet["name"], "wallet_type": wallet["wallet_type"],
+                           "address": address, "memo": memo,
+                           "robinhood_asset": wallet["symbol"] in ROBINHOOD_ASSETS, "at": at})
+        for wallet_id in changed:
+            wallet, before = current[wallet_id], self.wallets[wallet_id]
+            events.append({"type": "changed", "wallet_id": wallet_id, "symbol": wallet["symbol"],
+                           "name": wallet["name"], "wallet_type": wallet["wallet_type"],
+                           "previous": {k: before.get(k) for k in WALLET_KEYS if before.get(k) != wallet.get(k)},
+                           "at": at})
+        for wallet_id in removed:
+            wallet = self.wallets[wallet_id]
+            events.append({"type": "removed", "wallet_id": wallet_id, "symbol": wallet["symbol"],
+                           "name": wallet["name"], "at": at})
+
+        # Wallets without a deposit address yet stay out of the saved listing,
+        # so the next poll sees them as added again and retries the lookup
+        if unresolved:
+            logger.warning(f"No deposit address yet for {len(unresolved)} new wallet(s) - retrying next poll")
+            for wallet_id in unresolved:
+                del current[wallet_id]
+            current_fingerprint = fingerprint(current)
+
+        for event in events:
+            self.sink.emit(event)
+        self._save(current, current_fingerprint)
+        return len(events)
+
+    def _save(self, wallets: Dict[str, Dict], wallets_fingerprint: str) -> None:
+        self.wallets = wallets
+        self.fingerprint = wallets_fingerprint
+        save_state(self.state_path, {"portfolio": self.client.portfolio_id, "fingerprint": wallets_fingerprint,
+                                     "wallets": wallets})
+
+    def run(self, stop: threading.Event, min_interval: float = MIN_INTERVAL,
+            max_interval: float = MAX_INTERVAL) -> None:
+        """Poll until stop is set, adapting the interval to how often the listing changes"""
+        interval = min_interval
+        while not stop.is_set():
+            try:
+                changed = self.poll() > 0
+                interval = next_interval(interval, changed, min_interval, max_interval)
+            except Exception as e:
+                interval = min(max_interval, interval * 2)
+                logger.error(f"Poll failed ({e}) - retrying in {interval:.0f}s")
+            wait = interval * random.uniform(1 - JITTER, 1 + JITTER)
+            logger.info(f"Next poll in {wait:.0f}s")
+            stop.wait(wait)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Watch Coinbase Prime for new and changed wallets")
+    parser.add_argument("--events", type=Path, metavar="PATH", help="Append change events to a JSONL file")
+    parser.add_argument("--socket", metavar="PATH", help="Broadcast change events on a Unix socket")
+    parser.add_argument("--state", type=Path, default=DEFAULT_STATE_PATH, help="Last seen listing")
+    parser.add_argument("--min-interval", type=float, default=MIN_INTERVAL, help="Seconds between polls after a change")
+    parser.add_argument("--max-interval", type=float, default=MAX_INTERVAL, help="Longest interval when stable")
+    parser.add_argument("--once", action="store_true", help="Poll once and exit")
+    parser.add_argument("--quiet", action="store_true", help="Do not print events to stdout")
+    args = parser.parse_args()
+
+    # Client logs every request at INFO; keep the watcher's own log readable
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    logging.getLogger("prime_api_client").setLevel(logging.WARNING)
+    logging.getLogger("generate_prime_wallets").setLevel(logging.WARNING)
+
+    sink = EventSink(args.events, args.socket, quiet=args.quiet)
+    watcher = WalletWatcher(create_client(), sink, args.state)
+    stop = threading.Event()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signum, lambda *_: stop.set())
+
+    print("=" * 100, file=sys.stderr)
+    print("Coinbase Prime - Wallet Watch", file=sys.stderr)
+    print("=" * 100, file=sys.stderr)
+    print(f"Interval: {args.min_interval:.0f}s after a change, up to {args.max_interval:.0f}s when stable",
+          file=sys.stderr)
+    if args.events:
+        print(f"Events: {args.events}", file=sys.stderr)
+    if args.socket:
+        print(f"Socket: {args.socket}", file=sys.stderr)
+
+    try:
+        if args.once:
+            watcher.poll()
+        else:
+            watcher.run(stop, args.min_interval, args.max_interval)
+    finally:
+        sink.close()
+        print(f"\n✅ {watcher.polls} poll(s): {watcher.client.requests_sent} request(s), "
+              f"{watcher.resolve_calls} of them deposit lookups", file=sys.stderr)